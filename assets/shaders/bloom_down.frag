@@ -0,0 +1,43 @@
+#version 330 core
+out vec4 FragColor;
+
+in vec2 TexCoords;
+
+uniform sampler2D image; // Previous (larger) mip level
+uniform bool highQuality;
+
+// Halves the resolution of the bloom chain. Bilinear taps on texel corners average
+// four texels each, so the kernel is much wider than its tap count.
+void main()
+{
+    vec2 t = 1.0 / textureSize(image, 0); // Source texel
+    vec2 uv = TexCoords;
+    vec3 result;
+    
+    if (highQuality) {
+        // 13 taps (3x3 grid 2 texels apart plus an inner 2x2 box): steadier under motion
+        vec3 a = texture(image, uv + t * vec2(-2.0,  2.0)).rgb;
+        vec3 b = texture(image, uv + t * vec2( 0.0,  2.0)).rgb;
+        vec3 c = texture(image, uv + t * vec2( 2.0,  2.0)).rgb;
+        vec3 d = texture(image, uv + t * vec2(-2.0,  0.0)).rgb;
+        vec3 e = texture(image, uv).rgb;
+        vec3 f = texture(image, uv + t * vec2( 2.0,  0.0)).rgb;
+        vec3 g = texture(image, uv + t * vec2(-2.0, -2.0)).rgb;
+        vec3 h = texture(image, uv + t * vec2( 0.0, -2.0)).rgb;
+        vec3 i = texture(image, uv + t * vec2( 2.0, -2.0)).rgb;
+        vec3 j = texture(image, uv + t * vec2(-1.0,  1.0)).rgb;
+        vec3 k = texture(image, uv + t * vec2( 1.0,  1.0)).rgb;
+        vec3 l = texture(image, uv + t * vec2(-1.0, -1.0)).rgb;
+        vec3 m = texture(image, uv + t * vec2( 1.0, -1.0)).rgb;
+        result = e * 0.125 + (a + c + g + i) * 0.03125 + (b + d + f + h) * 0.0625 + (j + k + l + m) * 0.125;
+    } else {
+        // Dual filter: centre plus four diagonal corners
+        result = texture(image, uv).rgb * 4.0;
+        result += texture(image, uv + t * vec2(-1.0, -1.0)).rgb;
+        result += texture(image, uv + t * vec2( 1.0, -1.0)).rgb;
+        result += texture(image, uv + t * vec2(-1.0,  1.0)).rgb;
+        result += texture(image, uv + t * vec2( 1.0,  1.0)).rgb;
+        result *= 0.125;
+    }
+    FragColor = vec4(result, 1.0);
+}
@@ -0,0 +1,37 @@
+#version 330 core
+out vec4 FragColor;
+
+in vec2 TexCoords;
+
+uniform sampler2D image; // Next (smaller) mip level; added onto the bound target
+uniform bool highQuality;
+uniform float radius; // Tap spread in source texels
+
+void main()
+{
+    vec2 t = radius / textureSize(image, 0);
+    vec2 uv = TexCoords;
+    vec3 result;
+    
+    if (highQuality) {
+        // 3x3 tent
+        result = texture(image, uv).rgb * 4.0;
+        result += (texture(image, uv + vec2(-t.x, 0.0)).rgb + texture(image, uv + vec2(t.x, 0.0)).rgb
+                 + texture(image, uv + vec2(0.0, -t.y)).rgb + texture(image, uv + vec2(0.0, t.y)).rgb) * 2.0;
+        result += texture(image, uv + vec2(-t.x, -t.y)).rgb + texture(image, uv + vec2(t.x, -t.y)).rgb
+                + texture(image, uv + vec2(-t.x,  t.y)).rgb + texture(image, uv + vec2(t.x,  t.y)).rgb;
+        result *= 1.0 / 16.0;
+    } else {
+        // Dual filter: four axis taps plus four diagonal taps at half the distance, weighted double
+        result = texture(image, uv + vec2(-t.x, 0.0)).rgb;
+        result += texture(image, uv + vec2( t.x, 0.0)).rgb;
+        result += texture(image, uv + vec2(0.0, -t.y)).rgb;
+        result += texture(image, uv + vec2(0.0,  t.y)).rgb;
+        result += texture(image, uv + t * vec2(-0.5, -0.5)).rgb * 2.0;
+        result += texture(image, uv + t * vec2( 0.5, -0.5)).rgb * 2.0;
+        result += texture(image, uv + t * vec2(-0.5,  0.5)).rgb * 2.0;
+        result += texture(image, uv + t * vec2( 0.5,  0.5)).rgb * 2.0;
+        result *= 1.0 / 12.0;
+    }
+    FragColor = vec4(result, 1.0);
+}
@@ -0,0 +1,21 @@
+#version 330 core
+
+in vec4 Glow;
+in vec4 Core;
+in float CoreRadius;
+
+out vec4 FragColor;
+
+void main()
+{
+    // Distance from the sprite center, 0 at the center and 1 at the edge
+    float d = length(gl_PointCoord * 2.0 - 1.0);
+    if (d > 1.0) discard;
+
+    // Glow fades out radially; the core is a solid disc with a one-pixel-ish soft edge
+    float glow = 1.0 - d * d;
+    float core = 1.0 - smoothstep(CoreRadius - fwidth(d), CoreRadius, d);
+
+    // Premultiplied, blended additively with (ONE, ONE)
+    FragColor = vec4(Glow.rgb * Glow.a * glow + Core.rgb * Core.a * core, 1.0);
+}
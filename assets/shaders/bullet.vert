@@ -0,0 +1,27 @@
+#version 330 core
+
+layout (location = 0) in vec2 aPos; // int16 fixed point
+layout (location = 1) in uint aStyle;
+
+#define MAX_STYLES 8
+
+uniform mat4 mvp;
+uniform float positionScale; // Pixels per fixed-point step
+uniform float pointScale; // Target pixels per virtual pixel
+uniform vec4 glowColor[MAX_STYLES];
+uniform vec4 coreColor[MAX_STYLES];
+uniform float pointSize[MAX_STYLES]; // Glow diameter in virtual pixels
+uniform float coreRadius[MAX_STYLES]; // Core radius as a fraction of the glow
+
+out vec4 Glow;
+out vec4 Core;
+out float CoreRadius;
+
+void main()
+{
+    gl_Position = mvp * vec4(aPos * positionScale, 0.0, 1.0);
+    gl_PointSize = pointSize[aStyle] * pointScale;
+    Glow = glowColor[aStyle];
+    Core = coreColor[aStyle];
+    CoreRadius = coreRadius[aStyle];
+}
@@ -0,0 +1,13 @@
+#version 330 core
+
+in vec4 Color;
+flat in float Additive;
+
+out vec4 FragColor;
+
+void main()
+{
+    // Premultiplied output, blended with (ONE, ONE_MINUS_SRC_ALPHA):
+    // alpha 0 adds like (SRC_ALPHA, ONE) glow, full alpha covers like regular blending
+    FragColor = vec4(Color.rgb * Color.a, Color.a * (1.0 - Additive));
+}
@@ -0,0 +1,31 @@
+#version 330 core
+
+// Mesh vertex
+layout (location = 0) in vec2 aPos;
+layout (location = 1) in vec4 aColor;
+layout (location = 2) in vec3 aFlags; // tint by instance color, additive, flicker
+
+// Per instance
+layout (location = 3) in vec3 iTransform; // x, y, angle in degrees
+layout (location = 4) in vec4 iColor;
+
+uniform mat4 mvp;
+uniform float flicker; // Extra length for flagged vertices (engine flame)
+
+out vec4 Color;
+flat out float Additive;
+
+void main()
+{
+    vec2 p = aPos + vec2(0.0, aFlags.z * flicker);
+    
+    // Same rotation as glRotatef(angle, 0, 0, 1)
+    float a = radians(iTransform.z);
+    float c = cos(a);
+    float s = sin(a);
+    p = vec2(p.x * c - p.y * s, p.x * s + p.y * c) + iTransform.xy;
+    
+    gl_Position = mvp * vec4(p, 0.0, 1.0);
+    Color = mix(aColor, aColor * iColor, aFlags.x);
+    Additive = aFlags.y;
+}
@@ -0,0 +1,123 @@
+#version 330 core
+out vec4 FragColor;
+
+in vec2 TexCoords;
+
+uniform sampler2D image; // Final LDR color (or the HDR scene when nothing else is composited)
+
+// Presets are compiled as permutations: FXAA_LOW, FXAA_HIGH, otherwise medium.
+// Relative and absolute local contrast below which a pixel is left alone, how far
+// (and in which strides) the edge ends are searched for, and subpixel blending strength.
+#if defined(FXAA_LOW)
+#define EDGE_THRESHOLD 0.250
+#define EDGE_THRESHOLD_MIN 0.0833
+#define SEARCH_STEPS 4
+#define SEARCH_STRIDES float[](1.0, 1.5, 2.0, 4.0)
+#define SUBPIXEL 0.50
+#elif defined(FXAA_HIGH)
+#define EDGE_THRESHOLD 0.125
+#define EDGE_THRESHOLD_MIN 0.0312
+#define SEARCH_STEPS 12
+#define SEARCH_STRIDES float[](1.0, 1.0, 1.0, 1.0, 1.0, 1.5, 2.0, 2.0, 2.0, 2.0, 4.0, 8.0)
+#define SUBPIXEL 0.75
+#else
+#define EDGE_THRESHOLD 0.166
+#define EDGE_THRESHOLD_MIN 0.0625
+#define SEARCH_STEPS 8
+#define SEARCH_STRIDES float[](1.0, 1.5, 2.0, 2.0, 2.0, 2.0, 4.0, 8.0)
+#define SUBPIXEL 0.75
+#endif
+
+const float strides[SEARCH_STEPS] = SEARCH_STRIDES;
+
+float luma(vec2 uv)
+{
+    // Clamped so HDR highlights do not read as huge contrast
+    return dot(min(texture(image, uv).rgb, vec3(1.0)), vec3(0.299, 0.587, 0.114));
+}
+
+void main()
+{
+    vec2 t = 1.0 / textureSize(image, 0);
+    vec2 uv = TexCoords;
+    vec3 rgbM = texture(image, uv).rgb;
+    
+    // Local contrast from the 4 direct neighbours; flat areas exit early
+    float lM = dot(min(rgbM, vec3(1.0)), vec3(0.299, 0.587, 0.114));
+    float lN = luma(uv + vec2(0.0, t.y));
+    float lS = luma(uv - vec2(0.0, t.y));
+    float lE = luma(uv + vec2(t.x, 0.0));
+    float lW = luma(uv - vec2(t.x, 0.0));
+    float lMax = max(lM, max(max(lN, lS), max(lE, lW)));
+    float lMin = min(lM, min(min(lN, lS), min(lE, lW)));
+    float range = lMax - lMin;
+    if (range < max(EDGE_THRESHOLD_MIN, lMax * EDGE_THRESHOLD)) {
+        FragColor = vec4(rgbM, 1.0);
+        return;
+    }
+    
+    float lNE = luma(uv + t);
+    float lSW = luma(uv - t);
+    float lNW = luma(uv + vec2(-t.x, t.y));
+    float lSE = luma(uv + vec2(t.x, -t.y));
+    
+    // Subpixel aliasing: how much the centre differs from its 3x3 average
+    float lAverage = (2.0 * (lN + lS + lE + lW) + lNE + lNW + lSE + lSW) / 12.0;
+    float subpixel = smoothstep(0.0, 1.0, clamp(abs(lAverage - lM) / range, 0.0, 1.0));
+    subpixel = subpixel * subpixel * SUBPIXEL;
+    
+    // Edge orientation, then which side of the pixel the edge lies on
+    float horizontalness = abs(lN + lS - 2.0 * lM) * 2.0 + abs(lNE + lSE - 2.0 * lE) + abs(lNW + lSW - 2.0 * lW);
+    float verticalness = abs(lE + lW - 2.0 * lM) * 2.0 + abs(lNE + lNW - 2.0 * lN) + abs(lSE + lSW - 2.0 * lS);
+    bool horizontal = horizontalness >= verticalness;
+    
+    float stepLength = horizontal ? t.y : t.x;
+    float lPositive = horizontal ? lN : lE;
+    float lNegative = horizontal ? lS : lW;
+    float gPositive = abs(lPositive - lM);
+    float gNegative = abs(lNegative - lM);
+    float gradient = max(gPositive, gNegative);
+    float lOpposite = lPositive;
+    if (gPositive < gNegative) {
+        stepLength = -stepLength;
+        lOpposite = lNegative;
+    }
+    
+    // Walk along the edge (between this pixel and its neighbour) in both directions
+    // until the luma pair no longer matches the edge
+    vec2 edgeUV = uv + (horizontal ? vec2(0.0, stepLength * 0.5) : vec2(stepLength * 0.5, 0.0));
+    vec2 edgeStep = horizontal ? vec2(t.x, 0.0) : vec2(0.0, t.y);
+    float lEdge = (lM + lOpposite) * 0.5;
+    float gThreshold = gradient * 0.25;
+    
+    vec2 uvP = edgeUV;
+    vec2 uvN = edgeUV;
+    float deltaP = 0.0;
+    float deltaN = 0.0;
+    bool doneP = false;
+    bool doneN = false;
+    for (int i = 0; i < SEARCH_STEPS && !(doneP && doneN); ++i) {
+        if (!doneP) {
+            uvP += edgeStep * strides[i];
+            deltaP = luma(uvP) - lEdge;
+            doneP = abs(deltaP) >= gThreshold;
+        }
+        if (!doneN) {
+            uvN -= edgeStep * strides[i];
+            deltaN = luma(uvN) - lEdge;
+            doneN = abs(deltaN) >= gThreshold;
+        }
+    }
+    
+    // Blend towards the edge more the closer this pixel is to the nearer edge end, but
+    // only if that end turns the way that makes this pixel part of the staircase
+    float distP = horizontal ? uvP.x - uv.x : uvP.y - uv.y;
+    float distN = horizontal ? uv.x - uvN.x : uv.y - uvN.y;
+    float dist = min(distP, distN);
+    float deltaEnd = distP <= distN ? deltaP : deltaN;
+    float edgeBlend = ((deltaEnd >= 0.0) == (lM - lEdge >= 0.0)) ? 0.0 : 0.5 - dist / (distP + distN);
+    
+    float blend = max(edgeBlend, subpixel);
+    vec2 finalUV = uv + (horizontal ? vec2(0.0, stepLength * blend) : vec2(stepLength * blend, 0.0));
+    FragColor = vec4(texture(image, finalUV).rgb, 1.0);
+}
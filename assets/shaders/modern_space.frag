@@ -3,6 +3,14 @@
 uniform float time;
 uniform vec2 resolution;
 uniform vec2 player_pos;
+uniform sampler3D noiseTexture; // Tiling value-noise lattice baked by Starfield
+uniform float noisePeriod; // Lattice cells per texture repeat
+
+// Permutations: NEBULA_ONLY renders just the nebula layer (into Starfield's cache),
+// NEBULA_CACHED samples that cache instead of evaluating the fbm per pixel
+#ifdef NEBULA_CACHED
+uniform sampler2D nebulaTexture;
+#endif
 
 varying vec2 v_texcoord;
 
@@ -33,16 +41,13 @@ float hash(float n) {
     return fract(sin(n) * 43758.5453123);
 }
 
-// 3D Noise function
+// 3D Noise function. The smoothstepped fraction is handed to the hardware trilinear
+// filter, so one fetch gives the same smooth value noise as eight hashes and seven mixes.
 float noise(vec3 x) {
     vec3 p = floor(x);
     vec3 f = fract(x);
     f = f * f * (3.0 - 2.0 * f);
-    float n = p.x + p.y * 57.0 + 113.0 * p.z;
-    return mix(mix(mix(hash(n + 0.0), hash(n + 1.0), f.x),
-                   mix(hash(n + 57.0), hash(n + 58.0), f.x), f.y),
-               mix(mix(hash(n + 113.0), hash(n + 114.0), f.x),
-                   mix(hash(n + 170.0), hash(n + 171.0), f.x), f.y), f.z);
+    return texture3D(noiseTexture, (p + f + 0.5) / noisePeriod).r;
 }
 
 // Fractal Brownian Motion
@@ -55,6 +60,22 @@ float fbm(vec3 p) {
     return f;
 }
 
+// 1. Volumetric Nebula (Raymarching FBM)
+vec3 nebulaLayer(vec3 rd) {
+    vec3 nebulaPos = rd * 4.0 + vec3(0.0, 0.0, time * 0.5);
+    float n = fbm(nebulaPos);
+    float n2 = fbm(nebulaPos * 2.0 + vec3(2.0));
+    
+    vec3 nebulaColor1 = vec3(0.1, 0.0, 0.2); // Deep Purple
+    vec3 nebulaColor2 = vec3(0.0, 0.1, 0.3); // Deep Blue
+    vec3 nebulaColor3 = vec3(0.5, 0.2, 0.1); // Orange/Red highlights
+    
+    vec3 nebula = mix(nebulaColor1, nebulaColor2, n);
+    nebula += nebulaColor3 * pow(n2, 3.0) * 0.5;
+    
+    return nebula * 1.5;
+}
+
 void main() {
     vec2 uv = (gl_FragCoord.xy - 0.5 * resolution.xy) / resolution.y;
     
@@ -72,19 +93,16 @@ void main() {
     
     vec3 color = vec3(0.0);
     
-    // 1. Volumetric Nebula (Raymarching FBM)
-    vec3 nebulaPos = rd * 4.0 + vec3(0.0, 0.0, time * 0.5);
-    float n = fbm(nebulaPos);
-    float n2 = fbm(nebulaPos * 2.0 + vec3(2.0));
-    
-    vec3 nebulaColor1 = vec3(0.1, 0.0, 0.2); // Deep Purple
-    vec3 nebulaColor2 = vec3(0.0, 0.1, 0.3); // Deep Blue
-    vec3 nebulaColor3 = vec3(0.5, 0.2, 0.1); // Orange/Red highlights
-    
-    vec3 nebula = mix(nebulaColor1, nebulaColor2, n);
-    nebula += nebulaColor3 * pow(n2, 3.0) * 0.5;
-    
-    color += nebula * 1.5;
+    // 1. Volumetric Nebula
+#if defined(NEBULA_CACHED)
+    color += texture2D(nebulaTexture, gl_FragCoord.xy / resolution).rgb;
+#else
+    color += nebulaLayer(rd);
+#endif
+#ifdef NEBULA_ONLY
+    gl_FragColor = vec4(color, 1.0);
+    return;
+#endif
     
     // 2. Starfield (3D Grid)
     // Render stars ON TOP of nebula for visibility
@@ -0,0 +1,13 @@
+#version 330 core
+
+in vec4 Color;
+
+out vec4 FragColor;
+
+void main()
+{
+    // Soft round sprite: full inside, fading out towards the edge
+    float d = length(gl_PointCoord * 2.0 - 1.0);
+    if (d > 1.0) discard;
+    FragColor = vec4(Color.rgb, Color.a * (1.0 - smoothstep(0.3, 1.0, d)));
+}
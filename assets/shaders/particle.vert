@@ -0,0 +1,21 @@
+#version 330 core
+
+// PARTICLE_VERTEX: int16 fixed-point position, normalized RGBA8 (life as alpha), normalized 8-bit size
+layout (location = 0) in vec2 aPos;
+layout (location = 1) in vec4 aColor;
+layout (location = 2) in float aSize;
+
+uniform mat4 mvp;
+uniform float pointScale; // Window pixels per virtual pixel
+uniform float positionScale; // Pixels per fixed-point step
+uniform float maxSize; // Size at aSize == 1
+
+out vec4 Color;
+
+void main()
+{
+    gl_Position = mvp * vec4(aPos * positionScale, 0.0, 1.0);
+    // Sprite diameter is twice the simulated size; the soft edge takes up the rim
+    gl_PointSize = aSize * maxSize * 2.0 * pointScale;
+    Color = aColor;
+}
@@ -1,15 +1,17 @@
 #version 330 core
 
+// Compiled per feature set by PostProcessor: USE_BLOOM, USE_VIGNETTE, USE_CHROMATIC.
+// Disabled effects cost nothing, not even their texture fetches.
+
 out vec4 FragColor;
 
 in vec2 TexCoords;
 
 uniform sampler2D sceneTexture;
-uniform sampler2D bloomTexture; // Optional if we do bloom separate
-uniform bool useBloom;
-uniform bool useVignette;
-uniform bool useChromaticAberration;
-uniform bool useFXAA; // Placeholder for now, FXAA usually needs its own pass or complex logic
+#ifdef USE_BLOOM
+uniform sampler2D bloomTexture;
+uniform float bloomIntensity;
+#endif
 
 // Vignette Settings
 const float vignetteIntensity = 0.1;
@@ -24,26 +26,26 @@ void main()
     vec3 color = texture(sceneTexture, uv).rgb;
     
     // Chromatic Aberration
-    if (useChromaticAberration) {
-        float r = texture(sceneTexture, uv + vec2(chromaticOffset, 0.0)).r;
-        float b = texture(sceneTexture, uv - vec2(chromaticOffset, 0.0)).b;
-        color.r = r;
-        color.b = b;
-    }
+#ifdef USE_CHROMATIC
+    float r = texture(sceneTexture, uv + vec2(chromaticOffset, 0.0)).r;
+    float b = texture(sceneTexture, uv - vec2(chromaticOffset, 0.0)).b;
+    color.r = r;
+    color.b = b;
+#endif
     
     // Bloom Combine (Simple Additive)
-    if (useBloom) {
-        vec3 bloomColor = texture(bloomTexture, uv).rgb;
-        color += bloomColor * 1.5; // Boost bloom intensity
-    }
+#ifdef USE_BLOOM
+    vec3 bloomColor = texture(bloomTexture, uv).rgb;
+    color += bloomColor * bloomIntensity;
+#endif
     
     // Vignette
-    if (useVignette) {
-        vec2 center = vec2(0.5, 0.5);
-        float dist = distance(uv, center);
-        float vignette = smoothstep(0.8, 0.8 - vignetteSmoothness, dist * (1.0 + vignetteIntensity));
-        color *= vignette;
-    }
+#ifdef USE_VIGNETTE
+    vec2 center = vec2(0.5, 0.5);
+    float dist = distance(uv, center);
+    float vignette = smoothstep(0.8, 0.8 - vignetteSmoothness, dist * (1.0 + vignetteIntensity));
+    color *= vignette;
+#endif
     
     // Tone Mapping & Gamma Correction - DISABLED (Causing white screen/washout)
     // color = color / (color + vec3(1.0));
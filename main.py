@@ -1,11 +1,53 @@
 import sys
 import os
+import argparse
 
 # Add src to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.core.game import Game
+def parse_args():
+    parser = argparse.ArgumentParser(description="Danmaku Space War v2")
+    parser.add_argument("--headless", action="store_true", help="Run the gameplay simulation without a window or GL context")
+    parser.add_argument("--ticks", type=int, default=3600, help="Simulation steps to run in headless mode")
+    parser.add_argument("--difficulty", default="medium", choices=["easy", "medium", "hard", "extreme"])
+    parser.add_argument("--seed", type=int, default=None, help="Seed for all gameplay randomness")
+    parser.add_argument("--replay", default=None, help="Play back a recorded replay file")
+    parser.add_argument("--record", default=None, help="Headless only: save the run's input log to this file")
+    parser.add_argument("--profile", default=None, help="Headless only: export per-stage timings to this .csv or .json file")
+    return parser.parse_args()
+
+def run_headless(args, replay):
+    from src.core.headless import HeadlessGame, autopilot
+    game = HeadlessGame(difficulty=args.difficulty, seed=args.seed, replay=replay, record=bool(args.record))
+    ticks = len(replay) if replay else args.ticks
+    summary = game.run(ticks, controller=autopilot)
+    
+    recorder = game.game_scene.recorder
+    if args.record and recorder:
+        recorder.save(args.record)
+        print(f"Replay saved to {args.record}")
+        
+    if args.profile:
+        if args.profile.endswith(".json"):
+            game.profiler.export_json(args.profile)
+        else:
+            game.profiler.export_csv(args.profile)
+        print(f"Profile exported to {args.profile}")
+        
+    for key, value in summary.items():
+        print(f"{key}: {value}")
 
 if __name__ == "__main__":
-    game = Game()
-    game.run()
+    args = parse_args()
+    
+    replay = None
+    if args.replay:
+        from src.core.replay import Replay
+        replay = Replay.load(args.replay)
+        
+    if args.headless:
+        run_headless(args, replay)
+    else:
+        from src.core.game import Game
+        game = Game(replay=replay, seed=args.seed)
+        game.run()
@@ -1,4 +1,26 @@
 import math
+import numpy as np
+
+# Below this many bullet x enemy pairs the dense hit matrix beats the grid broadphase
+DENSE_PAIR_LIMIT = 4096
+
+def segments_hit_circles(x1, y1, x2, y2, cx, cy, radius):
+    """
+    Vectorized swept test: does segment (x1, y1) -> (x2, y2) come within radius of (cx, cy)?
+    Inputs broadcast against each other, e.g. bullets as (B, 1) columns against enemies
+    as (1, E) rows gives a (B, E) hit matrix. Same math as line_intersects_circle.
+    """
+    dx = x2 - x1
+    dy = y2 - y1
+    len_sq = dx * dx + dy * dy
+    
+    # Projection of the center onto the segment, clamped; zero-length segments test p1
+    t = ((cx - x1) * dx + (cy - y1) * dy) / np.where(len_sq > 0, len_sq, 1.0)
+    t = np.clip(t, 0.0, 1.0)
+    
+    ex = x1 + t * dx - cx
+    ey = y1 + t * dy - cy
+    return ex * ex + ey * ey <= radius * radius
 
 class CollisionManager:
     def __init__(self, game_scene):
@@ -34,29 +56,52 @@ class CollisionManager:
         
     def check_player_bullets(self, dt):
         bullet_manager = self.game_scene.bullet_manager
+        count = bullet_manager.p_count
+        if count == 0: return
+        
+        enemies = self.game_scene.wave_manager.enemies
+        if len(self.grid) == 0: return
         
         # Player Bullet -> Enemy (CCD)
-        for i in range(bullet_manager.p_count):
-            bx = bullet_manager.p_data[i, 0]
-            by = bullet_manager.p_data[i, 1]
-            bdx = bullet_manager.p_data[i, 2]
-            bdy = bullet_manager.p_data[i, 3]
-            
-            prev_bx = bx - bdx * dt
-            prev_by = by - bdy * dt
-            
-            # Query grid
-            potential_hits = self.grid.query(bx, by, 64, 64)
+        bullets = bullet_manager.p_data[:count]
+        bx = bullets[:, 0]
+        by = bullets[:, 1]
+        prev_bx = bx - bullets[:, 2] * dt
+        prev_by = by - bullets[:, 3] * dt
+        
+        grid = self.grid
+        if count * len(grid) <= DENSE_PAIR_LIMIT:
+            # Few pairs: testing every bullet against every enemy is cheaper than the broadphase
+            hits = segments_hit_circles(prev_bx[:, None], prev_by[:, None], bx[:, None], by[:, None],
+                                        grid.xs[None, :], grid.ys[None, :], 20)
+            b_idx, e_idx = np.nonzero(hits)
+        else:
+            # Broadphase: each swept segment's bounding box, widened by the enemy radius
+            b_idx, e_idx = grid.query_many((bx + prev_bx) / 2, (by + prev_by) / 2,
+                                           np.abs(bx - prev_bx) + 40, np.abs(by - prev_by) + 40)
             
-            for e in potential_hits:
-                if e.active:
-                    if self.line_intersects_circle((prev_bx, prev_by), (bx, by), (e.x, e.y), 20):
-                        e.active = False
-                        bullet_manager.p_data[i, 1] = -1000 # Remove
-                        self.game.score += 100
-                        self.game_scene.score_scale = 1.5
-                        self.game_scene.trigger_shake(5, 0.2)
-                        break
+            # Narrowphase on the candidate pairs only
+            hits = segments_hit_circles(prev_bx[b_idx], prev_by[b_idx], bx[b_idx], by[b_idx],
+                                        grid.xs[e_idx], grid.ys[e_idx], 20)
+            b_idx = b_idx[hits]
+            e_idx = e_idx[hits]
+            order = np.lexsort((e_idx, b_idx))
+            b_idx = b_idx[order]
+            e_idx = e_idx[order]
+        if len(b_idx) == 0: return
+        
+        # First hit wins: bullets in spawn order each take the first enemy still alive.
+        # Hits are rare, so this pass only walks pairs that touched.
+        done_bullet = -1
+        for i, j in zip(b_idx.tolist(), e_idx.tolist()):
+            if i == done_bullet or not enemies.active[j]:
+                continue
+            done_bullet = i
+            enemies.active[j] = False
+            bullet_manager.p_data[i, 1] = -1000 # Remove
+            self.game.score += 100
+            self.game_scene.score_scale = 1.5
+            self.game_scene.trigger_shake(5, 0.2)
 
     def check_enemy_collisions(self, dt):
         player = self.game_scene.player
@@ -69,49 +114,41 @@ class CollisionManager:
         if diff == 'easy': dmg_mult = 0.5
         elif diff == 'hard': dmg_mult = 1.5
         
-        player_prev_x = player.x - (player.x - player.x) # Approximation if we don't store prev
-        # Wait, we need player prev pos. 
-        # Let's assume linear interpolation from velocity? No, player follows mouse.
-        # We should pass prev_pos or store it in player.
-        # For now, let's just use current pos for simplicity or assume small movement?
-        # Actually, GameScene calculated player_prev_x. We should access it or store it.
-        # Let's assume we can access it from player if we add it, or just use current pos for now (less accurate CCD).
-        # To be safe, let's use current pos for now, as refactoring shouldn't break too much.
-        # Or better: Player should track its own prev_pos.
-        
+        # Bullets sweep from their previous position; the player is tested at its current one
         px, py = player.x, player.y
-        # Approximate prev pos based on mouse movement? No.
-        # Let's just use px, py for now.
         
         if player.invulnerable_timer <= 0:
             player_hit = False
             
-            # Enemy Bullet -> Player
-            for i in range(bullet_manager.e_count):
-                bx = bullet_manager.e_data[i, 0]
-                by = bullet_manager.e_data[i, 1]
-                bdx = bullet_manager.e_data[i, 2]
-                bdy = bullet_manager.e_data[i, 3]
-                
-                prev_bx = bx - bdx * dt
-                prev_by = by - bdy * dt
+            # Enemy Bullet -> Player, every segment in one pass
+            count = bullet_manager.e_count
+            if count > 0:
+                bullets = bullet_manager.e_data[:count]
+                bx = bullets[:, 0]
+                by = bullets[:, 1]
+                prev_bx = bx - bullets[:, 2] * dt
+                prev_by = by - bullets[:, 3] * dt
                 
-                if self.line_intersects_circle((prev_bx, prev_by), (bx, by), (px, py), player.hitbox_radius):
-                    player.hp -= 10 * dmg_mult
-                    bullet_manager.e_data[i, 1] = -1000 # Remove
+                hit_bullets = np.flatnonzero(segments_hit_circles(prev_bx, prev_by, bx, by, px, py, player.hitbox_radius))
+                if len(hit_bullets) > 0:
+                    player.hp -= 10 * dmg_mult * len(hit_bullets)
+                    bullet_manager.e_data[hit_bullets, 1] = -1000 # Remove
                     player_hit = True
             
             # Enemy Body -> Player
-            for e in wave_manager.enemies:
-                if e.active:
-                    # Simple circle collision for now since we don't have prev player pos easily
-                    dist_sq = (e.x - px)**2 + (e.y - py)**2
-                    radius_sum = 20 + player.hitbox_radius
-                    if dist_sq <= radius_sum**2:
-                        player.hp -= 40 * dmg_mult
-                        e.active = False
-                        player_hit = True
-                        self.game_scene.trigger_shake(20, 0.5)
+            radius_sum = 20 + player.hitbox_radius
+            candidates = self.grid.query(px, py, 2 * radius_sum, 2 * radius_sum)
+            if len(candidates) > 0:
+                enemies = wave_manager.enemies
+                dist_sq = (self.grid.xs[candidates] - px) ** 2 + (self.grid.ys[candidates] - py) ** 2
+                
+                for j in np.sort(candidates[dist_sq <= radius_sum ** 2]):
+                    if not enemies.active[j]:
+                        continue
+                    player.hp -= 40 * dmg_mult
+                    enemies.active[j] = False
+                    player_hit = True
+                    self.game_scene.trigger_shake(20, 0.5)
                         
             if player_hit:
                 player.invulnerable_timer = 1.0
@@ -149,5 +186,13 @@ class CollisionManager:
             self.game.save_settings()
         
         print("GAME OVER")
+        self.game_scene.game_over = True
+        self.game_scene.finish_recording()
+        if self.game_scene.headless:
+            # No scenes to switch to without a window; the headless runner stops on game_over
+            return
+            
+        # A finished playback shouldn't carry over into a retry
+        self.game.replay = None
         from src.scenes.game_over_scene import GameOverScene
         self.game.scene_manager.set_scene(GameOverScene(self.game, self.game.score, self.game_scene.wave_manager.wave, self.game_scene.boss_beaten))
@@ -4,10 +4,9 @@ import os
 import traceback
 from src.core.window import Window
 from src.utils.localization import Localization
-from src.graphics.text_renderer import TextRenderer
 
 class Game:
-    def __init__(self):
+    def __init__(self, replay=None, seed=None):
         from src.core.settings_manager import SettingsManager
         self.settings_manager = SettingsManager()
         
@@ -15,21 +14,44 @@ class Game:
         self.width = self.settings_manager.get("width")
         self.height = self.settings_manager.get("height")
         self.fps = self.settings_manager.get("fps")
+        self.sim_rate = self.settings_manager.get("sim_rate", 120)
+        self.max_sim_steps = self.settings_manager.get("max_sim_steps", 8)
         self.language = self.settings_manager.get("language")
         self.fullscreen = self.settings_manager.get("fullscreen")
         self.show_fps = self.settings_manager.get("show_fps")
+        self.show_profiler = self.settings_manager.get("show_profiler", False)
         self.music_volume = self.settings_manager.get("music_volume")
         self.sfx_volume = self.settings_manager.get("sfx_volume")
         self.high_score = self.settings_manager.get("high_score")
-        self.msaa_enabled = self.settings_manager.get("msaa_enabled")
+        self.record_replays = self.settings_manager.get("record_replays", False)
+        self.bullet_pool_max = self.settings_manager.get("bullet_pool_max", 65536)
+        self.particle_pool_max = self.settings_manager.get("particle_pool_max", 65536)
+        self.stream_persistent = self.settings_manager.get("stream_persistent", True)
         
+        # Deterministic runs: fixed seed for new games, or a recorded replay to play back
+        self.seed = seed
+        self.replay = replay
+        if replay:
+            self.difficulty = replay.difficulty
+            self.sim_rate = replay.sim_rate
         # Graphics
         self.use_bloom = self.settings_manager.get("use_bloom")
         self.use_vignette = self.settings_manager.get("use_vignette")
         self.use_chromatic = self.settings_manager.get("use_chromatic")
         self.use_fxaa = self.settings_manager.get("use_fxaa")
+        self.fxaa_quality = self.settings_manager.get("fxaa_quality", "medium")
+        self.render_scale = self.settings_manager.get("render_scale", 1.0)
+        self.dynamic_resolution = self.settings_manager.get("dynamic_resolution", True)
+        self.render_scale_min = self.settings_manager.get("render_scale_min", 0.5)
+        self.render_scale_max = self.settings_manager.get("render_scale_max", 2.0)
+        self.bloom_mode = self.settings_manager.get("bloom_mode", "dual")
+        self.bloom_levels = self.settings_manager.get("bloom_levels", 5)
+        self.bloom_quality = self.settings_manager.get("bloom_quality", "medium")
+        self.nebula_refresh_frames = self.settings_manager.get("nebula_refresh_frames", 0)
 
-        self.window = Window(self.width, self.height, "Danmaku Space War v2", fullscreen=self.fullscreen, msaa=self.msaa_enabled)
+        # Every scene is drawn into the PostProcessor's single-sampled target, so a multisampled
+        # default framebuffer would only cost memory; edges are smoothed by the FXAA pass instead
+        self.window = Window(self.width, self.height, "Danmaku Space War v2", fullscreen=self.fullscreen, msaa=False)
         # Sync dimensions with actual window size
         self.width = self.window.width
         self.height = self.window.height
@@ -48,10 +70,29 @@ class Game:
         self.clock = pygame.time.Clock()
         self.global_time = 0
         
+        # Fixed-step simulation: scenes always update with sim_dt, rendering interpolates in between
+        self.sim_dt = 1.0 / self.sim_rate
+        self.accumulator = 0.0
+        
         self.localization = Localization()
         self.localization.set_language(self.language)
         
-        self.fps_renderer = TextRenderer(font_name="pixel", size=20, antialias=False)
+        # Fonts are shared app-wide; scenes acquire them and release on exit
+        from src.graphics.font_registry import FontRegistry
+        self.fonts = FontRegistry()
+        self.fps_renderer = self.fonts.acquire("pixel", 20, False)
+        
+        # Per-frame vertex uploads from every dynamic renderer go through one ring buffer;
+        # persistent mapping is used where the driver supports it
+        from src.graphics.stream_buffer import StreamBuffer
+        self.stream = StreamBuffer(persistent=None if self.stream_persistent else False)
+        
+        # Per-stage frame timings (F3 toggles the overlay, F9 exports CSV/JSON)
+        from src.utils.profiler import FrameProfiler
+        from src.ui.profiler_overlay import ProfilerOverlay
+        self.profiler = FrameProfiler()
+        self.profiler_renderer = self.fonts.acquire("pixel", 14, False)
+        self.profiler_overlay = ProfilerOverlay(self.profiler, self.profiler_renderer, self.stream)
         
         from src.scenes.scene_manager import SceneManager
         from src.scenes.menu_scene import MenuScene
@@ -59,11 +100,18 @@ class Game:
         from src.graphics.warp_background import WarpBackground
         from src.graphics.post_processor import PostProcessor
         
-        self.starfield = Starfield(self.virtual_width, self.virtual_height)
+        # nebula_refresh_frames > 0 caches the starfield's nebula layer and redraws it that often
+        self.starfield = Starfield(self.virtual_width, self.virtual_height, self.nebula_refresh_frames)
         self.warp_bg = WarpBackground(self.window.width, self.window.height)
         
-        # Initialize PostProcessor
-        self.post_processor = PostProcessor(self.window.width, self.window.height)
+        # Initialize PostProcessor: the scene is rendered at virtual resolution times render_scale
+        self.post_processor = PostProcessor(self.window.width, self.window.height, self.virtual_width, self.virtual_height, self.render_scale,
+                                            self.bloom_mode, self.bloom_levels, self.bloom_quality, self.fxaa_quality)
+        if self.dynamic_resolution:
+            from src.graphics.dynamic_resolution import DynamicResolution
+            # Leave part of the frame budget for the CPU-side work and the UI pass
+            self.post_processor.dynamic = DynamicResolution(0.8 * 1000.0 / self.fps, self.render_scale_min, self.render_scale_max)
+        self.profiler_overlay.post_processor = self.post_processor
         # Apply saved graphics settings
         self.post_processor.use_bloom = self.use_bloom
         self.post_processor.use_vignette = self.use_vignette
@@ -74,10 +122,14 @@ class Game:
         self.input_manager = InputManager(self)
         
         from src.graphics.renderer_2d import Renderer2D
-        self.renderer = Renderer2D()
+        self.renderer = Renderer2D(self.stream)
         
         self.scene_manager = SceneManager(self)
-        self.scene_manager.set_scene(MenuScene(self))
+        if self.replay:
+            from src.scenes.game_scene import GameScene
+            self.scene_manager.set_scene(GameScene(self))
+        else:
+            self.scene_manager.set_scene(MenuScene(self))
         
     def save_settings(self):
         # Update settings manager with current values
@@ -87,6 +139,7 @@ class Game:
         self.settings_manager.set("language", self.language)
         self.settings_manager.set("fullscreen", self.fullscreen)
         self.settings_manager.set("show_fps", self.show_fps)
+        self.settings_manager.set("show_profiler", self.show_profiler)
         self.settings_manager.set("music_volume", self.audio_manager.music_volume)
         self.settings_manager.set("sfx_volume", self.audio_manager.sfx_volume)
         self.settings_manager.set("high_score", self.high_score)
@@ -94,14 +147,35 @@ class Game:
         self.settings_manager.set("use_vignette", self.post_processor.use_vignette)
         self.settings_manager.set("use_chromatic", self.post_processor.use_chromatic)
         self.settings_manager.set("use_fxaa", self.post_processor.use_fxaa)
-        self.settings_manager.set("msaa_enabled", self.msaa_enabled)
+        self.settings_manager.set("fxaa_quality", self.post_processor.fxaa_quality)
         
         self.settings_manager.save()
 
+    def step_simulation(self, frame_time):
+        """
+        Advances the current scene in fixed sim_dt steps and returns the interpolation
+        factor (0..1) between the last two simulation states.
+        """
+        self.accumulator += frame_time
+        
+        steps = 0
+        while self.accumulator >= self.sim_dt and steps < self.max_sim_steps:
+            self.scene_manager.update(self.sim_dt)
+            self.accumulator -= self.sim_dt
+            steps += 1
+            
+        # Catch-up cap reached: drop the backlog instead of spiralling (the game slows down instead)
+        if self.accumulator >= self.sim_dt:
+            self.accumulator %= self.sim_dt
+            
+        return self.accumulator / self.sim_dt
+
     def run(self):
         while self.running:
-            dt = self.clock.tick(self.fps) / 1000.0
-            self.global_time += dt
+            frame_time = self.clock.tick(self.fps) / 1000.0
+            self.global_time += frame_time
+            self.profiler.begin_frame()
+            self.renderer.new_frame()
             
             self.input_manager.update()
             
@@ -116,21 +190,32 @@ class Game:
                     self.window.resize(event.w, event.h)
                     self.post_processor.resize(event.w, event.h)
                     self.warp_bg.resize(event.w, event.h)
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_F3:
+                        self.show_profiler = not self.show_profiler
+                    elif event.key == pygame.K_F9:
+                        csv_path, json_path = self.profiler.export()
+                        print(f"Profile exported to {csv_path} and {json_path}")
                 
                 self.scene_manager.handle_events(events)
                 
-            self.scene_manager.update(dt)
+            alpha = self.step_simulation(frame_time)
             
             try:
-                self.scene_manager.render()
+                self.scene_manager.render(alpha)
                 
-                if self.show_fps:
+                if self.show_fps or self.show_profiler:
                     self.renderer.begin_frame(self.window.width, self.window.height, self.window.width, self.window.height)
-                    fps_text = f"FPS: {int(self.clock.get_fps())}"
-                    self.fps_renderer.render_text(self.renderer, fps_text, self.window.width - 120, 10, (0, 255, 0))
+                    if self.show_fps:
+                        fps_text = f"FPS: {int(self.clock.get_fps())}"
+                        self.fps_renderer.render_text(self.renderer, fps_text, self.window.width - 120, 10, (0, 255, 0))
+                    if self.show_profiler:
+                        self.profiler_overlay.render(self.renderer, self.window.width - 300, 70)
                     self.renderer.end_frame()
                     
                 self.window.flip()
+                self.stream.end_frame()
+                self.profiler.end_frame()
                 
             except Exception as e:
                 with open("crash.log", "w") as f:
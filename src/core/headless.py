@@ -0,0 +1,147 @@
+import time
+from src.utils.localization import Localization
+from src.utils.profiler import FrameProfiler
+
+class NullAudioManager:
+    """
+    Audio stand-in for headless runs. Keeps the AudioManager interface without touching pygame.mixer.
+    """
+    def __init__(self):
+        self.music_volume = 0.0
+        self.sfx_volume = 0.0
+        self.current_track = None
+        
+    def play_music(self, track_name, fade_ms=1000, loop=-1, force_restart=False):
+        self.current_track = track_name
+        
+    def stop_music(self, fade_ms=1000):
+        self.current_track = None
+        
+    def set_music_volume(self, volume):
+        self.music_volume = max(0.0, min(1.0, volume))
+        
+    def set_sfx_volume(self, volume):
+        self.sfx_volume = max(0.0, min(1.0, volume))
+
+class HeadlessInputManager:
+    """
+    Virtual mouse driven by code (bots, scripted benchmarks) instead of pygame.
+    Positions are already in Virtual Space coordinates.
+    """
+    def __init__(self, game):
+        self.game = game
+        self.mouse_x = game.virtual_width / 2
+        self.mouse_y = game.virtual_height / 2
+        self.buttons = (False, False, False)
+        
+    def set_mouse(self, x, y, buttons=None):
+        self.mouse_x = x
+        self.mouse_y = y
+        if buttons is not None:
+            self.buttons = tuple(buttons)
+            
+    def get_mouse_pos(self):
+        return self.mouse_x, self.mouse_y
+        
+    def get_mouse_buttons(self):
+        return self.buttons
+        
+    def is_key_pressed(self, key):
+        return False
+        
+    def update(self):
+        pass
+
+class HeadlessGame:
+    """
+    Minimal Game replacement that runs the real GameScene.update path with no window and no GL context.
+    Used for CI benchmarks, bots and batch balance runs.
+    """
+    headless = True
+    
+    def __init__(self, difficulty='medium', sim_rate=120, seed=None, replay=None, record=False):
+        from src.scenes.scene_manager import SceneManager
+        
+        self.virtual_width = 1280
+        self.virtual_height = 720
+        
+        # A replay carries its own settings so the run reproduces exactly
+        self.replay = replay
+        self.seed = seed
+        self.record_replays = record
+        if replay:
+            difficulty = replay.difficulty
+            sim_rate = replay.sim_rate
+        self.difficulty = difficulty
+        
+        # Same fixed step as Game so headless runs reproduce windowed gameplay
+        self.sim_rate = sim_rate
+        self.sim_dt = 1.0 / sim_rate
+        
+        self.running = True
+        self.score = 0
+        self.high_score = 0
+        self.global_time = 0
+        
+        # One profiler frame per simulation tick
+        self.profiler = FrameProfiler()
+        
+        self.localization = Localization()
+        self.audio_manager = NullAudioManager()
+        self.input_manager = HeadlessInputManager(self)
+        self.scene_manager = SceneManager(self)
+        
+        from src.scenes.game_scene import GameScene
+        self.game_scene = GameScene(self)
+        self.scene_manager.set_scene(self.game_scene)
+        
+    def save_settings(self):
+        pass
+        
+    def step(self):
+        self.global_time += self.sim_dt
+        self.scene_manager.update(self.sim_dt)
+        
+    def run(self, max_ticks, controller=None):
+        """
+        Runs up to max_ticks simulation steps as fast as possible, or until the player dies
+        or the replay runs out. controller(game, tick) is called before each step to drive
+        the virtual input (ignored while a replay is playing).
+        Returns a summary dict of the run.
+        """
+        ticks = 0
+        start = time.perf_counter()
+        while self.running and ticks < max_ticks and not self.game_scene.game_over:
+            if self.replay and self.replay.finished:
+                break
+            if controller:
+                controller(self, ticks)
+            self.profiler.begin_frame()
+            self.step()
+            self.profiler.end_frame()
+            ticks += 1
+        elapsed = time.perf_counter() - start
+        
+        return {
+            "ticks": ticks,
+            "sim_time": ticks * self.sim_dt,
+            "wall_time": elapsed,
+            "ticks_per_sec": ticks / elapsed if elapsed > 0 else 0.0,
+            "score": self.score,
+            "wave": self.game_scene.wave_manager.wave,
+            "hp": self.game_scene.player.hp,
+            "game_over": self.game_scene.game_over,
+            "seed": self.game_scene.rng.seed,
+            "pools": self.game_scene.pool_stats(),
+        }
+
+def autopilot(game, tick):
+    """
+    Simple scripted pilot: sweeps across the lower half of the screen while holding fire.
+    Gives benchmarks a representative bullet/collision workload.
+    """
+    import math
+    t = tick * game.sim_dt
+    x = game.virtual_width / 2 + math.sin(t * 0.7) * 500
+    y = game.virtual_height * 0.75 + math.sin(t * 1.3) * 100
+    game.input_manager.set_mouse(x, y, (False, False, True))
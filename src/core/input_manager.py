@@ -24,6 +24,12 @@ class InputManager:
         
         return vmx, vmy
 
+    def get_mouse_buttons(self):
+        """
+        Returns the (left, middle, right) mouse button state.
+        """
+        return pygame.mouse.get_pressed()
+
     def is_key_pressed(self, key):
         keys = pygame.key.get_pressed()
         return keys[key]
@@ -0,0 +1,74 @@
+import json
+import os
+import time
+
+REPLAY_VERSION = 1
+
+class InputRecorder:
+    """
+    Logs the per-tick virtual mouse position and fire button state consumed by GameScene.
+    Together with the RNG seed this is enough to reproduce a run exactly.
+    """
+    def __init__(self, seed, difficulty, sim_rate):
+        self.seed = seed
+        self.difficulty = difficulty
+        self.sim_rate = sim_rate
+        self.frames = [] # [mx, my, firing] per simulation tick
+        
+    def record(self, mx, my, firing):
+        self.frames.append([mx, my, int(bool(firing))])
+        
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        data = {
+            "version": REPLAY_VERSION,
+            "seed": self.seed,
+            "difficulty": self.difficulty,
+            "sim_rate": self.sim_rate,
+            "frames": self.frames
+        }
+        # Floats are written with repr precision, so positions round-trip exactly
+        with open(path, "w") as f:
+            json.dump(data, f)
+        
+    def save_to_dir(self, directory="replays"):
+        path = os.path.join(directory, time.strftime("replay_%Y%m%d_%H%M%S.json"))
+        self.save(path)
+        return path
+
+class Replay:
+    """
+    Recorded run played back tick by tick. GameScene pulls one input per simulation step.
+    """
+    def __init__(self, seed, difficulty, sim_rate, frames):
+        self.seed = seed
+        self.difficulty = difficulty
+        self.sim_rate = sim_rate
+        self.frames = frames
+        self.cursor = 0
+        
+    @classmethod
+    def load(cls, path):
+        with open(path, "r") as f:
+            data = json.load(f)
+        if data.get("version") != REPLAY_VERSION:
+            raise ValueError(f"Unsupported replay version: {data.get('version')}")
+        return cls(data["seed"], data["difficulty"], data["sim_rate"], data["frames"])
+        
+    @property
+    def finished(self):
+        return self.cursor >= len(self.frames)
+        
+    def __len__(self):
+        return len(self.frames)
+        
+    def next_input(self):
+        """
+        Returns (mx, my, firing) for the next tick. Holds the last input once exhausted.
+        """
+        index = min(self.cursor, len(self.frames) - 1)
+        self.cursor += 1
+        mx, my, firing = self.frames[index]
+        return mx, my, bool(firing)
@@ -0,0 +1,35 @@
+import random
+import zlib
+import numpy as np
+
+class RNGService:
+    """
+    Single owner of gameplay randomness. Seeding it makes a run reproducible.
+    Scalar draws go through a random.Random (fast per call), array draws through a
+    NumPy Generator; both streams are derived from the same seed.
+    """
+    def __init__(self, seed=None):
+        self.reseed(seed)
+        
+    def reseed(self, seed=None):
+        if seed is None:
+            seed = random.SystemRandom().randrange(2**32)
+        self.seed = seed
+        self.py = random.Random(seed)
+        self.np = np.random.default_rng(seed)
+        
+    def fork(self, name):
+        """
+        Returns an independent RNGService for a subsystem (e.g. cosmetic particles),
+        so its draws never shift the gameplay stream.
+        """
+        return RNGService((self.seed + zlib.crc32(name.encode())) % 2**32)
+        
+    def random(self):
+        return self.py.random()
+        
+    def randint(self, a, b):
+        return self.py.randint(a, b)
+        
+    def uniform(self, a, b):
+        return self.py.uniform(a, b)
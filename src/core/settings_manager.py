@@ -6,11 +6,18 @@ class SettingsManager:
         self.settings_file = settings_file
         self.settings = {
             "fps": 60,
+            "sim_rate": 120,
+            "max_sim_steps": 8,
+            "record_replays": False,
+            "bullet_pool_max": 65536,
+            "particle_pool_max": 65536,
+            "stream_persistent": True,
             "width": 1280,
             "height": 720,
             "language": "en",
             "fullscreen": False,
             "show_fps": False,
+            "show_profiler": False,
             "music_volume": 0.5,
             "sfx_volume": 0.5,
             "high_score": 0,
@@ -18,7 +25,15 @@ class SettingsManager:
             "use_vignette": True,
             "use_chromatic": False,
             "use_fxaa": False,
-            "msaa_enabled": True
+            "fxaa_quality": "medium",
+            "render_scale": 1.0,
+            "dynamic_resolution": True,
+            "render_scale_min": 0.5,
+            "render_scale_max": 2.0,
+            "bloom_mode": "dual",
+            "bloom_levels": 5,
+            "bloom_quality": "medium",
+            "nebula_refresh_frames": 0
         }
         self.load()
 
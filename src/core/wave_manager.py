@@ -1,23 +1,24 @@
-import random
-from src.entities.enemy import Enemy
+from src.entities.enemy_bank import EnemyBank
 from src.entities.boss import Boss
 
 class WaveManager:
     def __init__(self, game):
         self.game = game
         self.wave = 1
-        self.enemies = []
+        self.enemies = EnemyBank(game.bullet_manager, getattr(game.game, 'difficulty', 'medium'), game.rng)
         self.wave_timer = 0
         self.spawn_timer = 0
         self.boss = None
         
+    def save_state(self):
+        self.enemies.save_state()
+        if self.boss:
+            self.boss.save_state()
+        
     def update(self, dt):
         self.wave_timer += dt
         self.spawn_timer += dt
         
-        # Clean up dead enemies
-        self.enemies = [e for e in self.enemies if e.active]
-        
         if self.boss:
             self.boss.update(dt)
             if not self.boss.active:
@@ -53,14 +54,14 @@ class WaveManager:
             self.wave_timer = 0
             print(f"Wave {self.wave} Started!")
 
-        for e in self.enemies:
-            e.update(dt, self.game.player)
+        self.enemies.update(dt, self.game.player)
             
     def spawn_enemy(self, difficulty):
         # Determine if we should spawn a group
         # All types spawn in groups of 1-5
-        type_id = random.randint(0, 4)
-        count = random.randint(1, 5)
+        rng = self.game.rng
+        type_id = rng.randint(0, 4)
+        count = rng.randint(1, 5)
         
         # Spacing/Mode based on type
         spacing = 50
@@ -87,26 +88,16 @@ class WaveManager:
     def spawn_group(self, type_id, difficulty, count, spacing, mode='tight'):
         if mode == 'tight':
             # Spawn a group centered around a random X
-            center_x = random.randint(100 + (count * spacing)//2, 1180 - (count * spacing)//2)
+            center_x = self.game.rng.randint(100 + (count * spacing)//2, 1180 - (count * spacing)//2)
             start_x = center_x - ((count - 1) * spacing) // 2
             
-            for i in range(count):
-                x = start_x + i * spacing
-                y = -50 - (i * 30) # Stagger Y slightly
-                enemy = Enemy(x, y, type_id, self.game.bullet_manager, difficulty)
-                self.enemies.append(enemy)
+            xs = [start_x + i * spacing for i in range(count)]
+            ys = [-50 - (i * 30) for i in range(count)] # Stagger Y slightly
+            self.enemies.spawn(xs, ys, type_id)
         else: # spread
             # Distribute across screen width or random positions
             # Simple approach: Pick random X for each, ensuring some distance?
             # Or just random X.
-            for i in range(count):
-                x = random.randint(100, 1180)
-                y = -50 - (i * 50) # More stagger
-                enemy = Enemy(x, y, type_id, self.game.bullet_manager, difficulty)
-                self.enemies.append(enemy)
-
-    def render(self):
-        for e in self.enemies:
-            e.render()
-        if self.boss:
-            self.boss.render()
+            xs = [self.game.rng.randint(100, 1180) for i in range(count)]
+            ys = [-50 - (i * 50) for i in range(count)] # More stagger
+            self.enemies.spawn(xs, ys, type_id)
@@ -1,6 +1,7 @@
 import math
 from src.entities.entity import Entity
-from OpenGL.GL import *
+from src.entities import bullet_patterns
+from src.entities.bullet_manager import STYLE_BOSS
 
 class Boss(Entity):
     def __init__(self, x, y, bullet_manager):
@@ -10,6 +11,7 @@ class Boss(Entity):
         self.max_hp = 1000
         self.phase = 0
         self.time = 0
+        self.shoot_timer = 0
         self.width = 100
         self.height = 100
         
@@ -21,28 +23,13 @@ class Boss(Entity):
         self.y = 150 + math.sin(self.time) * 50
         
         # Shooting patterns based on phase
-        if self.time % 0.2 < dt:
+        # Accumulated timer so the volley rate doesn't depend on the step size
+        self.shoot_timer += dt
+        if self.shoot_timer >= 0.2:
+            self.shoot_timer -= 0.2
             self.shoot_pattern()
             
     def shoot_pattern(self):
         # Geometric pattern: Circle
-        num_bullets = 20
-        for i in range(num_bullets):
-            angle = (i / num_bullets) * 2 * math.pi + self.time
-            dx = math.cos(angle) * 300
-            dy = math.sin(angle) * 300
-            self.bullet_manager.spawn_bullet(self.x, self.y, dx, dy, "enemy")
-
-    def render(self):
-        glPushMatrix()
-        glTranslatef(self.x, self.y, 0)
-        glColor3f(1.0, 0.0, 1.0) # Magenta
-        
-        glBegin(GL_QUADS)
-        glVertex2f(-50, -50)
-        glVertex2f(50, -50)
-        glVertex2f(50, 50)
-        glVertex2f(-50, 50)
-        glEnd()
-        
-        glPopMatrix()
+        dxs, dys = bullet_patterns.ring(20, 300, phase=self.time)
+        self.bullet_manager.spawn_bullets(self.x, self.y, dxs, dys, "enemy", STYLE_BOSS)
@@ -1,63 +1,94 @@
 import numpy as np
-from OpenGL.GL import *
-import random
-import ctypes
+from src.utils.pool import PoolStats, Scratch, reserve, resize, in_bounds, compact
+
+# Bullet styles, stored per bullet next to the pool; BulletRenderer maps them to color and size
+STYLE_PLAYER = 0
+STYLE_ENEMY = 1
+STYLE_BOSS = 2
 
 class BulletManager:
-    def __init__(self, particle_system=None):
+    def __init__(self, particle_system=None, capacity=1024, max_capacity=65536):
         self.particle_system = particle_system
-        self.capacity = 5000
         
-        # x, y, dx, dy
-        self.p_data = np.zeros((self.capacity, 4), dtype=np.float32)
+        # x, y, dx, dy; each faction's pool doubles on demand up to max_capacity
+        self.p_data = np.zeros((capacity, 4), dtype=np.float32)
+        self.p_style = np.zeros(capacity, dtype=np.uint8)
         self.p_count = 0
+        self.p_stats = PoolStats(capacity, max_capacity)
         
-        self.e_data = np.zeros((self.capacity, 4), dtype=np.float32)
+        self.e_data = np.zeros((capacity, 4), dtype=np.float32)
+        self.e_style = np.zeros(capacity, dtype=np.uint8)
         self.e_count = 0
+        self.e_stats = PoolStats(capacity, max_capacity)
+        
+        # Work buffers so steady-state updates allocate nothing
+        self.p_scratch = Scratch()
+        self.e_scratch = Scratch()
         
-        self.p_vbo = glGenBuffers(1)
-        self.e_vbo = glGenBuffers(1)
+    def stats(self):
+        return {"player_bullets": self.p_stats.as_dict(), "enemy_bullets": self.e_stats.as_dict()}
         
     def spawn_bullet(self, x, y, dx, dy, type_str="player"):
-        if type_str == "player":
-            if self.p_count < self.capacity:
-                self.p_data[self.p_count] = [x, y, dx, dy]
-                self.p_count += 1
+        self.spawn_bullets(x, y, dx, dy, type_str)
+                
+    def spawn_bullets(self, xs, ys, dxs, dys, faction="player", style=None):
+        """
+        Spawns a whole volley with one slice assignment. Arguments are arrays (or scalars)
+        that broadcast together; bullets past the hard cap are dropped and counted.
+        style defaults to the faction's style. Returns the number spawned.
+        """
+        xs, ys, dxs, dys = np.broadcast_arrays(xs, ys, dxs, dys)
+        if faction == "player":
+            self.p_data, n = reserve(self.p_data, self.p_count, xs.size, self.p_stats)
+            self.p_style = resize(self.p_style, len(self.p_data), self.p_count)
+            data, styles, count = self.p_data, self.p_style, self.p_count
+            if style is None: style = STYLE_PLAYER
+        else:
+            self.e_data, n = reserve(self.e_data, self.e_count, xs.size, self.e_stats)
+            self.e_style = resize(self.e_style, len(self.e_data), self.e_count)
+            data, styles, count = self.e_data, self.e_style, self.e_count
+            if style is None: style = STYLE_ENEMY
+            
+        if n == 0: return 0
+        
+        block = data[count:count + n]
+        block[:, 0] = xs.ravel()[:n]
+        block[:, 1] = ys.ravel()[:n]
+        block[:, 2] = dxs.ravel()[:n]
+        block[:, 3] = dys.ravel()[:n]
+        styles[count:count + n] = style
+        
+        if faction == "player":
+            self.p_count += n
         else:
-            if self.e_count < self.capacity:
-                self.e_data[self.e_count] = [x, y, dx, dy]
-                self.e_count += 1
+            self.e_count += n
+        return n
                 
     def update(self, dt):
-        self._update_group(self.p_data, self.p_count, dt)
-        self._update_group(self.e_data, self.e_count, dt)
+        self._update_group(self.p_data, self.p_count, dt, self.p_scratch)
+        self._update_group(self.e_data, self.e_count, dt, self.e_scratch)
         
         # Compact
-        self.p_count = self._compact(self.p_data, self.p_count)
-        self.e_count = self._compact(self.e_data, self.e_count)
+        self.p_count = self._compact(self.p_data, self.p_style, self.p_count, self.p_scratch)
+        self.e_count = self._compact(self.e_data, self.e_style, self.e_count, self.e_scratch)
         
         # Particles (Simplified)
         if self.particle_system:
             # Random emit logic...
             pass
             
-    def _update_group(self, data, count, dt):
+    def _update_group(self, data, count, dt, scratch):
         if count == 0: return
-        slice_ = data[:count]
-        slice_[:, 0] += slice_[:, 2] * dt
-        slice_[:, 1] += slice_[:, 3] * dt
+        # One column at a time: 1D ufuncs with out= never need temporaries
+        step = scratch.get("step", len(data))[:count]
+        for axis in (0, 1):
+            np.multiply(data[:count, 2 + axis], dt, out=step)
+            np.add(data[:count, axis], step, out=data[:count, axis])
         
-    def _compact(self, data, count):
+    def _compact(self, data, styles, count, scratch):
         if count == 0: return 0
-        slice_ = data[:count]
-        mask = (slice_[:, 0] >= -50) & (slice_[:, 0] <= 1330) & \
-               (slice_[:, 1] >= -50) & (slice_[:, 1] <= 770)
-        if not np.all(mask):
-            kept = slice_[mask]
-            k_len = len(kept)
-            data[:k_len] = kept
-            return k_len
-        return count
+        keep = in_bounds(data[:count, 0], data[:count, 1], -50, 1330, -50, 770, scratch, len(data))
+        return compact((data, styles), count, keep, scratch)
         
     def render(self):
         # Rendering handled by BulletRenderer
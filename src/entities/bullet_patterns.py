@@ -0,0 +1,47 @@
+import numpy as np
+
+# Velocity generators for bullet volleys. Each returns (dxs, dys) arrays, ready to
+# pass to BulletManager.spawn_bullets together with the spawn position(s).
+# Angles are in radians, measured like math.atan2 in screen space (y down).
+
+def rotate(dxs, dys, angles):
+    """
+    Rotates velocity vectors by angles; all arguments broadcast together.
+    """
+    cs = np.cos(angles)
+    sn = np.sin(angles)
+    return dxs * cs - dys * sn, dxs * sn + dys * cs
+
+def ring(count, speed, phase=0.0):
+    """
+    count bullets evenly spaced around a full circle, the first one at phase.
+    """
+    angles = np.arange(count) / count * 2 * np.pi + phase
+    return np.cos(angles) * speed, np.sin(angles) * speed
+
+def arc(count, speed, center, spread):
+    """
+    count bullets evenly spaced over spread radians centred on the center angle.
+    """
+    if count == 1:
+        angles = np.array([center], dtype=np.float64)
+    else:
+        angles = center + np.linspace(-spread / 2, spread / 2, count)
+    return np.cos(angles) * speed, np.sin(angles) * speed
+
+def aimed_fan(xs, ys, tx, ty, speed, offsets):
+    """
+    Fans aimed from each shooter (xs, ys) at the target (tx, ty), rotated by offsets.
+    With N shooters and K offsets (shape (K,) or (N, K)) this returns (N, K) arrays.
+    Shooters sitting on the target fire straight down.
+    """
+    dx = np.asarray(tx - np.asarray(xs, dtype=np.float64))
+    dy = np.asarray(ty - np.asarray(ys, dtype=np.float64))
+    dist = np.sqrt(dx * dx + dy * dy)
+
+    on_target = dist <= 0
+    safe = np.where(on_target, 1.0, dist)
+    vx = np.where(on_target, 0.0, dx / safe * speed)
+    vy = np.where(on_target, speed, dy / safe * speed)
+
+    return rotate(vx[..., None], vy[..., None], np.asarray(offsets, dtype=np.float64))
@@ -0,0 +1,241 @@
+import numpy as np
+from src.core.rng import RNGService
+from src.entities import bullet_patterns
+
+# Enemy states
+ENTERING = 0
+ACTIVE = 1
+
+# Per-type fire interval in seconds before the difficulty multiplier; kamikazes never shoot
+FIRE_INTERVALS = np.array([1.5, 2.0, np.inf, 1.0, 0.5])
+
+# Zigzag spread velocities; easy/medium fire the first 3, hard 5, extreme all 7
+ZIGZAG_FAN = np.array([(0, 300), (-100, 250), (100, 250), (-200, 200), (200, 200), (-300, 150), (300, 150)], dtype=np.float64)
+ZIGZAG_FAN_SIZE = {'hard': 5, 'extreme': 7}
+
+# Yellow aimed-shot offsets in radians; slot 0 is replaced by a random jitter per shot
+YELLOW_SPREAD = np.array([0.0, -0.2, 0.2, -0.4, 0.4])
+YELLOW_SPREAD_SIZE = {'hard': 3, 'extreme': 5}
+
+HP_MULT = {'easy': 1.0, 'medium': 1.5, 'hard': 2.0, 'extreme': 3.0}
+FIRE_RATE_MULT = {'easy': 1.0, 'medium': 0.7, 'hard': 0.5, 'extreme': 0.3}
+
+class EnemyBank:
+    """
+    All live enemies as structure-of-arrays NumPy columns.
+    Rows [0, count) are in spawn order; dead rows are compacted away stably.
+    """
+    def __init__(self, bullet_manager, difficulty='medium', rng=None, capacity=256):
+        self.bullet_manager = bullet_manager
+        self.difficulty = difficulty
+        self.rng = rng if rng is not None else RNGService()
+        self.fire_rate_mult = FIRE_RATE_MULT.get(difficulty, 1.0)
+        self.capacity = capacity
+        self.count = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.angle = np.zeros(capacity)
+        self.target_angle = np.zeros(capacity)
+        self.state = np.zeros(capacity, dtype=np.uint8)
+        self.time = np.zeros(capacity)
+        self.shoot_timer = np.zeros(capacity)
+        self.hp = np.zeros(capacity)
+        self.type = np.zeros(capacity, dtype=np.int8)
+        self.active = np.zeros(capacity, dtype=bool)
+
+        # State at the previous simulation step, used for render interpolation
+        self.prev_x = np.zeros(capacity)
+        self.prev_y = np.zeros(capacity)
+        self.prev_angle = np.zeros(capacity)
+
+    def columns(self):
+        return (self.x, self.y, self.vx, self.vy, self.angle, self.target_angle, self.state, self.time,
+                self.shoot_timer, self.hp, self.type, self.active, self.prev_x, self.prev_y, self.prev_angle)
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self, needed):
+        capacity = max(self.capacity, 1)
+        while capacity < needed:
+            capacity *= 2
+        old = self.columns()
+        self._allocate(capacity)
+        for src, dst in zip(old, self.columns()):
+            dst[:self.count] = src[:self.count]
+        self.capacity = capacity
+
+    def spawn(self, xs, ys, type_id):
+        xs = np.asarray(xs, dtype=np.float64)
+        n = len(xs)
+        if self.count + n > self.capacity:
+            self._grow(self.count + n)
+
+        s = slice(self.count, self.count + n)
+        self.x[s] = xs
+        # Start above screen if not already
+        self.y[s] = np.minimum(ys, -50)
+        self.vx[s] = 0
+        self.vy[s] = 0
+        self.angle[s] = 180 # Facing down
+        self.target_angle[s] = 180
+        self.state[s] = ENTERING
+        self.time[s] = 0
+        self.shoot_timer[s] = 0
+        self.hp[s] = 10 * HP_MULT.get(self.difficulty, 1.0)
+        self.type[s] = type_id
+        self.active[s] = True
+        self.prev_x[s] = self.x[s]
+        self.prev_y[s] = self.y[s]
+        self.prev_angle[s] = 180
+        self.count += n
+
+    def clear(self):
+        self.count = 0
+
+    def compact(self):
+        n = self.count
+        alive = self.active[:n].copy()
+        if alive.all(): return
+
+        k = int(np.count_nonzero(alive))
+        for col in self.columns():
+            col[:k] = col[:n][alive]
+        self.count = k
+
+    def save_state(self):
+        n = self.count
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+        self.prev_angle[:n] = self.angle[:n]
+
+    def lerp_state(self, alpha):
+        """
+        Returns (x, y, angle) arrays blended between the previous and current simulation step.
+        """
+        n = self.count
+        return (
+            self.prev_x[:n] + (self.x[:n] - self.prev_x[:n]) * alpha,
+            self.prev_y[:n] + (self.y[:n] - self.prev_y[:n]) * alpha,
+            self.prev_angle[:n] + (self.angle[:n] - self.prev_angle[:n]) * alpha
+        )
+
+    def update(self, dt, player=None):
+        self.compact()
+        n = self.count
+        if n == 0: return
+
+        x, y = self.x[:n], self.y[:n]
+        vx, vy = self.vx[:n], self.vy[:n]
+        angle, target_angle = self.angle[:n], self.target_angle[:n]
+        state, time, type_ = self.state[:n], self.time[:n], self.type[:n]
+        shoot_timer = self.shoot_timer[:n]
+
+        time += dt
+
+        # ENTERING: face down and slide to y = 25, then switch to ACTIVE with a fresh pattern clock
+        entering = state == ENTERING
+        active = ~entering
+        if entering.any():
+            angle[entering] = 0
+            moving_in = entering & (y < 25)
+            y[moving_in] += 200 * dt
+            arrived = entering & ~moving_in
+            state[arrived] = ACTIVE
+            time[arrived] = 0
+        if not active.any(): return
+
+        t0 = active & (type_ == 0) # Red - Sine
+        t1 = active & (type_ == 1) # Zigzag
+        t2 = active & (type_ == 2) # Blue - Kamikaze with tracking
+        t3 = active & (type_ == 3) # Yellow - Stop and shoot
+        t4 = active & (type_ == 4) # Orbit
+
+        vy[t0] = 100
+        vx[t0] = np.cos(time[t0] * 2) * 150
+
+        vy[t1] = 80
+        vx[t1] = np.where(np.floor(time[t1]) % 2 == 0, 100, -100)
+
+        if t2.any():
+            vy[t2] = 300
+            target_vx = 0.0
+            if player:
+                # Steer towards player X with smoothing
+                dx = player.x - x[t2]
+                target_vx = np.where(dx > 10, 300.0, np.where(dx < -10, -300.0, 0.0))
+            vx[t2] += (target_vx - vx[t2]) * 5 * dt
+
+        vy[t3] = np.where(time[t3] < 1.0, 150, 0)
+        vx[t3] = 0
+
+        vy[t4] = 50
+        vx[t4] = np.cos(time[t4]) * 100
+
+        # Apply Velocity
+        x[active] += vx[active] * dt
+        y[active] += vy[active] * dt
+
+        # Boundary Checks (Sides only)
+        left = active & (x < 20)
+        x[left] = 20
+        vx[left] *= -1
+        x[active & (x > 1260)] = 1260
+
+        # Off-screen Culling (Bottom)
+        culled = active & (y > 820)
+        self.active[:n][culled] = False
+        active &= ~culled
+        t3 &= ~culled
+
+        # Target angle: yellows aim at the player, everything else faces its movement
+        steer = active & ~t3 & ((np.abs(vx) > 10) | (np.abs(vy) > 10))
+        target_angle[steer] = np.degrees(np.arctan2(vy[steer], vx[steer])) - 90
+        if player:
+            target_angle[t3] = np.degrees(np.arctan2(player.y - y[t3], player.x - x[t3])) - 90
+        else:
+            target_angle[t3] = 0
+
+        # Smooth Rotation
+        diff = (target_angle[active] - angle[active] + 180) % 360 - 180
+        angle[active] += diff * 5 * dt
+
+        # Shooting
+        shoot_timer[active] += dt
+        firing = active & (shoot_timer > FIRE_INTERVALS[type_] * self.fire_rate_mult)
+        if firing.any():
+            shoot_timer[firing] = 0
+            self.fire(firing & t0, firing & t1, firing & t3, firing & t4, player)
+
+    def fire(self, red, zigzag, yellow, orbit, player):
+        # One batched volley per enemy type; masks select the firing rows
+        spawn = self.bullet_manager.spawn_bullets
+        x, y = self.x[:self.count], self.y[:self.count]
+
+        if red.any(): # Shoot straight down
+            spawn(x[red], y[red] + 20, 0, 300, "enemy")
+
+        if zigzag.any(): # Fixed spread, wider on harder difficulties
+            fan = ZIGZAG_FAN[:ZIGZAG_FAN_SIZE.get(self.difficulty, 3)]
+            spawn(x[zigzag][:, None], y[zigzag][:, None] + 20, fan[:, 0], fan[:, 1], "enemy")
+
+        if yellow.any(): # Aimed at player with a little jitter per shooter
+            ys = y[yellow]
+            offsets = YELLOW_SPREAD[:YELLOW_SPREAD_SIZE.get(self.difficulty, 1)]
+            offsets = np.broadcast_to(offsets, (len(ys), len(offsets))).copy()
+            offsets[:, 0] = [self.rng.uniform(-0.1, 0.1) for _ in range(len(ys))]
+
+            if player:
+                dxs, dys = bullet_patterns.aimed_fan(x[yellow], ys, player.x, player.y, 400, offsets)
+            else:
+                dxs, dys = bullet_patterns.rotate(0.0, 400.0, offsets)
+            spawn(x[yellow][:, None], ys[:, None] + 20, dxs, dys, "enemy")
+
+        if orbit.any(): # Spiral
+            angle = self.time[:self.count][orbit] * 2
+            spawn(x[orbit], y[orbit] + 20, np.cos(angle) * 200, np.sin(angle) * 200 + 200, "enemy")
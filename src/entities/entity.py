@@ -2,7 +2,28 @@ class Entity:
     def __init__(self, x, y):
         self.x = x
         self.y = y
+        self.angle = 0
         self.active = True
+        
+        # State at the previous simulation step, used for render interpolation
+        self.prev_x = x
+        self.prev_y = y
+        self.prev_angle = 0
+
+    def save_state(self):
+        self.prev_x = self.x
+        self.prev_y = self.y
+        self.prev_angle = self.angle
+
+    def lerp_state(self, alpha):
+        """
+        Returns (x, y, angle) blended between the previous and current simulation step.
+        """
+        return (
+            self.prev_x + (self.x - self.prev_x) * alpha,
+            self.prev_y + (self.y - self.prev_y) * alpha,
+            self.prev_angle + (self.angle - self.prev_angle) * alpha
+        )
 
     def update(self, dt):
         pass
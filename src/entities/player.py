@@ -1,4 +1,3 @@
-import pygame
 from src.entities.entity import Entity
 
 class Player(Entity):
@@ -16,7 +15,7 @@ class Player(Entity):
         self.angle = 0
         self.hitbox_radius = 4 # Exact size of visual core
 
-    def update(self, dt, mx, my):
+    def update(self, dt, mx, my, shooting=False):
         # Calculate velocity for tilt
         dx = mx - self.x
         target_angle = dx * 0.5 # Fixed inverted tilt
@@ -38,8 +37,8 @@ class Player(Entity):
         
         self.shoot_timer -= dt
         
-        # Handle shooting
-        if pygame.mouse.get_pressed()[2]: # Right click
+        # Handle shooting (right button state is sampled by the scene's input source)
+        if shooting:
             self.shoot()
 
     def shoot(self):
@@ -48,11 +47,11 @@ class Player(Entity):
             self.shoot_timer = 0.1 # Fire rate
 
     def render(self):
-        # Rendering is now handled by PlayerRenderer, but we keep this for compatibility
+        # Rendering is now handled by EntityRenderer, but we keep this for compatibility
         # or we can remove it and call renderer directly in GameScene.
         # For now, let's instantiate renderer here or pass it in?
         # Better: GameScene should have the renderer and call it.
         # But to keep GameScene simple, Player can hold its renderer?
         # Or better: Player shouldn't know about rendering.
-        # Let's update GameScene to use PlayerRenderer.
+        # GameScene draws the player with EntityRenderer.
         pass
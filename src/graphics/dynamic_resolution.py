@@ -0,0 +1,78 @@
+from OpenGL.GL import *
+from OpenGL.raw.GL.VERSION.GL_3_3 import glGetQueryObjectui64v
+from collections import deque
+import ctypes
+import math
+
+class DynamicResolution:
+    """
+    Picks the scene render scale from measured GPU time. Each frame's scene and post
+    passes are wrapped in a GL_TIME_ELAPSED query; results are collected a few frames
+    later, once available, so the CPU never waits on the GPU.
+
+    Every `interval` frames the median GPU time is compared with target_ms: over budget
+    scales down, well under budget scales up. Pixel cost grows with the square of the
+    scale, so the correction is the square root of the time ratio, limited per step and
+    snapped to `step` so the scene target is not reallocated for tiny changes.
+    """
+    def __init__(self, target_ms, min_scale=0.5, max_scale=2.0, step=0.05, interval=30, headroom=0.7):
+        self.target_ms = target_ms
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.step = step
+        self.interval = interval
+        self.headroom = headroom # Only scale up when under headroom * target_ms
+
+        self.free = list(glGenQueries(4))
+        self.pending = deque()
+        self.active = None
+        self.samples = deque(maxlen=interval)
+        self.frames_since_change = 0
+        self.last_gpu_ms = 0.0
+        self.result = ctypes.c_uint64()
+
+    def begin_frame(self):
+        # All queries still in flight: skip timing this frame rather than wait
+        if not self.free: return
+        self.active = self.free.pop()
+        glBeginQuery(GL_TIME_ELAPSED, self.active)
+
+    def end_frame(self):
+        if self.active is None: return
+        glEndQuery(GL_TIME_ELAPSED)
+        self.pending.append(self.active)
+        self.active = None
+
+        # Collect finished queries, oldest first
+        while self.pending and glGetQueryObjectiv(self.pending[0], GL_QUERY_RESULT_AVAILABLE):
+            query = self.pending.popleft()
+            glGetQueryObjectui64v(int(query), GL_QUERY_RESULT, ctypes.byref(self.result))
+            self.free.append(query)
+            gpu_ms = self.result.value / 1e6
+            # Some drivers (software rasterizers) report garbage; ignore implausible samples
+            if 0.0 < gpu_ms < 1000.0:
+                self.samples.append(gpu_ms)
+                self.last_gpu_ms = gpu_ms
+
+    def update(self, scale):
+        """
+        Returns the render scale to use from the next frame on.
+        """
+        self.frames_since_change += 1
+        if self.frames_since_change < self.interval or len(self.samples) < self.interval // 2:
+            return scale
+
+        gpu_ms = sorted(self.samples)[len(self.samples) // 2]
+        if self.headroom * self.target_ms <= gpu_ms <= self.target_ms:
+            return scale
+
+        factor = min(1.1, max(0.8, math.sqrt(self.target_ms * 0.85 / gpu_ms)))
+        new_scale = round(scale * factor / self.step) * self.step
+        new_scale = min(self.max_scale, max(self.min_scale, new_scale))
+        if abs(new_scale - scale) < 1e-6:
+            return scale
+
+        # Timings taken at the old scale no longer apply
+        self.samples.clear()
+        self.frames_since_change = 0
+        return new_scale
@@ -0,0 +1,49 @@
+from collections import OrderedDict
+from src.graphics.text_renderer import TextRenderer
+
+class FontRegistry:
+    """
+    App-wide TextRenderer cache keyed by (font_name, size, antialias).
+    Scenes acquire and release renderers; shared instances are refcounted so a font
+    is looked up and its glyph atlas built once. Released fonts wait in an LRU of idle
+    entries, so going back to a recent scene is free; the oldest idle entries free
+    their GL textures once the LRU is full.
+    """
+    def __init__(self, max_idle=8):
+        self.max_idle = max_idle
+        self.live = {} # key -> [renderer, refcount]
+        self.idle = OrderedDict() # key -> renderer, least recently released first
+        self.keys = {} # id(renderer) -> key
+
+    def acquire(self, font_name=None, size=24, antialias=False):
+        key = (font_name, size, antialias)
+        entry = self.live.get(key)
+        if entry is None:
+            renderer = self.idle.pop(key, None)
+            if renderer is None:
+                renderer = TextRenderer(font_name=font_name, size=size, antialias=antialias)
+                self.keys[id(renderer)] = key
+            entry = self.live[key] = [renderer, 0]
+        entry[1] += 1
+        return entry[0]
+
+    def release(self, renderer):
+        key = self.keys.get(id(renderer))
+        entry = self.live.get(key)
+        if entry is None: return
+
+        entry[1] -= 1
+        if entry[1] > 0: return
+
+        del self.live[key]
+        self.idle[key] = renderer
+        while len(self.idle) > self.max_idle:
+            _, evicted = self.idle.popitem(last=False)
+            del self.keys[id(evicted)]
+            evicted.clear_cache()
+
+    def stats(self):
+        return {
+            "live": {key: entry[1] for key, entry in self.live.items()},
+            "idle": list(self.idle.keys()),
+        }
@@ -3,24 +3,62 @@ from OpenGL.GL import *
 from src.graphics.shader import Shader
 import numpy as np
 
+# Bloom quality tier -> (first mip level divisor, wide kernels)
+BLOOM_QUALITY = {
+    "low": (4, False), # Chain starts at quarter resolution, 5/8-tap dual filter
+    "medium": (2, False), # Half resolution, dual filter
+    "high": (2, True), # Half resolution, 13-tap downsample and 3x3 tent upsample
+}
+
+# FXAA quality preset -> fxaa.frag permutation
+FXAA_PRESETS = {
+    "low": "FXAA_LOW",
+    "medium": "FXAA_MEDIUM",
+    "high": "FXAA_HIGH",
+}
+
 class PostProcessor:
-    def __init__(self, width, height):
+    """
+    Scenes are captured into an offscreen target of virtual resolution times render_scale,
+    post-processed, and composited into the window's letterbox rect. With a DynamicResolution
+    attached, render_scale follows the measured GPU time.
+
+    Bloom is either a downsample/upsample mip chain ("dual", bloom_levels deep) or the
+    original ping-pong Gaussian blur at half resolution ("gaussian").
+
+    FXAA, when enabled, is the last pass: it reads the composited LDR image at scene
+    resolution and writes the anti-aliased result straight into the letterbox rect.
+    """
+    def __init__(self, width, height, virtual_width=1280, virtual_height=720, render_scale=1.0,
+                 bloom_mode="dual", bloom_levels=5, bloom_quality="medium", fxaa_quality="medium"):
+        # Window size
         self.width = width
         self.height = height
+        self.virtual_width = virtual_width
+        self.virtual_height = virtual_height
+        self.render_scale = render_scale
+        self.dynamic = None # Optional DynamicResolution
         
         # Settings
         self.use_bloom = True
         self.use_vignette = True
         self.use_chromatic = False
-        self.use_fxaa = False # Placeholder
+        self.use_fxaa = False
+        self.fxaa_quality = fxaa_quality if fxaa_quality in FXAA_PRESETS else "medium"
+        self.bloom_mode = bloom_mode
+        self.bloom_levels = max(1, bloom_levels)
+        self.bloom_quality = bloom_quality if bloom_quality in BLOOM_QUALITY else "medium"
+        self.bloom_threshold = 0.6
+        self.bloom_radius = 1.0 # Upsample tap spread, in texels of the smaller level
         
-        # Load Shaders
-        self.shader_post = Shader('assets/shaders/post_process.vert', 'assets/shaders/uber_post.frag')
+        # Load Shaders (the composite is picked per frame from Shader.permutation)
         self.shader_bloom_threshold = Shader('assets/shaders/post_process.vert', 'assets/shaders/bloom_threshold.frag')
         self.shader_bloom_blur = Shader('assets/shaders/post_process.vert', 'assets/shaders/bloom_blur.frag')
+        self.shader_bloom_down = Shader('assets/shaders/post_process.vert', 'assets/shaders/bloom_down.frag')
+        self.shader_bloom_up = Shader('assets/shaders/post_process.vert', 'assets/shaders/bloom_up.frag')
         
         # Initialize FBOs
-        self.init_framebuffers(width, height)
+        self.init_framebuffers(*self.scene_size_for(render_scale))
         
         # Quad VAO
         self.quad_vao = glGenVertexArrays(1)
@@ -48,7 +86,35 @@ class PostProcessor:
         glVertexAttribPointer(1, 2, GL_FLOAT, GL_FALSE, 4 * 4, ctypes.c_void_p(2 * 4))
         glBindVertexArray(0)
         
+    def scene_size_for(self, scale):
+        return max(1, round(self.virtual_width * scale)), max(1, round(self.virtual_height * scale))
+        
+    def letterbox(self):
+        # Window rect (x, y, w, h) the virtual screen is shown in, bottom-left origin
+        scale = min(self.width / self.virtual_width, self.height / self.virtual_height)
+        w = int(self.virtual_width * scale)
+        h = int(self.virtual_height * scale)
+        return (self.width - w) // 2, (self.height - h) // 2, w, h
+        
+    def create_color_target(self, width, height, internal_format=GL_RGB16F):
+        # Linear-filtered, edge-clamped texture attached to its own FBO (left bound)
+        fbo = glGenFramebuffers(1)
+        tex = glGenTextures(1)
+        glBindFramebuffer(GL_FRAMEBUFFER, fbo)
+        glBindTexture(GL_TEXTURE_2D, tex)
+        glTexImage2D(GL_TEXTURE_2D, 0, internal_format, width, height, 0, GL_RGB, GL_FLOAT, None)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, tex, 0)
+        return fbo, tex
+        
     def init_framebuffers(self, width, height):
+        # Scene target size; everything drawn between begin_capture and end_capture lands here
+        self.scene_width = width
+        self.scene_height = height
+        
         # Main FBO (Scene)
         self.msfbo = glGenFramebuffers(1)
         glBindFramebuffer(GL_FRAMEBUFFER, self.msfbo)
@@ -72,112 +138,264 @@ class PostProcessor:
             print("ERROR::FRAMEBUFFER:: Framebuffer is not complete!")
         glBindFramebuffer(GL_FRAMEBUFFER, 0)
         
+        # LDR composite target for FXAA; created on first use
+        self.ldr_target = None
+        
+        if self.bloom_mode == "dual":
+            self.init_bloom_chain(width, height)
+        else:
+            self.init_pingpong(width, height)
+            
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        
+    def init_bloom_chain(self, width, height):
+        # Each level is half the size of the previous one, stopping early once a level would
+        # drop below a few pixels. Bloom is low-frequency, so R11G11B10 is plenty and halves
+        # the bandwidth of every pass compared to RGB16F.
+        divisor, _ = BLOOM_QUALITY[self.bloom_quality]
+        self.bloom_chain = [] # (fbo, texture, width, height), largest first
+        w, h = width // divisor, height // divisor
+        while len(self.bloom_chain) < self.bloom_levels and min(w, h) >= 4:
+            fbo, tex = self.create_color_target(w, h, GL_R11F_G11F_B10F)
+            if glCheckFramebufferStatus(GL_FRAMEBUFFER) != GL_FRAMEBUFFER_COMPLETE:
+                print(f"ERROR::FRAMEBUFFER:: Bloom level {len(self.bloom_chain)} is not complete!")
+            self.bloom_chain.append((fbo, tex, w, h))
+            w, h = w // 2, h // 2
+            
+    def init_pingpong(self, width, height):
         # PingPong FBOs for Bloom (Downsampled to half resolution)
-        self.pingpong_fbo = glGenFramebuffers(2)
-        self.pingpong_colorbuffers = glGenTextures(2)
+        self.pingpong_fbo = []
+        self.pingpong_colorbuffers = []
         
         # Half resolution for bloom
         self.bloom_width = width // 2
         self.bloom_height = height // 2
         
         for i in range(2):
-            glBindFramebuffer(GL_FRAMEBUFFER, self.pingpong_fbo[i])
-            glBindTexture(GL_TEXTURE_2D, self.pingpong_colorbuffers[i])
-            glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB16F, self.bloom_width, self.bloom_height, 0, GL_RGB, GL_FLOAT, None)
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE) 
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
-            glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, self.pingpong_colorbuffers[i], 0)
+            fbo, tex = self.create_color_target(self.bloom_width, self.bloom_height)
+            self.pingpong_fbo.append(fbo)
+            self.pingpong_colorbuffers.append(tex)
             
             if glCheckFramebufferStatus(GL_FRAMEBUFFER) != GL_FRAMEBUFFER_COMPLETE:
                 print(f"ERROR::FRAMEBUFFER:: PingPong Framebuffer {i} is not complete!")
                 
-        glBindFramebuffer(GL_FRAMEBUFFER, 0)
-        
-    def resize(self, width, height):
-        self.width = width
-        self.height = height
-        # Delete old
+    def delete_framebuffers(self):
         glDeleteFramebuffers(1, [self.msfbo])
         glDeleteTextures(1, [self.tex_color])
         glDeleteRenderbuffers(1, [self.rbo])
-        glDeleteFramebuffers(2, self.pingpong_fbo)
-        glDeleteTextures(2, self.pingpong_colorbuffers)
+        if self.ldr_target:
+            glDeleteFramebuffers(1, [self.ldr_target[0]])
+            glDeleteTextures(1, [self.ldr_target[1]])
+        if self.bloom_mode == "dual":
+            glDeleteFramebuffers(len(self.bloom_chain), [level[0] for level in self.bloom_chain])
+            glDeleteTextures(len(self.bloom_chain), [level[1] for level in self.bloom_chain])
+        else:
+            glDeleteFramebuffers(2, self.pingpong_fbo)
+            glDeleteTextures(2, self.pingpong_colorbuffers)
+            
+    def resize(self, width, height):
+        # The scene target depends on the render scale only; the window just moves the letterbox
+        self.width = width
+        self.height = height
+        
+    def set_render_scale(self, scale):
+        self.render_scale = scale
+        size = self.scene_size_for(scale)
+        if size == (self.scene_width, self.scene_height): return
         
         # Re-init
-        self.init_framebuffers(width, height)
+        self.delete_framebuffers()
+        self.init_framebuffers(*size)
+        
+    def set_bloom(self, mode, levels, quality):
+        # Switching path or chain shape rebuilds the targets at the current scene size
+        self.delete_framebuffers()
+        self.bloom_mode = mode
+        self.bloom_levels = max(1, levels)
+        self.bloom_quality = quality if quality in BLOOM_QUALITY else "medium"
+        self.init_framebuffers(self.scene_width, self.scene_height)
         
     def begin_capture(self):
+        if self.dynamic:
+            self.dynamic.begin_frame()
         glBindFramebuffer(GL_FRAMEBUFFER, self.msfbo)
-        glViewport(0, 0, self.width, self.height) # Ensure full viewport
+        glViewport(0, 0, self.scene_width, self.scene_height)
         glClearColor(0.0, 0.0, 0.0, 1.0)
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
         
+        # Legacy projection in virtual coordinates (top-left origin), filling the target
+        glMatrixMode(GL_PROJECTION)
+        glLoadIdentity()
+        glOrtho(0, self.virtual_width, self.virtual_height, 0, -1, 1)
+        glMatrixMode(GL_MODELVIEW)
+        glLoadIdentity()
+        
     def end_capture(self):
         glBindFramebuffer(GL_FRAMEBUFFER, 0)
         
-    def render(self):
+    def render_bloom_chain(self):
+        """
+        Thresholds the scene into the first level, downsamples level by level, then walks
+        back up adding each upsampled level onto the next larger one. Returns the texture
+        holding the combined glow.
+        """
+        high_quality = BLOOM_QUALITY[self.bloom_quality][1]
+        chain = self.bloom_chain
+        
+        # 1. Bright pass straight into the first (already downsampled) level
+        fbo, tex, w, h = chain[0]
+        glBindFramebuffer(GL_FRAMEBUFFER, fbo)
+        glViewport(0, 0, w, h)
+        self.shader_bloom_threshold.use()
+        self.shader_bloom_threshold.set_uniforms({"sceneTexture": 0, "threshold": self.bloom_threshold})
+        glActiveTexture(GL_TEXTURE0)
+        glBindTexture(GL_TEXTURE_2D, self.tex_color)
+        self.render_quad()
+        
+        # 2. Downsample: each level reads the one above it
+        self.shader_bloom_down.use()
+        self.shader_bloom_down.set_uniforms({"image": 0, "highQuality": high_quality})
+        for i in range(1, len(chain)):
+            fbo, _, w, h = chain[i]
+            glBindFramebuffer(GL_FRAMEBUFFER, fbo)
+            glViewport(0, 0, w, h)
+            glBindTexture(GL_TEXTURE_2D, chain[i - 1][1])
+            self.render_quad()
+            
+        # 3. Upsample: add each level onto the next larger one
+        self.shader_bloom_up.use()
+        self.shader_bloom_up.set_uniforms({"image": 0, "highQuality": high_quality, "radius": self.bloom_radius})
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_ONE, GL_ONE)
+        for i in range(len(chain) - 1, 0, -1):
+            fbo, _, w, h = chain[i - 1]
+            glBindFramebuffer(GL_FRAMEBUFFER, fbo)
+            glViewport(0, 0, w, h)
+            glBindTexture(GL_TEXTURE_2D, chain[i][1])
+            self.render_quad()
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        
+        return chain[0][1]
+        
+    def render_bloom_gaussian(self):
         # 1. Bloom Threshold (Extract Brights) -> PingPong[0]
         
         horizontal = True
         first_iteration = True
         amount = 4 # Reduced iterations (was 10)
         
-        if self.use_bloom:
-            # Set viewport to half size for bloom
-            glViewport(0, 0, self.bloom_width, self.bloom_height)
+        # Set viewport to half size for bloom
+        glViewport(0, 0, self.bloom_width, self.bloom_height)
+        
+        glBindFramebuffer(GL_FRAMEBUFFER, self.pingpong_fbo[0])
+        glClear(GL_COLOR_BUFFER_BIT)
+        self.shader_bloom_threshold.use()
+        self.shader_bloom_threshold.set_uniforms({"sceneTexture": 0, "threshold": self.bloom_threshold})
+        glActiveTexture(GL_TEXTURE0)
+        glBindTexture(GL_TEXTURE_2D, self.tex_color)
+        self.render_quad()
+        
+        # 2. Blur PingPong[0] -> PingPong[1] -> PingPong[0]...
+        self.shader_bloom_blur.use()
+        self.shader_bloom_blur.set_uniform_1i("image", 0)
+        
+        for i in range(amount):
+            glBindFramebuffer(GL_FRAMEBUFFER, self.pingpong_fbo[int(horizontal)])
+            self.shader_bloom_blur.set_uniform_1i("horizontal", int(horizontal))
             
-            glBindFramebuffer(GL_FRAMEBUFFER, self.pingpong_fbo[0])
-            glClear(GL_COLOR_BUFFER_BIT)
-            self.shader_bloom_threshold.use()
-            self.shader_bloom_threshold.set_uniform_1i("sceneTexture", 0)
-            self.shader_bloom_threshold.set_uniform_1f("threshold", 0.6)
             glActiveTexture(GL_TEXTURE0)
-            glBindTexture(GL_TEXTURE_2D, self.tex_color)
-            self.render_quad()
             
-            # 2. Blur PingPong[0] -> PingPong[1] -> PingPong[0]...
-            self.shader_bloom_blur.use()
-            self.shader_bloom_blur.set_uniform_1i("image", 0)
-            
-            for i in range(amount):
-                glBindFramebuffer(GL_FRAMEBUFFER, self.pingpong_fbo[int(horizontal)])
-                self.shader_bloom_blur.set_uniform_1i("horizontal", int(horizontal))
-                
-                glActiveTexture(GL_TEXTURE0)
+            if first_iteration:
+                glBindTexture(GL_TEXTURE_2D, self.pingpong_colorbuffers[0]) # Read from extracted
+                first_iteration = False
+            else:
+                glBindTexture(GL_TEXTURE_2D, self.pingpong_colorbuffers[int(not horizontal)])
                 
-                if first_iteration:
-                    glBindTexture(GL_TEXTURE_2D, self.pingpong_colorbuffers[0]) # Read from extracted
-                    first_iteration = False
-                else:
-                    glBindTexture(GL_TEXTURE_2D, self.pingpong_colorbuffers[int(not horizontal)])
-                    
-                self.render_quad()
-                horizontal = not horizontal
+            self.render_quad()
+            horizontal = not horizontal
+            
+        # The last write was to the buffer we just unbound.
+        # If amount is even (4), last write was to 0.
+        return self.pingpong_colorbuffers[0]
+        
+    def post_features(self):
+        # #defines selecting the uber_post.frag permutation for the enabled effects
+        features = []
+        if self.use_bloom: features.append("USE_BLOOM")
+        if self.use_vignette: features.append("USE_VIGNETTE")
+        if self.use_chromatic: features.append("USE_CHROMATIC")
+        return tuple(features)
+        
+    def render(self):
+        bloom_texture = 0
+        bloom_intensity = 0.0
+        if self.use_bloom:
+            if self.bloom_mode == "dual":
+                bloom_texture = self.render_bloom_chain()
+                # Every level adds onto the first, so the sum is scaled back down
+                bloom_intensity = 1.5 / len(self.bloom_chain) ** 0.5
+            else:
+                bloom_texture = self.render_bloom_gaussian()
+                bloom_intensity = 1.5 # Boost bloom intensity
                 
-        # 3. Final Combine (Uber Shader)
+        features = self.post_features()
+        source = self.tex_color
+        if self.use_fxaa and features:
+            # FXAA wants the final colors: composite at scene resolution first
+            if self.ldr_target is None:
+                self.ldr_target = self.create_color_target(self.scene_width, self.scene_height, GL_RGBA8)
+            glBindFramebuffer(GL_FRAMEBUFFER, self.ldr_target[0])
+            glViewport(0, 0, self.scene_width, self.scene_height)
+            self.composite(features, bloom_texture, bloom_intensity)
+            source = self.ldr_target[1]
+            
+        # 3. Final pass, scaled into the letterbox rect
         glBindFramebuffer(GL_FRAMEBUFFER, 0) # Back to screen
-        # Restore full viewport
         glViewport(0, 0, self.width, self.height)
-        
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        x, y, w, h = self.letterbox()
+        
+        if self.use_fxaa:
+            glViewport(x, y, w, h)
+            shader = Shader.permutation('assets/shaders/post_process.vert', 'assets/shaders/fxaa.frag', (FXAA_PRESETS[self.fxaa_quality],))
+            shader.use()
+            shader.set_uniform_1i("image", 0)
+            glActiveTexture(GL_TEXTURE0)
+            glBindTexture(GL_TEXTURE_2D, source)
+            self.render_quad()
+        elif not features:
+            # Nothing to composite: a straight (filtered) blit of the scene
+            glBindFramebuffer(GL_READ_FRAMEBUFFER, self.msfbo)
+            glBlitFramebuffer(0, 0, self.scene_width, self.scene_height, x, y, x + w, y + h, GL_COLOR_BUFFER_BIT, GL_LINEAR)
+            glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        else:
+            glViewport(x, y, w, h)
+            self.composite(features, bloom_texture, bloom_intensity)
+            
+        # Restore full viewport for UI drawn on top
+        glViewport(0, 0, self.width, self.height)
         
-        self.shader_post.use()
-        self.shader_post.set_uniform_1i("sceneTexture", 0)
-        self.shader_post.set_uniform_1i("bloomTexture", 1)
-        self.shader_post.set_uniform_1i("useBloom", int(self.use_bloom))
-        self.shader_post.set_uniform_1i("useVignette", int(self.use_vignette))
-        self.shader_post.set_uniform_1i("useChromaticAberration", int(self.use_chromatic))
+        if self.dynamic:
+            self.dynamic.end_frame()
+            # No point rendering more pixels than the letterbox shows
+            native = self.letterbox()[2] / self.virtual_width
+            scale = self.dynamic.update(self.render_scale)
+            self.set_render_scale(max(self.dynamic.min_scale, min(scale, native)))
+            
+    def composite(self, features, bloom_texture, bloom_intensity):
+        # Uber shader permutation for the enabled effects, drawn over the current viewport
+        shader = Shader.permutation('assets/shaders/post_process.vert', 'assets/shaders/uber_post.frag', features)
+        shader.use()
+        shader.set_uniforms({"sceneTexture": 0, "bloomTexture": 1, "bloomIntensity": bloom_intensity})
         
         glActiveTexture(GL_TEXTURE0)
         glBindTexture(GL_TEXTURE_2D, self.tex_color)
         
-        glActiveTexture(GL_TEXTURE1)
-        # The last write was to the buffer we just unbound.
-        # If amount is even (4), last write was to 0.
-        glBindTexture(GL_TEXTURE_2D, self.pingpong_colorbuffers[0] if self.use_bloom else 0)
-        
+        if self.use_bloom:
+            glActiveTexture(GL_TEXTURE1)
+            glBindTexture(GL_TEXTURE_2D, bloom_texture)
+            glActiveTexture(GL_TEXTURE0)
+            
         self.render_quad()
         
     def render_quad(self):
@@ -1,40 +1,49 @@
 import pygame
 from OpenGL.GL import *
-from OpenGL.GL.shaders import compileProgram, compileShader
+from src.graphics.shader import Shader
 import numpy as np
 import ctypes
 
 class Renderer2D:
-    def __init__(self):
+    """
+    Batched 2D renderer for UI and text. Draw calls append vertices to a CPU-side
+    staging array; the batch is uploaded and drawn only when the texture or blend
+    state changes, when staging is full, or at end_frame.
+    """
+    def __init__(self, stream):
         self.shader = self._create_shader()
         self.vao = glGenVertexArrays(1)
-        self.vbo = glGenBuffers(1)
+        # Batches are written into the shared per-frame StreamBuffer
+        self.stream = stream
         
         # Vertex format: x, y, u, v, r, g, b, a (8 floats)
         self.vertex_size = 8 * 4 # 4 bytes per float
         
-        glBindVertexArray(self.vao)
-        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
-        
-        # Initial buffer size (can grow)
+        # Staging holds one batch; a fuller staging array is flushed early
         self.max_vertices = 10000
-        glBufferData(GL_ARRAY_BUFFER, self.max_vertices * self.vertex_size, None, GL_DYNAMIC_DRAW)
-        
-        # Position (0)
-        glEnableVertexAttribArray(0)
-        glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, self.vertex_size, ctypes.c_void_p(0))
         
-        # UV (1)
-        glEnableVertexAttribArray(1)
-        glVertexAttribPointer(1, 2, GL_FLOAT, GL_FALSE, self.vertex_size, ctypes.c_void_p(2 * 4))
+        # Attribute pointers are set per flush, at the batch's offset in the stream
+        glBindVertexArray(self.vao)
+        glEnableVertexAttribArray(0) # Position
+        glEnableVertexAttribArray(1) # UV
+        glEnableVertexAttribArray(2) # Color
+        glBindVertexArray(0)
         
-        # Color (2)
-        glEnableVertexAttribArray(2)
-        glVertexAttribPointer(2, 4, GL_FLOAT, GL_FALSE, self.vertex_size, ctypes.c_void_p(4 * 4))
+        self.shader.use()
+        self.shader.set_uniform_1i("textTexture", 0)
+        glUseProgram(0)
         
-        glBindVertexArray(0)
+        # CPU-side batch
+        self.staging = np.zeros((self.max_vertices, 8), dtype=np.float32)
+        self.vertex_count = 0
+        self.texture = None # Texture of the pending batch; None draws untextured
+        self.blend = (GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
         
-        self.projection_loc = glGetUniformLocation(self.shader, "projection")
+        # Per-frame counters; new_frame() moves them to last_*
+        self.draw_calls = 0
+        self.vertices_drawn = 0
+        self.last_draw_calls = 0
+        self.last_vertices_drawn = 0
         
     def _create_shader(self):
         vertex_src = """
@@ -75,13 +84,10 @@ class Renderer2D:
         }
         """
         
-        return compileProgram(
-            compileShader(vertex_src, GL_VERTEX_SHADER),
-            compileShader(fragment_src, GL_FRAGMENT_SHADER)
-        )
+        return Shader.from_source(vertex_src, fragment_src)
         
     def begin_frame(self, vw, vh, ww, wh):
-        glUseProgram(self.shader)
+        self.shader.use()
         
         # Calculate scale and offset for letterboxing
         scale = min(ww / vw, wh / vh)
@@ -166,17 +172,73 @@ class Renderer2D:
             [m30, m31, 0, 1]
         ], dtype=np.float32)
         
-        glUniformMatrix4fv(self.projection_loc, 1, GL_FALSE, mvp)
+        self.shader.set_uniform_matrix4("projection", mvp)
         
+        self.vertex_count = 0
+        self.texture = None
+        self.blend = (GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
         glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        glBlendFunc(*self.blend)
         
         glBindVertexArray(self.vao)
         
     def end_frame(self):
+        self.flush()
         glBindVertexArray(0)
         glUseProgram(0)
         
+    def new_frame(self):
+        # Called once per displayed frame, before any drawing
+        self.last_draw_calls = self.draw_calls
+        self.last_vertices_drawn = self.vertices_drawn
+        self.draw_calls = 0
+        self.vertices_drawn = 0
+        
+    def set_blend(self, src, dst):
+        if (src, dst) == self.blend: return
+        self.flush()
+        self.blend = (src, dst)
+        glBlendFunc(src, dst)
+        
+    def flush(self):
+        count = self.vertex_count
+        if count == 0: return
+        
+        offset = self.stream.write(self.staging[:count])
+        glBindBuffer(GL_ARRAY_BUFFER, self.stream.vbo)
+        glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, self.vertex_size, ctypes.c_void_p(offset))
+        glVertexAttribPointer(1, 2, GL_FLOAT, GL_FALSE, self.vertex_size, ctypes.c_void_p(offset + 2 * 4))
+        glVertexAttribPointer(2, 4, GL_FLOAT, GL_FALSE, self.vertex_size, ctypes.c_void_p(offset + 4 * 4))
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        
+        use_texture = self.texture is not None
+        self.shader.set_uniform_1i("useTexture", int(use_texture))
+        if use_texture:
+            glActiveTexture(GL_TEXTURE0)
+            glBindTexture(GL_TEXTURE_2D, self.texture)
+            
+        glDrawArrays(GL_TRIANGLES, 0, count)
+        self.draw_calls += 1
+        self.vertices_drawn += count
+        self.vertex_count = 0
+        
+    def _append(self, vertices, texture=None):
+        # vertices: (n, 8) rows; switching texture closes the current batch
+        if texture != self.texture:
+            self.flush()
+            self.texture = texture
+        n = len(vertices)
+        if self.vertex_count + n > self.max_vertices:
+            self.flush()
+        if n > self.max_vertices:
+            # Larger than staging: one batch per chunk of whole quads (6 vertices each)
+            chunk = self.max_vertices - self.max_vertices % 6
+            for start in range(0, n, chunk):
+                self._append(vertices[start:start + chunk], texture)
+            return
+        self.staging[self.vertex_count:self.vertex_count + n] = vertices
+        self.vertex_count += n
+        
     def draw_rect(self, x, y, w, h, color, gradient_bot=None):
         # 6 vertices for a quad (2 triangles)
         # x, y, u, v, r, g, b, a
@@ -188,102 +250,68 @@ class Renderer2D:
             r2, g2, b2, a2 = r, g, b, a
             
         # Top vertices use color, Bottom vertices use gradient_bot (or color)
-        vertices = np.array([
-            x, y, 0, 0, r, g, b, a,          # Top Left
-            x+w, y, 0, 0, r, g, b, a,        # Top Right
-            x+w, y+h, 0, 0, r2, g2, b2, a2,  # Bottom Right
+        self._append((
+            (x, y, 0, 0, r, g, b, a),          # Top Left
+            (x+w, y, 0, 0, r, g, b, a),        # Top Right
+            (x+w, y+h, 0, 0, r2, g2, b2, a2),  # Bottom Right
             
-            x, y, 0, 0, r, g, b, a,          # Top Left
-            x+w, y+h, 0, 0, r2, g2, b2, a2,  # Bottom Right
-            x, y+h, 0, 0, r2, g2, b2, a2     # Bottom Left
-        ], dtype=np.float32)
-        
-        self._upload_and_draw(vertices)
+            (x, y, 0, 0, r, g, b, a),          # Top Left
+            (x+w, y+h, 0, 0, r2, g2, b2, a2),  # Bottom Right
+            (x, y+h, 0, 0, r2, g2, b2, a2)     # Bottom Left
+        ))
 
     def draw_chamfered_rect(self, x, y, w, h, color, radius=10, gradient_bot=None):
-        # Approximate chamfered rect with a triangle fan or just multiple rects/triangles
-        
+        # Triangle fan around the center, emitted as a triangle list so it batches
         cut = min(radius, min(w, h) / 2)
-        r, g, b, a = color
-        
-        if gradient_bot:
-            r2, g2, b2, a2 = gradient_bot
-        else:
-            r2, g2, b2, a2 = r, g, b, a
-            
-        # Helper to interpolate color based on Y
-        def get_color(py):
-            # 0 at y, 1 at y+h
-            t = (py - y) / h
-            t = max(0, min(1, t))
-            return (
-                r * (1-t) + r2 * t,
-                g * (1-t) + g2 * t,
-                b * (1-t) + b2 * t,
-                a * (1-t) + a2 * t
-            )
-            
-        # Center
-        cx, cy = x + w/2, y + h/2
-        cr, cg, cb, ca = get_color(cy)
-        
-        # Vertices for the perimeter
-        perimeter = [
-            (x + cut, y), (x + w - cut, y), # Top
-            (x + w, y + cut), (x + w, y + h - cut), # Right
-            (x + w - cut, y + h), (x + cut, y + h), # Bottom
-            (x, y + h - cut), (x, y + cut) # Left
-        ]
-        
-        vertices = []
-        for i in range(len(perimeter)):
-            p1 = perimeter[i]
-            p2 = perimeter[(i + 1) % len(perimeter)]
-            
-            # Colors for p1, p2
-            c1 = get_color(p1[1])
-            c2 = get_color(p2[1])
-            
-            # Triangle: Center, P1, P2
-            vertices.extend([
-                cx, cy, 0, 0, cr, cg, cb, ca,
-                p1[0], p1[1], 0, 0, c1[0], c1[1], c1[2], c1[3],
-                p2[0], p2[1], 0, 0, c2[0], c2[1], c2[2], c2[3]
-            ])
-            
-        self._upload_and_draw(np.array(vertices, dtype=np.float32))
-
-    def _upload_and_draw(self, vertices):
-        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
-        # Orphan buffer or use subdata? For now, subdata is fine for immediate-like mode
-        # But actually, glBufferSubData is better if we are not replacing everything
-        # For this simple implementation, we'll just upload and draw immediately
-        # NOTE: This is not the most efficient batching, but it replaces glBegin/glEnd correctly
-        
-        glBufferSubData(GL_ARRAY_BUFFER, 0, vertices.nbytes, vertices)
-        
-        glUniform1i(glGetUniformLocation(self.shader, "useTexture"), False)
-        glDrawArrays(GL_TRIANGLES, 0, len(vertices) // 8)
+        c_top = np.asarray(color, dtype=np.float32)
+        c_bot = np.asarray(gradient_bot if gradient_bot else color, dtype=np.float32)
+        
+        # Perimeter in order, closed back to the first point
+        px = np.array([x + cut, x + w - cut, x + w, x + w, x + w - cut, x + cut, x, x, x + cut], dtype=np.float32)
+        py = np.array([y, y, y + cut, y + h - cut, y + h, y + h, y + h - cut, y + cut, y], dtype=np.float32)
+        
+        vertices = np.zeros((8, 3, 8), dtype=np.float32)
+        vertices[:, 0, 0] = x + w / 2
+        vertices[:, 0, 1] = y + h / 2
+        vertices[:, 1, 0] = px[:-1]
+        vertices[:, 1, 1] = py[:-1]
+        vertices[:, 2, 0] = px[1:]
+        vertices[:, 2, 1] = py[1:]
+        
+        # Vertical gradient: interpolate color by each vertex's height in the rect
+        t = np.clip((vertices[:, :, 1] - y) / h, 0, 1)[..., None] if h else np.zeros((8, 3, 1), dtype=np.float32)
+        vertices[:, :, 4:8] = c_top * (1 - t) + c_bot * t
+        
+        self._append(vertices.reshape(24, 8))
 
     def draw_texture(self, texture_id, x, y, w, h, color=(1,1,1,1)):
         r, g, b, a = color
         
-        vertices = np.array([
-            x, y, 0, 1, r, g, b, a,
-            x+w, y, 1, 1, r, g, b, a,
-            x+w, y+h, 1, 0, r, g, b, a,
+        self._append((
+            (x, y, 0, 1, r, g, b, a),
+            (x+w, y, 1, 1, r, g, b, a),
+            (x+w, y+h, 1, 0, r, g, b, a),
             
-            x, y, 0, 1, r, g, b, a,
-            x+w, y+h, 1, 0, r, g, b, a,
-            x, y+h, 0, 0, r, g, b, a
-        ], dtype=np.float32)
-        
-        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
-        glBufferSubData(GL_ARRAY_BUFFER, 0, vertices.nbytes, vertices)
-        
-        glActiveTexture(GL_TEXTURE0)
-        glBindTexture(GL_TEXTURE_2D, texture_id)
-        glUniform1i(glGetUniformLocation(self.shader, "useTexture"), True)
-        glUniform1i(glGetUniformLocation(self.shader, "textTexture"), 0)
-        
-        glDrawArrays(GL_TRIANGLES, 0, 6)
+            (x, y, 0, 1, r, g, b, a),
+            (x+w, y+h, 1, 0, r, g, b, a),
+            (x, y+h, 0, 0, r, g, b, a)
+        ), texture_id)
+
+    def draw_texture_quads(self, texture_id, x0, y0, x1, y1, u0, v0, u1, v1, color=(1,1,1,1)):
+        """
+        Many textured quads from one texture in a single append, e.g. glyphs from an atlas.
+        Corner and UV arguments are arrays (or scalars) that broadcast together; v0 is the top edge.
+        """
+        x0, y0, x1, y1, u0, v0, u1, v1 = np.broadcast_arrays(x0, y0, x1, y1, u0, v0, u1, v1)
+        n = len(x0)
+        if n == 0: return
+        
+        vertices = np.empty((n, 6, 8), dtype=np.float32)
+        # Two triangles per quad: TL, TR, BR, TL, BR, BL
+        vertices[:, :, 0] = np.stack((x0, x1, x1, x0, x1, x0), axis=1)
+        vertices[:, :, 1] = np.stack((y0, y0, y1, y0, y1, y1), axis=1)
+        vertices[:, :, 2] = np.stack((u0, u1, u1, u0, u1, u0), axis=1)
+        vertices[:, :, 3] = np.stack((v0, v0, v1, v0, v1, v1), axis=1)
+        vertices[:, :, 4:8] = color
+        
+        self._append(vertices.reshape(n * 6, 8), texture_id)
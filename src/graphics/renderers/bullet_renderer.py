@@ -1,47 +1,104 @@
 from OpenGL.GL import *
+import numpy as np
 import ctypes
+from src.graphics.shader import Shader
+from src.graphics.vertex_formats import POSITION_SCALE, grow_staging, pack_positions
+from src.entities.bullet_manager import STYLE_PLAYER, STYLE_ENEMY, STYLE_BOSS
+
+MAX_STYLES = 8 # Matches the uniform arrays in bullet.vert
+
+# style -> (glow rgba, core rgba, sprite size in pixels, core radius as a fraction of the sprite)
+STYLES = {
+    STYLE_PLAYER: ((0.0, 1.0, 1.0, 0.8), (1.0, 1.0, 1.0, 0.9), 12.0, 1.0 / 3.0), # Cyan
+    STYLE_ENEMY: ((1.0, 0.2, 0.0, 0.8), (1.0, 1.0, 1.0, 0.9), 12.0, 1.0 / 3.0), # Orange/Red
+    STYLE_BOSS: ((1.0, 0.0, 1.0, 0.8), (1.0, 1.0, 1.0, 0.9), 16.0, 0.3), # Magenta
+}
 
 class BulletRenderer:
-    def __init__(self):
-        pass
+    """
+    Draws bullets as shader point sprites: glow and core come from one radial falloff
+    in a single pass, with color and size looked up from each bullet's style.
+    """
+    def __init__(self, stream):
+        # GPU resources are created on first render so BulletManager stays GL-free
+        self.shader = None
+        # Fixed-point positions and styles are written into the shared per-frame StreamBuffer
+        self.stream = stream
+        self.staging = None
+
+    def init_gl(self):
+        self.shader = Shader('assets/shaders/bullet.vert', 'assets/shaders/bullet.frag')
+
+        # Attribute pointers are set per draw, at the data's offsets in the stream
+        self.vao = glGenVertexArrays(1)
+        glBindVertexArray(self.vao)
+        glEnableVertexAttribArray(0) # x, y
+        glEnableVertexAttribArray(1) # style
+        glBindVertexArray(0)
+
+        # Style table goes into the program once
+        glow = np.zeros((MAX_STYLES, 4), dtype=np.float32)
+        core = np.zeros((MAX_STYLES, 4), dtype=np.float32)
+        size = np.zeros(MAX_STYLES, dtype=np.float32)
+        radius = np.zeros(MAX_STYLES, dtype=np.float32)
+        for style, (g, c, s, r) in STYLES.items():
+            glow[style], core[style], size[style], radius[style] = g, c, s, r
+
+        self.shader.use()
+        self.shader.set_uniform_4fv("glowColor", glow)
+        self.shader.set_uniform_4fv("coreColor", core)
+        self.shader.set_uniform_1fv("pointSize", size)
+        self.shader.set_uniform_1fv("coreRadius", radius)
+        glUseProgram(0)
+
+    def interpolated_positions(self, data, count, lag):
+        # Step each bullet back along its velocity to the interpolated render time,
+        # packed as int16 fixed point (4 bytes per bullet)
+        slice_ = data[:count]
+        self.staging = grow_staging(self.staging, count, np.int16, (2,))
+        positions = self.staging[:count]
+        pack_positions(slice_[:, 0:2] - slice_[:, 2:4] * lag, positions)
+        return positions
+
+    def render(self, bullet_manager, lag=0.0, scale=1.0):
+        # lag: seconds between the interpolated render state and the latest simulation step
+        # scale: target pixels per virtual pixel (sprite sizes are in virtual pixels)
+        if bullet_manager.p_count == 0 and bullet_manager.e_count == 0: return
+        if self.shader is None:
+            self.init_gl()
+
+        # The world is still placed with the fixed-function matrix stack (projection, shake)
+        projection = glGetFloatv(GL_PROJECTION_MATRIX)
+        modelview = glGetFloatv(GL_MODELVIEW_MATRIX)
+        mvp = np.ascontiguousarray(np.dot(modelview, projection), dtype=np.float32)
+
+        self.shader.use()
+        self.shader.set_uniform_matrix4("mvp", mvp)
+        self.shader.set_uniform_1f("positionScale", 1.0 / POSITION_SCALE)
+        self.shader.set_uniform_1f("pointScale", scale)
 
-    def render(self, bullet_manager):
         glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE)
-        glDisable(GL_TEXTURE_2D)
-        glEnableClientState(GL_VERTEX_ARRAY)
-        
-        # Render Player Bullets (Cyan)
-        if bullet_manager.p_count > 0:
-            glBindBuffer(GL_ARRAY_BUFFER, bullet_manager.p_vbo)
-            glBufferData(GL_ARRAY_BUFFER, bullet_manager.p_count * 4 * 4, bullet_manager.p_data[:bullet_manager.p_count], GL_DYNAMIC_DRAW)
-            glVertexPointer(2, GL_FLOAT, 16, ctypes.c_void_p(0)) # stride 16 (4 floats)
-            
-            # Glow
-            glPointSize(12) # Revert to original size
-            glColor4f(0.0, 1.0, 1.0, 0.8) # Higher alpha for intensity
-            glDrawArrays(GL_POINTS, 0, bullet_manager.p_count)
-            
-            # Core
-            glPointSize(4)
-            glColor4f(1.0, 1.0, 1.0, 0.9)
-            glDrawArrays(GL_POINTS, 0, bullet_manager.p_count)
-            
-        # Render Enemy Bullets (Orange/Red)
-        if bullet_manager.e_count > 0:
-            glBindBuffer(GL_ARRAY_BUFFER, bullet_manager.e_vbo)
-            glBufferData(GL_ARRAY_BUFFER, bullet_manager.e_count * 4 * 4, bullet_manager.e_data[:bullet_manager.e_count], GL_DYNAMIC_DRAW)
-            glVertexPointer(2, GL_FLOAT, 16, ctypes.c_void_p(0))
-            
-            # Glow
-            glPointSize(12) # Revert to original size
-            glColor4f(1.0, 0.2, 0.0, 0.8) # Higher alpha for intensity
-            glDrawArrays(GL_POINTS, 0, bullet_manager.e_count)
-            
-            # Core
-            glPointSize(4)
-            glColor4f(1.0, 1.0, 1.0, 0.9)
-            glDrawArrays(GL_POINTS, 0, bullet_manager.e_count)
+        glBlendFunc(GL_ONE, GL_ONE)
+        glEnable(GL_PROGRAM_POINT_SIZE)
+        glEnable(GL_POINT_SPRITE) # gl_PointCoord in the compatibility profile
+
+        glBindVertexArray(self.vao)
+        for data, styles, count in (
+            (bullet_manager.p_data, bullet_manager.p_style, bullet_manager.p_count),
+            (bullet_manager.e_data, bullet_manager.e_style, bullet_manager.e_count),
+        ):
+            if count == 0: continue
+            positions = self.interpolated_positions(data, count, lag)
+            pos_offset, style_offset = self.stream.write(positions, styles[:count])
             
-        glDisableClientState(GL_VERTEX_ARRAY)
+            glBindBuffer(GL_ARRAY_BUFFER, self.stream.vbo)
+            glVertexAttribPointer(0, 2, GL_SHORT, GL_FALSE, 4, ctypes.c_void_p(pos_offset))
+            glVertexAttribIPointer(1, 1, GL_UNSIGNED_BYTE, 1, ctypes.c_void_p(style_offset))
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+            glDrawArrays(GL_POINTS, 0, count)
+        glBindVertexArray(0)
+
+        glDisable(GL_POINT_SPRITE)
+        glDisable(GL_PROGRAM_POINT_SIZE)
         glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        glUseProgram(0)
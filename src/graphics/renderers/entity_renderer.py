@@ -0,0 +1,158 @@
+from OpenGL.GL import *
+import numpy as np
+import math
+import ctypes
+import pygame
+from src.graphics.shader import Shader
+
+# Mesh vertex: x, y, r, g, b, a, tint, additive, flicker
+VERTEX_FLOATS = 9
+# Instance: x, y, angle, r, g, b, a
+INSTANCE_FLOATS = 7
+
+def triangles(points, color, tint=0.0, additive=0.0, flicker=None):
+    rows = []
+    for i, (x, y) in enumerate(points):
+        rows.append((x, y) + tuple(color) + (tint, additive, 1.0 if flicker == i else 0.0))
+    return rows
+
+def fan(radius, color, additive=1.0, segments=8):
+    # Triangle fan around the origin as a triangle list
+    ring = [(math.cos(i * math.pi * 2 / segments) * radius, math.sin(i * math.pi * 2 / segments) * radius)
+            for i in range(segments + 1)]
+    rows = []
+    for i in range(segments):
+        rows += triangles([(0, 0), ring[i], ring[i + 1]], color, additive=additive)
+    return rows
+
+# Enemy dart: additive glow (1.3x, half alpha), core in the type color, white inner detail
+ENEMY_MESH = (
+    triangles([(0, 26), (-19.5, -19.5), (19.5, -19.5)], (1, 1, 1, 0.5), tint=1.0, additive=1.0)
+    + triangles([(0, 20), (-15, -15), (15, -15)], (1, 1, 1, 1), tint=1.0)
+    + triangles([(0, 10), (-5, -5), (5, -5)], (1, 1, 1, 1))
+)
+
+# Player ship, engine flame (tip flickers), additive hitbox glow and core
+PLAYER_MESH = (
+    triangles([(0, -20), (-15, 20), (15, 20)], (0.0, 1.0, 1.0, 1.0))
+    + triangles([(-5, 20), (5, 20), (0, 30)], (1.0, 0.5, 0.0, 1.0), flicker=2)
+    + fan(8, (0.0, 1.0, 1.0, 0.5))
+    + fan(4, (1.0, 1.0, 1.0, 1.0))
+)
+
+BOSS_MESH = (
+    triangles([(-50, -50), (50, -50), (50, 50)], (1, 1, 1, 1), tint=1.0)
+    + triangles([(-50, -50), (50, 50), (-50, 50)], (1, 1, 1, 1), tint=1.0)
+)
+
+# Neon palette per enemy type
+ENEMY_COLORS = np.array([
+    (1.0, 0.2, 0.0, 1.0), # Neon Red/Orange
+    (0.2, 1.0, 0.2, 1.0), # Neon Green
+    (0.0, 0.8, 1.0, 1.0), # Cyan
+    (1.0, 0.9, 0.0, 1.0), # Gold
+    (1.0, 0.0, 1.0, 1.0), # Magenta
+], dtype=np.float32)
+
+class EntityRenderer:
+    """
+    Draws enemies, the boss and the player as instanced meshes: one instance array
+    upload and one glDrawArraysInstanced per mesh, with glow and core in the shader.
+    """
+    def __init__(self, stream):
+        # GPU resources are created on first render so the simulation can run without a GL context
+        self.shader = None
+        # Instance arrays are written into the shared per-frame StreamBuffer
+        self.stream = stream
+
+    def init_gl(self):
+        self.shader = Shader('assets/shaders/entity.vert', 'assets/shaders/entity.frag')
+
+        # All meshes share one static vertex buffer; (first, count) per mesh
+        self.meshes = {}
+        rows = []
+        for name, mesh in (("enemy", ENEMY_MESH), ("player", PLAYER_MESH), ("boss", BOSS_MESH)):
+            self.meshes[name] = (len(rows), len(mesh))
+            rows += mesh
+        vertices = np.array(rows, dtype=np.float32)
+
+        self.vao = glGenVertexArrays(1)
+        self.mesh_vbo = glGenBuffers(1)
+
+        glBindVertexArray(self.vao)
+        glBindBuffer(GL_ARRAY_BUFFER, self.mesh_vbo)
+        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+        stride = VERTEX_FLOATS * 4
+        glEnableVertexAttribArray(0)
+        glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(0))
+        glEnableVertexAttribArray(1)
+        glVertexAttribPointer(1, 4, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(2 * 4))
+        glEnableVertexAttribArray(2)
+        glVertexAttribPointer(2, 3, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(6 * 4))
+
+        # Instance attributes point into the stream, set per draw
+        glEnableVertexAttribArray(3)
+        glVertexAttribDivisor(3, 1)
+        glEnableVertexAttribArray(4)
+        glVertexAttribDivisor(4, 1)
+
+        glBindVertexArray(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def draw(self, mesh, instances, flicker=0.0):
+        n = len(instances)
+        if n == 0: return
+        if self.shader is None:
+            self.init_gl()
+
+        # The world is still placed with the fixed-function matrix stack (projection, shake)
+        projection = glGetFloatv(GL_PROJECTION_MATRIX)
+        modelview = glGetFloatv(GL_MODELVIEW_MATRIX)
+        mvp = np.ascontiguousarray(np.dot(modelview, projection), dtype=np.float32)
+
+        self.shader.use()
+        self.shader.set_uniform_matrix4("mvp", mvp)
+        self.shader.set_uniform_1f("flicker", flicker)
+
+        offset = self.stream.write(instances)
+
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_ONE, GL_ONE_MINUS_SRC_ALPHA)
+
+        first, count = self.meshes[mesh]
+        glBindVertexArray(self.vao)
+        glBindBuffer(GL_ARRAY_BUFFER, self.stream.vbo)
+        stride = INSTANCE_FLOATS * 4
+        glVertexAttribPointer(3, 3, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(offset))
+        glVertexAttribPointer(4, 4, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(offset + 3 * 4))
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glDrawArraysInstanced(GL_TRIANGLES, first, count, n)
+        glBindVertexArray(0)
+
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA) # Restore blending
+        glUseProgram(0)
+
+    def render_enemies(self, enemies, alpha=1.0):
+        # enemies is the EnemyBank; rows killed this tick are skipped
+        n = enemies.count
+        if n == 0: return
+        xs, ys, angles = enemies.lerp_state(alpha)
+        live = enemies.active[:n]
+
+        instances = np.empty((int(np.count_nonzero(live)), INSTANCE_FLOATS), dtype=np.float32)
+        instances[:, 0] = xs[live]
+        instances[:, 1] = ys[live]
+        instances[:, 2] = angles[live]
+        instances[:, 3:7] = ENEMY_COLORS[enemies.type[:n][live]]
+        self.draw("enemy", instances)
+
+    def render_boss(self, boss, alpha=1.0):
+        if not boss:
+            return
+        x, y, _ = boss.lerp_state(alpha)
+        self.draw("boss", np.array([(x, y, 0.0, 1.0, 0.0, 1.0, 1.0)], dtype=np.float32)) # Magenta
+
+    def render_player(self, player, alpha=1.0):
+        x, y, angle = player.lerp_state(alpha)
+        flicker = (pygame.time.get_ticks() % 100) / 10.0
+        self.draw("player", np.array([(x, y, angle, 1.0, 1.0, 1.0, 1.0)], dtype=np.float32), flicker)
@@ -0,0 +1,70 @@
+from OpenGL.GL import *
+import numpy as np
+import ctypes
+from src.graphics.shader import Shader
+from src.graphics.vertex_formats import PARTICLE_VERTEX, POSITION_SCALE, PARTICLE_MAX_SIZE, grow_staging, pack_particles
+
+STRIDE = PARTICLE_VERTEX.itemsize
+
+class ParticleRenderer:
+    """
+    Draws particles as soft round point sprites sized per particle. Live rows are packed
+    into 12-byte PARTICLE_VERTEX records (fixed-point position, RGBA8 with life as alpha,
+    8-bit size) before streaming.
+    """
+    def __init__(self, stream):
+        # GPU resources are created on first render so the simulation can run without a GL context
+        self.shader = None
+        # Live particles are packed into staging, then written into the shared per-frame StreamBuffer
+        self.stream = stream
+        self.staging = None
+
+    def init_gl(self):
+        self.shader = Shader('assets/shaders/particle.vert', 'assets/shaders/particle.frag')
+
+        # Attribute pointers are set per draw, at the rows' offset in the stream
+        self.vao = glGenVertexArrays(1)
+        glBindVertexArray(self.vao)
+        glEnableVertexAttribArray(0) # x, y
+        glEnableVertexAttribArray(1) # r, g, b, life
+        glEnableVertexAttribArray(2) # size
+        glBindVertexArray(0)
+
+    def render(self, particle_system, scale=1.0):
+        count = particle_system.count
+        if count == 0: return
+        if self.shader is None:
+            self.init_gl()
+
+        # The world is still placed with the fixed-function matrix stack (projection, shake)
+        projection = glGetFloatv(GL_PROJECTION_MATRIX)
+        modelview = glGetFloatv(GL_MODELVIEW_MATRIX)
+        mvp = np.ascontiguousarray(np.dot(modelview, projection), dtype=np.float32)
+
+        self.shader.use()
+        self.shader.set_uniform_matrix4("mvp", mvp)
+        self.shader.set_uniform_1f("pointScale", scale)
+        self.shader.set_uniform_1f("positionScale", 1.0 / POSITION_SCALE)
+        self.shader.set_uniform_1f("maxSize", PARTICLE_MAX_SIZE)
+
+        self.staging = grow_staging(self.staging, count, PARTICLE_VERTEX)
+        offset = self.stream.write(pack_particles(particle_system.data[:count], self.staging))
+
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE)
+        glEnable(GL_PROGRAM_POINT_SIZE)
+        glEnable(GL_POINT_SPRITE) # gl_PointCoord in the compatibility profile
+
+        glBindVertexArray(self.vao)
+        glBindBuffer(GL_ARRAY_BUFFER, self.stream.vbo)
+        glVertexAttribPointer(0, 2, GL_SHORT, GL_FALSE, STRIDE, ctypes.c_void_p(offset + PARTICLE_VERTEX.fields['pos'][1]))
+        glVertexAttribPointer(1, 4, GL_UNSIGNED_BYTE, GL_TRUE, STRIDE, ctypes.c_void_p(offset + PARTICLE_VERTEX.fields['color'][1]))
+        glVertexAttribPointer(2, 1, GL_UNSIGNED_BYTE, GL_TRUE, STRIDE, ctypes.c_void_p(offset + PARTICLE_VERTEX.fields['size'][1]))
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glDrawArrays(GL_POINTS, 0, count)
+        glBindVertexArray(0)
+
+        glDisable(GL_POINT_SPRITE)
+        glDisable(GL_PROGRAM_POINT_SIZE)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        glUseProgram(0)
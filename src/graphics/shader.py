@@ -4,9 +4,52 @@ from OpenGL.GL.shaders import compileProgram, compileShader
 import sys
 import os
 
+# glUniform setters for each active uniform type; samplers and bools are set as ints
+UNIFORM_SETTERS = {
+    GL_FLOAT: glUniform1f,
+    GL_FLOAT_VEC2: glUniform2f,
+    GL_FLOAT_VEC3: glUniform3f,
+    GL_FLOAT_VEC4: glUniform4f,
+    GL_INT: glUniform1i,
+    GL_BOOL: glUniform1i,
+    GL_SAMPLER_2D: glUniform1i,
+    GL_SAMPLER_3D: glUniform1i,
+}
+
 class Shader:
-    def __init__(self, vertex_path, fragment_path):
-        self.program = self.load_shaders(vertex_path, fragment_path)
+    # Compiled permutations, keyed by (vertex path, fragment path, define set)
+    _permutations = {}
+
+    def __init__(self, vertex_path, fragment_path, defines=()):
+        self.program = self.load_shaders(vertex_path, fragment_path, defines)
+        self.introspect()
+
+    @classmethod
+    def permutation(cls, vertex_path, fragment_path, defines=()):
+        """
+        Returns the program compiled with the given #define names, compiling it on first
+        use. Each feature set is compiled once and shared by every caller.
+        """
+        key = (vertex_path, fragment_path, frozenset(defines))
+        shader = cls._permutations.get(key)
+        if shader is None:
+            shader = cls._permutations[key] = cls(vertex_path, fragment_path, sorted(key[2]))
+        return shader
+
+    @staticmethod
+    def with_defines(source, defines):
+        # #define lines go right after #version; #line keeps compiler messages on file lines
+        if not defines: return source
+        version, _, body = source.partition('\n')
+        lines = [f"#define {name} 1" for name in defines]
+        return '\n'.join([version] + lines + ['#line 2', body])
+
+    @classmethod
+    def from_source(cls, vertex_src, fragment_src):
+        shader = cls.__new__(cls)
+        shader.program = shader.compile(vertex_src, fragment_src)
+        shader.introspect()
+        return shader
 
     def resolve_path(self, path):
         if getattr(sys, 'frozen', False):
@@ -15,37 +58,112 @@ class Shader:
             return os.path.join(base_path, path)
         return path
 
-    def load_shaders(self, vertex_path, fragment_path):
+    def load_shaders(self, vertex_path, fragment_path, defines=()):
         vertex_path = self.resolve_path(vertex_path)
         fragment_path = self.resolve_path(fragment_path)
-        
+
         with open(vertex_path, 'r') as f:
             vertex_src = f.read()
-        
+
         with open(fragment_path, 'r') as f:
             fragment_src = f.read()
-            
-        shader = compileProgram(
+
+        return self.compile(self.with_defines(vertex_src, defines), self.with_defines(fragment_src, defines))
+
+    def compile(self, vertex_src, fragment_src):
+        # No validation against the current GL state: sampler units are only assigned after
+        # linking, and programs mixing sampler types would fail while they all default to 0
+        return compileProgram(
             compileShader(vertex_src, GL_VERTEX_SHADER),
-            compileShader(fragment_src, GL_FRAGMENT_SHADER)
+            compileShader(fragment_src, GL_FRAGMENT_SHADER),
+            validate=False
         )
-        return shader
+
+    def introspect(self):
+        """
+        Caches every active uniform's location and type, and every active attribute's
+        location, once after linking so per-frame sets never query the driver.
+        """
+        self.locations = {}
+        self.types = {}
+        self.values = {} # Last value set per uniform; equal sets are skipped
+
+        for i in range(glGetProgramiv(self.program, GL_ACTIVE_UNIFORMS)):
+            name, size, type_ = glGetActiveUniform(self.program, i)
+            name = name.decode() if isinstance(name, bytes) else name
+            loc = glGetUniformLocation(self.program, name)
+            # Arrays are reported as "name[0]"; also register the bare name
+            for key in {name, name.split('[')[0]}:
+                self.locations[key] = loc
+                self.types[key] = type_
+
+        self.attributes = {}
+        for i in range(glGetProgramiv(self.program, GL_ACTIVE_ATTRIBUTES)):
+            name, size, type_ = glGetActiveAttrib(self.program, i)
+            name = name.decode() if isinstance(name, bytes) else name
+            self.attributes[name] = glGetAttribLocation(self.program, name)
+
+    def uniform(self, name):
+        # Uniforms the compiler optimised out are -1, which GL ignores on set
+        return self.locations.get(name, -1)
+
+    def attribute(self, name):
+        return self.attributes.get(name, -1)
 
     def use(self):
         glUseProgram(self.program)
-        
+
+    def _set(self, setter, name, *value):
+        # The program must be in use, as with plain glUniform* calls
+        if self.values.get(name) == value: return
+        loc = self.locations.get(name, -1)
+        if loc == -1: return
+        setter(loc, *value)
+        self.values[name] = value
+
     def set_uniform_1f(self, name, value):
-        loc = glGetUniformLocation(self.program, name)
-        glUniform1f(loc, value)
-        
+        self._set(glUniform1f, name, value)
+
     def set_uniform_2f(self, name, x, y):
-        loc = glGetUniformLocation(self.program, name)
-        glUniform2f(loc, x, y)
+        self._set(glUniform2f, name, x, y)
 
     def set_uniform_1i(self, name, value):
-        loc = glGetUniformLocation(self.program, name)
-        glUniform1i(loc, value)
-        
+        self._set(glUniform1i, name, value)
+
     def set_uniform_3f(self, name, x, y, z):
-        loc = glGetUniformLocation(self.program, name)
-        glUniform3f(loc, x, y, z)
+        self._set(glUniform3f, name, x, y, z)
+
+    def set_uniform_4f(self, name, x, y, z, w):
+        self._set(glUniform4f, name, x, y, z, w)
+
+    def set_uniform_matrix4(self, name, matrix):
+        # Matrices are not value-cached; compare cost would match the upload
+        loc = self.locations.get(name, -1)
+        if loc != -1:
+            glUniformMatrix4fv(loc, 1, GL_FALSE, matrix)
+
+    def set_uniform_1fv(self, name, values):
+        # Uniform arrays are not value-cached; set them once when the table changes
+        loc = self.locations.get(name, -1)
+        if loc != -1:
+            glUniform1fv(loc, len(values), values)
+
+    def set_uniform_4fv(self, name, values):
+        loc = self.locations.get(name, -1)
+        if loc != -1:
+            glUniform4fv(loc, len(values), values)
+
+    def set_uniforms(self, values):
+        """
+        Sets a block of uniforms from a {name: value} dict, picking the glUniform call from
+        each uniform's introspected type. Vector values are tuples; bools are sent as ints.
+        Inactive names are ignored.
+        """
+        for name, value in values.items():
+            type_ = self.types.get(name)
+            if type_ is None: continue
+            if isinstance(value, (tuple, list)):
+                self._set(UNIFORM_SETTERS[type_], name, *value)
+            else:
+                if type_ != GL_FLOAT: value = int(value)
+                self._set(UNIFORM_SETTERS[type_], name, value)
@@ -4,10 +4,28 @@ from src.graphics.shader import Shader
 import os
 import sys
 
+# Lattice cells per repeat of the baked noise texture
+NOISE_PERIOD = 32
+
+def bake_value_noise(period=NOISE_PERIOD, seed=0x5EED):
+    # Random lattice values in [0, 1); the texture wraps, so the noise tiles every period cells
+    rng = np.random.default_rng(seed)
+    return rng.random((period, period, period), dtype=np.float32)
+
 class Starfield:
-    def __init__(self, width, height):
+    """
+    Background nebula and stars (modern_space.frag). The shader's noise comes from a tiling
+    3D texture baked once at startup instead of per-pixel sin hashes.
+
+    With nebula_refresh > 0 the slowly-changing nebula layer is rendered into its own
+    texture at nebula_scale of the target resolution only every nebula_refresh frames;
+    the frames in between just sample it.
+    """
+    def __init__(self, width, height, nebula_refresh=0, nebula_scale=0.5):
         self.width = width
         self.height = height
+        self.nebula_refresh = nebula_refresh
+        self.nebula_scale = nebula_scale
         
         # Load shader
         if getattr(sys, 'frozen', False):
@@ -18,6 +36,25 @@ class Starfield:
         v_path = os.path.join(base_path, 'assets', 'shaders', 'starfield.vert')
         f_path = os.path.join(base_path, 'assets', 'shaders', 'modern_space.frag')
         self.shader = Shader(v_path, f_path)
+        if nebula_refresh > 0:
+            self.shader_nebula = Shader.permutation(v_path, f_path, ("NEBULA_ONLY",))
+            self.shader_cached = Shader.permutation(v_path, f_path, ("NEBULA_CACHED",))
+            
+        # Noise lattice: linear filtering plus wrapping makes it smooth, tiling value noise
+        self.noise_texture = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_3D, self.noise_texture)
+        glTexImage3D(GL_TEXTURE_3D, 0, GL_R16F, NOISE_PERIOD, NOISE_PERIOD, NOISE_PERIOD, 0, GL_RED, GL_FLOAT, bake_value_noise())
+        glTexParameteri(GL_TEXTURE_3D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_3D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        for wrap in (GL_TEXTURE_WRAP_S, GL_TEXTURE_WRAP_T, GL_TEXTURE_WRAP_R):
+            glTexParameteri(GL_TEXTURE_3D, wrap, GL_REPEAT)
+        glBindTexture(GL_TEXTURE_3D, 0)
+        
+        # Nebula cache target; allocated on first render at the target's size
+        self.nebula_fbo = None
+        self.nebula_texture = None
+        self.nebula_size = None
+        self.frames_since_nebula = 0
         
         # Fullscreen quad
         self.vertices = np.array([
@@ -30,17 +67,86 @@ class Starfield:
         self.vbo = glGenBuffers(1)
         glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
         glBufferData(GL_ARRAY_BUFFER, self.vertices.nbytes, self.vertices, GL_STATIC_DRAW)
-
-    def render(self, time, player_pos):
-        self.shader.use()
+        
+    def render(self, time, player_pos, resolution=None):
+        # resolution: pixel size of the target being drawn into (defaults to the virtual size)
+        resolution = resolution or (self.width, self.height)
+        uniforms = {
+            "time": time,
+            "resolution": resolution,
+            "player_pos": (player_pos[0], player_pos[1]),
+            "noiseTexture": 0,
+            "noisePeriod": float(NOISE_PERIOD),
+            "nebulaTexture": 1,
+        }
+        
+        glActiveTexture(GL_TEXTURE0)
+        glBindTexture(GL_TEXTURE_3D, self.noise_texture)
+        
+        if self.nebula_refresh > 0:
+            self.update_nebula_cache(uniforms, resolution)
+            glActiveTexture(GL_TEXTURE1)
+            glBindTexture(GL_TEXTURE_2D, self.nebula_texture)
+            glActiveTexture(GL_TEXTURE0)
+            self.draw(self.shader_cached, uniforms)
+            glActiveTexture(GL_TEXTURE1)
+            glBindTexture(GL_TEXTURE_2D, 0)
+            glActiveTexture(GL_TEXTURE0)
+        else:
+            self.draw(self.shader, uniforms)
+            
+        glBindTexture(GL_TEXTURE_3D, 0)
+        
+    def update_nebula_cache(self, uniforms, resolution):
+        size = (max(1, int(resolution[0] * self.nebula_scale)), max(1, int(resolution[1] * self.nebula_scale)))
+        if size != self.nebula_size:
+            self.allocate_nebula_cache(size)
+            self.frames_since_nebula = self.nebula_refresh # Stale: redraw now
+            
+        self.frames_since_nebula += 1
+        if self.frames_since_nebula < self.nebula_refresh: return
+        self.frames_since_nebula = 0
+        
+        # Draw into the cache, then put the caller's target back
+        fbo = glGetIntegerv(GL_FRAMEBUFFER_BINDING)
+        viewport = glGetIntegerv(GL_VIEWPORT)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.nebula_fbo)
+        glViewport(0, 0, size[0], size[1])
+        self.draw(self.shader_nebula, dict(uniforms, resolution=size))
+        glBindFramebuffer(GL_FRAMEBUFFER, fbo)
+        glViewport(*viewport)
+        
+    def allocate_nebula_cache(self, size):
+        if self.nebula_fbo is not None:
+            glDeleteFramebuffers(1, [self.nebula_fbo])
+            glDeleteTextures(1, [self.nebula_texture])
+            
+        self.nebula_size = size
+        self.nebula_texture = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, self.nebula_texture)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB16F, size[0], size[1], 0, GL_RGB, GL_FLOAT, None)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        
+        fbo = glGetIntegerv(GL_FRAMEBUFFER_BINDING)
+        self.nebula_fbo = glGenFramebuffers(1)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.nebula_fbo)
+        glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, self.nebula_texture, 0)
+        if glCheckFramebufferStatus(GL_FRAMEBUFFER) != GL_FRAMEBUFFER_COMPLETE:
+            print("ERROR::FRAMEBUFFER:: Nebula cache is not complete!")
+        glBindFramebuffer(GL_FRAMEBUFFER, fbo)
+        
+    def draw(self, shader, uniforms):
+        shader.use()
         
         # Set uniforms
-        self.shader.set_uniform_1f("time", time)
-        self.shader.set_uniform_2f("resolution", self.width, self.height)
-        self.shader.set_uniform_2f("player_pos", player_pos[0], player_pos[1])
+        shader.set_uniforms(uniforms)
         
         glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
-        position = glGetAttribLocation(self.shader.program, "position")
+        position = shader.attribute("position")
         glEnableVertexAttribArray(position)
         glVertexAttribPointer(position, 2, GL_FLOAT, GL_FALSE, 0, None)
         
@@ -0,0 +1,161 @@
+from OpenGL.GL import *
+from collections import deque
+import numpy as np
+import ctypes
+
+PERSISTENT_FLAGS = GL_MAP_WRITE_BIT | GL_MAP_PERSISTENT_BIT | GL_MAP_COHERENT_BIT
+STREAM_MAP_FLAGS = GL_MAP_WRITE_BIT | GL_MAP_UNSYNCHRONIZED_BIT | GL_MAP_INVALIDATE_RANGE_BIT
+
+def supports_buffer_storage():
+    # Persistent mapping needs glBufferStorage (GL 4.4 or ARB_buffer_storage)
+    try:
+        version = (int(glGetIntegerv(GL_MAJOR_VERSION)), int(glGetIntegerv(GL_MINOR_VERSION)))
+    except GLError:
+        return False
+    return version >= (4, 4) and bool(glBufferStorage)
+
+class StreamBuffer:
+    """
+    Ring buffer for per-frame vertex data, shared by all dynamic renderers. write() copies
+    an array into the next free range and returns its byte offset; draws then source from
+    (vbo, offset). A range is never rewritten while the GPU may still read it:
+
+    - persistent mode: the buffer stays mapped and every frame is fenced; wrapping around
+      waits only on the frames whose data is about to be overwritten
+    - orphan mode: wrapping around orphans the storage, and writes go through an
+      unsynchronized glMapBufferRange
+
+    Bytes written are counted per frame; end_frame() must be called once per displayed frame.
+    """
+    def __init__(self, size=4 * 1024 * 1024, persistent=None, align=16):
+        if persistent is None:
+            persistent = supports_buffer_storage()
+        self.persistent = persistent
+        self.align = align
+
+        self.vbo = None
+        self.ptr = None # Persistent mapping address
+        self.pos = 0 # Bytes written since the storage was created; ring offset is pos % size
+        self.frame_start = 0
+        self.fences = deque() # (fence, pos at the start of that frame), oldest first
+
+        # Counters; end_frame() moves frame_bytes to last_frame_bytes
+        self.frame_bytes = 0
+        self.last_frame_bytes = 0
+        self.peak_frame_bytes = 0
+        self.wraps = 0
+        self.stalls = 0 # Wraps that had to wait for the GPU
+        self.grows = 0
+
+        self._allocate(size)
+
+    def _allocate(self, size):
+        if self.vbo is not None:
+            self._release()
+        self.size = size
+        self.vbo = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        if self.persistent:
+            glBufferStorage(GL_ARRAY_BUFFER, size, None, PERSISTENT_FLAGS)
+            self.ptr = glMapBufferRange(GL_ARRAY_BUFFER, 0, size, PERSISTENT_FLAGS)
+        else:
+            glBufferData(GL_ARRAY_BUFFER, size, None, GL_STREAM_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self.pos = 0
+        self.frame_start = 0
+
+    def _release(self):
+        if self.ptr is not None:
+            glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+            glUnmapBuffer(GL_ARRAY_BUFFER)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+            self.ptr = None
+        # GL keeps the storage alive until queued draws that read it are done
+        glDeleteBuffers(1, [self.vbo])
+        while self.fences:
+            glDeleteSync(self.fences.popleft()[0])
+
+    def write(self, *arrays):
+        """
+        Copies arrays into the ring and returns the byte offset of each in self.vbo
+        (a single offset for one array). Arrays written together always land in the
+        same buffer; its id can change when a frame outgrows the ring, so bind self.vbo
+        after writing.
+        """
+        arrays = [np.ascontiguousarray(a) for a in arrays]
+        sizes = [a.nbytes for a in arrays]
+        n = sum(-(-size // self.align) * self.align for size in sizes)
+        if n == 0:
+            return 0 if len(arrays) == 1 else [0] * len(arrays)
+
+        # A single frame must fit in the ring, or it would overwrite its own data
+        needed = self.pos - self.frame_start + n + self.align
+        if needed > self.size:
+            size = self.size
+            while size < 2 * needed:
+                size *= 2
+            self._allocate(size)
+            self.grows += 1
+
+        pos = -(-self.pos // self.align) * self.align
+        offset = pos % self.size
+        if offset + n > self.size:
+            # Skip the tail and start over at the beginning of the ring
+            pos += self.size - offset
+            offset = 0
+            self.wraps += 1
+            if not self.persistent:
+                glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+                glBufferData(GL_ARRAY_BUFFER, self.size, None, GL_STREAM_DRAW)
+
+        if self.persistent:
+            # Frames that started before pos + n - size still own part of this range
+            stalled = False
+            while self.fences and self.fences[0][1] < pos + n - self.size:
+                fence = self.fences.popleft()[0]
+                while glClientWaitSync(fence, GL_SYNC_FLUSH_COMMANDS_BIT, 1000000) == GL_TIMEOUT_EXPIRED:
+                    stalled = True
+                glDeleteSync(fence)
+            if stalled:
+                self.stalls += 1
+            ptr = self.ptr + offset
+        else:
+            glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+            ptr = glMapBufferRange(GL_ARRAY_BUFFER, offset, n, STREAM_MAP_FLAGS)
+
+        offsets = []
+        cursor = 0
+        for a, size in zip(arrays, sizes):
+            ctypes.memmove(ptr + cursor, a.ctypes.data, size)
+            offsets.append(offset + cursor)
+            cursor += -(-size // self.align) * self.align
+
+        if not self.persistent:
+            glUnmapBuffer(GL_ARRAY_BUFFER)
+
+        self.pos = pos + n
+        self.frame_bytes += sum(sizes)
+        return offsets[0] if len(offsets) == 1 else offsets
+
+    def end_frame(self):
+        if self.persistent and self.pos > self.frame_start:
+            self.fences.append((glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0), self.frame_start))
+            # Drop fences the GPU has already passed so the queue stays short
+            while self.fences and glClientWaitSync(self.fences[0][0], 0, 0) != GL_TIMEOUT_EXPIRED:
+                glDeleteSync(self.fences.popleft()[0])
+        self.frame_start = self.pos
+
+        self.last_frame_bytes = self.frame_bytes
+        self.peak_frame_bytes = max(self.peak_frame_bytes, self.frame_bytes)
+        self.frame_bytes = 0
+
+    def stats(self):
+        return {
+            "persistent": self.persistent,
+            "size": self.size,
+            "last_frame_bytes": self.last_frame_bytes,
+            "peak_frame_bytes": self.peak_frame_bytes,
+            "wraps": self.wraps,
+            "stalls": self.stalls,
+            "grows": self.grows,
+        }
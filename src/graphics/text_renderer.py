@@ -1,20 +1,122 @@
 import pygame
+import numpy as np
 from OpenGL.GL import *
 
+# Printable ASCII is baked into the atlas up front; other glyphs are added on first use
+PRELOAD_GLYPHS = ''.join(chr(c) for c in range(32, 127))
+
 class TextRenderer:
+    """
+    Draws text from a per-font glyph atlas. Each glyph is rasterized once; strings are
+    laid out from cached glyph metrics and drawn as batched quads, so changing text
+    (scores, timers) costs no texture uploads.
+    """
     def __init__(self, font_name=None, size=24, antialias=False):
         # Use default system font (None) or specific if available
         # antialias=False gives a more pixelated look
         self.font = pygame.font.SysFont("consolas", size) if font_name == "pixel" else pygame.font.SysFont(font_name, size)
         self.antialias = antialias
-        self.textures = {}
-        self.max_cache_size = 100
+        self.line_height = self.font.get_height()
+
+        # Atlas: CPU copy (top row first) and GL texture, filled left to right in shelves
+        self.atlas_texture = None
+        self.atlas_w = 512
+        self.atlas_h = 256
+        self.atlas = np.zeros((self.atlas_h, self.atlas_w, 4), dtype=np.uint8)
+        self.pen_x = 0
+        self.pen_y = 0
+        self.glyphs = {} # char -> (advance, u0, v0, u1, v1) in pixels
+        self.dirty_y0 = self.atlas_h # Atlas rows [dirty_y0, dirty_y1) changed since the last upload
+        self.dirty_y1 = 0
+
+        # Laid-out strings and sizes; bounded, cleared when full
+        self.layouts = {}
+        self.sizes = {}
+        self.max_cache_size = 256
+
+        for ch in PRELOAD_GLYPHS:
+            self._add_glyph(ch)
+        self.dirty = True
 
     def clear_cache(self):
-        if not self.textures: return
-        ids = [t[0] for t in self.textures.values()]
-        glDeleteTextures(len(ids), ids)
-        self.textures.clear()
+        # Frees the atlas texture; it is rebuilt from the CPU copy on next use
+        if self.atlas_texture is not None:
+            glDeleteTextures(1, [self.atlas_texture])
+            self.atlas_texture = None
+            self.dirty = True
+        self.layouts.clear()
+        self.sizes.clear()
+
+    def _add_glyph(self, ch):
+        surface = self.font.render(ch, self.antialias, (255, 255, 255))
+        w, h = surface.get_width(), surface.get_height()
+        pixels = np.frombuffer(pygame.image.tostring(surface, "RGBA"), dtype=np.uint8).reshape(h, w, 4)
+
+        # Next shelf when the row is full, grow the atlas downwards when out of rows
+        if self.pen_x + w > self.atlas_w:
+            self.pen_x = 0
+            self.pen_y += self.line_height + 1
+        while self.pen_y + h > self.atlas_h:
+            self.atlas = np.concatenate((self.atlas, np.zeros_like(self.atlas)))
+            self.atlas_h *= 2
+            # UVs are stored in pixels, so existing layouts only need re-normalizing
+            self.layouts.clear()
+
+        x, y = self.pen_x, self.pen_y
+        self.atlas[y:y + h, x:x + w] = pixels
+        self.pen_x += w + 1
+        self.glyphs[ch] = (w, x, y, x + w, y + h)
+        self.dirty_y0 = min(self.dirty_y0, y)
+        self.dirty_y1 = max(self.dirty_y1, y + h)
+        self.dirty = True
+
+    def _upload(self):
+        if self.atlas_texture is None:
+            self.atlas_texture = glGenTextures(1)
+            glBindTexture(GL_TEXTURE_2D, self.atlas_texture)
+            # Nearest neighbor filtering for pixel look
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+            self.uploaded_h = 0
+        glBindTexture(GL_TEXTURE_2D, self.atlas_texture)
+        if self.uploaded_h != self.atlas_h:
+            glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, self.atlas_w, self.atlas_h, 0, GL_RGBA, GL_UNSIGNED_BYTE, self.atlas)
+            self.uploaded_h = self.atlas_h
+        elif self.dirty_y1 > self.dirty_y0:
+            # Same size: only the shelves that received new glyphs are sent
+            y0, y1 = self.dirty_y0, self.dirty_y1
+            glTexSubImage2D(GL_TEXTURE_2D, 0, 0, y0, self.atlas_w, y1 - y0, GL_RGBA, GL_UNSIGNED_BYTE, self.atlas[y0:y1])
+        self.dirty_y0 = self.atlas_h
+        self.dirty_y1 = 0
+        self.dirty = False
+
+    def _layout(self, text):
+        """
+        Returns glyph quads for text relative to its top-left: (x0, x1, h, u0, v0, u1, v1) arrays.
+        """
+        layout = self.layouts.get(text)
+        if layout is not None:
+            return layout
+
+        for ch in text:
+            if ch not in self.glyphs:
+                self._add_glyph(ch)
+
+        metrics = np.array([self.glyphs[ch] for ch in text], dtype=np.float32).reshape(-1, 5)
+        advance = metrics[:, 0]
+        x0 = np.concatenate(([0.0], np.cumsum(advance)[:-1])).astype(np.float32)
+        layout = (
+            x0, x0 + advance, metrics[:, 4] - metrics[:, 2],
+            metrics[:, 1] / self.atlas_w, metrics[:, 2] / self.atlas_h,
+            metrics[:, 3] / self.atlas_w, metrics[:, 4] / self.atlas_h,
+        )
+
+        if len(self.layouts) >= self.max_cache_size:
+            self.layouts.clear()
+        self.layouts[text] = layout
+        return layout
 
     def render_text(self, renderer, text, x, y, color=(255, 255, 255), outline_color=None, outline_width=2):
         if outline_color:
@@ -28,32 +130,16 @@ class TextRenderer:
             self._render_single(renderer, text, x, y, color)
 
     def _render_single(self, renderer, text, x, y, color):
-        # Cache based on text only (since we tint with glColor)
-        key = text
-        if key not in self.textures:
-            if len(self.textures) >= self.max_cache_size:
-                self.clear_cache()
-                
-            # Render white text to texture
-            surface = self.font.render(text, self.antialias, (255, 255, 255))
-            texture_data = pygame.image.tostring(surface, "RGBA", 1)
-            width = surface.get_width()
-            height = surface.get_height()
-            
-            texture_id = glGenTextures(1)
-            glBindTexture(GL_TEXTURE_2D, texture_id)
-            # Nearest neighbor filtering for pixel look
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
-            glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, width, height, 0, GL_RGBA, GL_UNSIGNED_BYTE, texture_data)
-            
-            self.textures[key] = (texture_id, width, height)
-            
-        texture_id, width, height = self.textures[key]
-        
+        if not text: return
+        x0, x1, h, u0, v0, u1, v1 = self._layout(text)
+        if self.dirty:
+            # New glyphs: anything already batched with the old atlas contents is drawn first
+            renderer.flush()
+            self._upload()
+
         # Handle color input (can be tuple of 3 or 4, ints 0-255 or floats 0-1)
         r, g, b, a = 1.0, 1.0, 1.0, 1.0
-        
+
         if len(color) >= 3:
             # Check if floats or ints
             is_float = any(isinstance(c, float) for c in color)
@@ -67,8 +153,15 @@ class TextRenderer:
                 g = color[1] / 255.0
                 b = color[2] / 255.0
                 if len(color) > 3: a = color[3] / 255.0
-        
-        renderer.draw_texture(texture_id, x, y, width, height, (r, g, b, a))
+
+        renderer.draw_texture_quads(self.atlas_texture, x0 + x, y, x1 + x, y + h, u0, v0, u1, v1, (r, g, b, a))
 
     def measure_text(self, text):
-        return self.font.size(text)
+        # Measured from the same glyph advances the layout uses, so centering matches
+        size = self.sizes.get(text)
+        if size is None:
+            size = (int(self._layout(text)[1][-1]) if text else 0, self.line_height)
+            if len(self.sizes) >= self.max_cache_size:
+                self.sizes.clear()
+            self.sizes[text] = size
+        return size
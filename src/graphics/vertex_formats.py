@@ -0,0 +1,47 @@
+import numpy as np
+
+# GPU-facing vertex formats. Simulation arrays stay float32; renderers pack the live
+# rows into these compact layouts just before streaming them.
+
+# Positions are int16 fixed point: 1/16 pixel steps, +-2048 px range
+POSITION_SCALE = 16.0
+
+# Particle sizes are uint8 normalized over 0..PARTICLE_MAX_SIZE
+PARTICLE_MAX_SIZE = 8.0
+
+# 12 bytes per particle (vs 36 for the simulation row); size is padded to keep 4-byte alignment
+PARTICLE_VERTEX = np.dtype([
+    ('pos', '<i2', 2),
+    ('color', 'u1', 4), # r, g, b, life
+    ('size', 'u1'),
+    ('pad', 'u1', 3),
+])
+
+def grow_staging(staging, count, dtype, shape=()):
+    # Staging arrays double until they hold count rows; contents are rewritten every frame
+    if staging is not None and len(staging) >= count:
+        return staging
+    capacity = 1024 if staging is None else len(staging)
+    while capacity < count:
+        capacity *= 2
+    return np.zeros((capacity,) + shape, dtype=dtype)
+
+def pack_positions(xy, out):
+    # xy: (n, 2) float pixels -> out: (n, 2) int16 fixed point
+    np.clip(np.rint(xy * POSITION_SCALE), -32768, 32767, out=out, casting='unsafe')
+
+def unorm8(values, out, scale=255.0):
+    # [0, 1] floats -> uint8, clamped
+    np.clip(values * scale + 0.5, 0, 255, out=out, casting='unsafe')
+
+def pack_particles(data, out):
+    """
+    Packs ParticleSystem rows (x, y, r, g, b, life, size, vx, vy) into PARTICLE_VERTEX
+    records in out, which must have at least len(data) rows.
+    """
+    n = len(data)
+    out = out[:n]
+    pack_positions(data[:, 0:2], out['pos'])
+    unorm8(data[:, 2:6], out['color'])
+    unorm8(data[:, 6], out['size'], 255.0 / PARTICLE_MAX_SIZE)
+    return out
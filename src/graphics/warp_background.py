@@ -33,13 +33,13 @@ class WarpBackground:
         self.width = width
         self.height = height
 
-    def render(self, time):
+    def render(self, time, resolution=None):
+        # resolution: pixel size of the target being drawn into (defaults to the window size)
         self.shader.use()
-        self.shader.set_uniform_1f("time", time)
-        self.shader.set_uniform_2f("resolution", self.width, self.height)
+        self.shader.set_uniforms({"time": time, "resolution": resolution or (self.width, self.height)})
         
         glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
-        position = glGetAttribLocation(self.shader.program, "position")
+        position = self.shader.attribute("position")
         glEnableVertexAttribArray(position)
         glVertexAttribPointer(position, 2, GL_FLOAT, GL_FALSE, 0, None)
         
@@ -1,6 +1,5 @@
 from src.scenes.scene_manager import Scene
 from src.ui.button import Button
-from src.graphics.text_renderer import TextRenderer
 from src.graphics.particle_system import ParticleSystem
 from OpenGL.GL import *
 import pygame
@@ -13,9 +12,9 @@ class GameOverScene(Scene):
         self.wave = wave
         self.boss_beaten = boss_beaten
         
-        self.text_renderer = TextRenderer(font_name="pixel", size=24, antialias=False)
-        self.title_renderer = TextRenderer(font_name="pixel", size=64, antialias=False)
-        self.stats_renderer = TextRenderer(font_name="pixel", size=32, antialias=False)
+        self.text_renderer = self.acquire_text_renderer(font_name="pixel", size=24, antialias=False)
+        self.title_renderer = self.acquire_text_renderer(font_name="pixel", size=64, antialias=False)
+        self.stats_renderer = self.acquire_text_renderer(font_name="pixel", size=32, antialias=False)
         
         self.particle_system = ParticleSystem()
         self.ui_elements = []
@@ -65,31 +64,15 @@ class GameOverScene(Scene):
     def update(self, dt):
         self.particle_system.update(dt)
         
-    def render(self):
+    def render(self, alpha=1.0):
         # --- POST PROCESSING START ---
         self.game.post_processor.begin_capture()
         
         # Use the warp background but maybe red tinted?
         # For now just standard render
-        glMatrixMode(GL_PROJECTION)
-        glLoadIdentity()
-        glOrtho(0, self.game.window.width, self.game.window.height, 0, -1, 1)
-        glMatrixMode(GL_MODELVIEW)
-        glLoadIdentity()
-        
-        # Calculate Scissor Rect
-        vw, vh = self.game.virtual_width, self.game.virtual_height
-        ww, wh = self.game.window.width, self.game.window.height
-        scale = min(ww / vw, wh / vh)
-        tx = (ww - vw * scale) / 2
-        ty = (wh - vh * scale) / 2
-        
-        glEnable(GL_SCISSOR_TEST)
-        glScissor(int(tx), int(ty), int(vw * scale), int(vh * scale))
-        
-        self.game.warp_bg.render(self.game.global_time)
-        
-        glDisable(GL_SCISSOR_TEST)
+        # begin_capture sets up the projection; the target is already the virtual screen
+        pp = self.game.post_processor
+        self.game.warp_bg.render(self.game.global_time, (pp.scene_width, pp.scene_height))
         
         self.game.post_processor.end_capture()
         # --- POST PROCESSING END ---
@@ -1,25 +1,37 @@
 import pygame
 from src.scenes.scene_manager import Scene
-from src.graphics.starfield import Starfield
 from src.entities.player import Player
 from src.entities.bullet_manager import BulletManager
 from src.core.wave_manager import WaveManager
 from src.graphics.particle_system import ParticleSystem
-from src.ui.button import Button
 from src.utils.spatial_grid import SpatialGrid
-from OpenGL.GL import *
+from src.core.rng import RNGService
+from src.core.replay import InputRecorder
 import random
 
 class GameScene(Scene):
     def __init__(self, game):
         super().__init__(game)
+        # Headless games (benchmarks, bots) run the simulation only: no window, no GL
+        self.headless = getattr(game, 'headless', False)
         self.game.score = 0 # Reset score
         self.game.audio_manager.play_music("game", force_restart=True)
-        self.starfield = Starfield(game.virtual_width, game.virtual_height)
         self.paused = False
+        self.game_over = False
         self.time = 0
         
-        self.particle_system = ParticleSystem()
+        # Reproducible runs: all gameplay randomness comes from one seeded RNG,
+        # and per-tick input is either recorded or fed back from a replay
+        self.replay = getattr(game, 'replay', None)
+        seed = self.replay.seed if self.replay else getattr(game, 'seed', None)
+        self.rng = RNGService(seed)
+        self.recorder = None
+        if getattr(game, 'record_replays', False) and not self.replay:
+            self.recorder = InputRecorder(self.rng.seed, getattr(game, 'difficulty', 'medium'), game.sim_rate)
+        self.fire_requested = False
+        
+        # Particles are cosmetic: own stream so they never shift gameplay draws
+        self.particle_system = ParticleSystem(self.rng.fork("particles"), max_capacity=getattr(game, 'particle_pool_max', 65536))
         self.grid = SpatialGrid(game.virtual_width, game.virtual_height, 100)
         
         # UI Juice
@@ -29,7 +41,7 @@ class GameScene(Scene):
         self.shake_magnitude = 0
         
         # Initialize other components
-        self.bullet_manager = BulletManager(self.particle_system)
+        self.bullet_manager = BulletManager(self.particle_system, max_capacity=getattr(game, 'bullet_pool_max', 65536))
         self.player = Player(game.virtual_width // 2, game.virtual_height // 2, self.bullet_manager)
         self.displayed_hp = self.player.hp # Initialize for lerp
         self.wave_manager = WaveManager(self)
@@ -40,27 +52,42 @@ class GameScene(Scene):
         
         self.boss_beaten = False
         
-        from src.graphics.text_renderer import TextRenderer
-        self.text_renderer = TextRenderer()
+        # Pause Menu UI
+        self.pause_buttons = []
+        
+        if not self.headless:
+            self.init_rendering()
+            self.init_pause_menu()
+        
+        # Hide mouse and grab input
+        self.set_mouse_captured(True)
         
-        from src.graphics.renderers.player_renderer import PlayerRenderer
-        self.player_renderer = PlayerRenderer()
+    def init_rendering(self):
+        # Shared with Game: noise texture, shaders and nebula cache are built once
+        self.starfield = self.game.starfield
+        
+        self.text_renderer = self.acquire_text_renderer()
+        
+        from src.graphics.renderers.entity_renderer import EntityRenderer
+        self.entity_renderer = EntityRenderer(self.game.stream)
         
         from src.graphics.renderers.bullet_renderer import BulletRenderer
-        self.bullet_renderer = BulletRenderer()
+        self.bullet_renderer = BulletRenderer(self.game.stream)
+        
+        from src.graphics.renderers.particle_renderer import ParticleRenderer
+        self.particle_renderer = ParticleRenderer(self.game.stream)
         
         from src.ui.game_hud import GameHUD
         self.hud = GameHUD(self)
         
-        # Pause Menu UI
-        self.pause_buttons = []
-        self.init_pause_menu()
-        
-        # Hide mouse and grab input
-        pygame.mouse.set_visible(False)
-        pygame.event.set_grab(True)
+    def set_mouse_captured(self, captured):
+        if self.headless: return
+        pygame.mouse.set_visible(not captured)
+        pygame.event.set_grab(captured)
         
     def init_pause_menu(self):
+        from src.ui.button import Button
+        
         # Create buttons with wrapped callbacks for effects
         def wrap(cb):
             return lambda: self.on_button_click(None, cb) 
@@ -129,25 +156,53 @@ class GameScene(Scene):
 
     def toggle_pause(self):
         self.paused = not self.paused
-        if self.paused:
-            pygame.mouse.set_visible(True)
-            pygame.event.set_grab(False)
-        else:
-            pygame.mouse.set_visible(False)
-            pygame.event.set_grab(True)
+        self.set_mouse_captured(not self.paused)
         
     def restart_game(self):
+        self.finish_recording()
+        self.on_exit()
+        if self.replay:
+            self.replay.cursor = 0
         self.__init__(self.game)
         
     def quit_to_menu(self):
-        pygame.mouse.set_visible(True)
-        pygame.event.set_grab(False)
+        self.finish_recording()
+        self.game.replay = None
+        self.set_mouse_captured(False)
         from src.scenes.menu_scene import MenuScene
         self.game.scene_manager.set_scene(MenuScene(self.game))
 
     def get_mouse_pos(self):
         return self.game.input_manager.get_mouse_pos()
 
+    def is_firing(self):
+        return self.game.input_manager.get_mouse_buttons()[2] # Right click
+
+    def read_input(self):
+        """
+        Returns the (mx, my, firing) input for one simulation tick, from the replay if one
+        is playing, otherwise from the input manager (recorded if recording is on).
+        """
+        if self.replay:
+            return self.replay.next_input()
+            
+        vmx, vmy = self.get_mouse_pos()
+        # Clicks between ticks are latched so short presses still fire on the next tick
+        firing = bool(self.is_firing() or self.fire_requested)
+        self.fire_requested = False
+        
+        if self.recorder:
+            self.recorder.record(vmx, vmy, firing)
+        return vmx, vmy, firing
+
+    def finish_recording(self):
+        if self.headless:
+            return # The headless runner decides where its recording goes
+        if self.recorder and self.recorder.frames:
+            path = self.recorder.save_to_dir()
+            print(f"Replay saved to {path}")
+        self.recorder = None
+
     def handle_events(self, events):
         # Always handle resize/quit
         for event in events:
@@ -163,7 +218,13 @@ class GameScene(Scene):
             for event in events:
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     if event.button == 3: # Right click
-                        self.player.shoot()
+                        self.fire_requested = True
+
+    def pool_stats(self):
+        # Peak usage, grow and drop counters for sizing the pools
+        stats = self.bullet_manager.stats()
+        stats["particles"] = self.particle_system.stats.as_dict()
+        return stats
 
     def trigger_shake(self, magnitude, duration):
         self.shake_magnitude = magnitude
@@ -179,6 +240,10 @@ class GameScene(Scene):
             self.particle_system.update(dt)
             return
             
+        # Keep the previous step around for render interpolation
+        self.player.save_state()
+        self.wave_manager.save_state()
+        
         self.time += dt
         
         # Update Juice
@@ -208,57 +273,56 @@ class GameScene(Scene):
         # Store Player Previous Position for CCD
         player_prev_x, player_prev_y = self.player.x, self.player.y
         
-        # Update player with virtual mouse coordinates
-        vmx, vmy = self.get_mouse_pos()
-        self.player.update(dt, vmx, vmy)
+        profiler = self.game.profiler
         
-        self.wave_manager.update(dt)
-        self.bullet_manager.update(dt)
-        self.particle_system.update(dt)
+        # Update player with virtual mouse coordinates
+        with profiler.scope("update.player"):
+            vmx, vmy, firing = self.read_input()
+            self.player.update(dt, vmx, vmy, firing)
+        
+        with profiler.scope("update.waves"):
+            self.wave_manager.update(dt)
+        with profiler.scope("update.bullets"):
+            self.bullet_manager.update(dt)
+        with profiler.scope("update.particles"):
+            self.particle_system.update(dt)
         
         # Update Spatial Grid
-        self.grid.clear()
-        for e in self.wave_manager.enemies:
-            if e.active:
-                self.grid.insert(e)
+        with profiler.scope("update.grid"):
+            # Grid indices are enemy bank rows
+            enemies = self.wave_manager.enemies
+            enemies.compact()
+            self.grid.build(enemies.x[:enemies.count], enemies.y[:enemies.count])
                 
         # Collision Logic
-        self.collision_manager.update(dt)
+        with profiler.scope("update.collision"):
+            self.collision_manager.update(dt)
+        
+        # Windowed playback ends back at the menu; the headless runner stops on its own
+        if self.replay and self.replay.finished and not self.headless and not self.game_over:
+            self.quit_to_menu()
 
-    def render(self):
-        # Calculate scale factors
-        vw, vh = self.game.virtual_width, self.game.virtual_height
-        ww, wh = self.game.window.width, self.game.window.height
-        
-        scale = min(ww / vw, wh / vh)
-        tx = (ww - vw * scale) / 2
-        ty = (wh - vh * scale) / 2
-        
-        # Setup Legacy Projection
-        glMatrixMode(GL_PROJECTION)
-        glLoadIdentity()
-        glOrtho(0, ww, wh, 0, -1, 1)
-        glMatrixMode(GL_MODELVIEW)
-        glLoadIdentity()
-        
-        # Scissor Test to clip legacy rendering to virtual viewport
-        glEnable(GL_SCISSOR_TEST)
-        glScissor(int(tx), int(ty), int(vw * scale), int(vh * scale))
+    def render(self, alpha=1.0):
+        # GL is imported here so headless runs never load it
+        from OpenGL.GL import glPushMatrix, glPopMatrix, glTranslatef
         
-        # --- POST PROCESSING START ---
-        # Capture World Rendering
-        self.game.post_processor.begin_capture()
+        if self.paused:
+            alpha = 1.0 # Simulation is frozen, draw the current state
+        # Time between the interpolated render state and the latest simulation step
+        lag = (1.0 - alpha) * self.game.sim_dt
         
-        # We need to clear the FBO (it has its own clear color)
-        # But wait, begin_capture clears it.
-        # We need to setup projection for the FBO?
-        # The FBO is size of window.
-        # Legacy projection is setup for window size (0..ww, 0..wh).
-        # So rendering should work fine.
+        profiler = self.game.profiler
+        post_processor = self.game.post_processor
+        
+        # --- POST PROCESSING START ---
+        # Capture World Rendering. The target is virtual resolution times the render scale and
+        # begin_capture sets up the projection in virtual coordinates, so the world is drawn
+        # unscaled; only pixel-sized primitives (points) need the scale.
+        with profiler.scope("render.post"):
+            post_processor.begin_capture()
+        scale = post_processor.render_scale
         
         glPushMatrix()
-        glTranslatef(tx, ty, 0)
-        glScalef(scale, scale, 1.0)
         
         # Apply Screen Shake
         if self.shake_timer > 0:
@@ -267,38 +331,36 @@ class GameScene(Scene):
             glTranslatef(sx, sy, 0)
         
         # Render Starfield
-        self.starfield.render(self.time, (self.player.x, self.player.y))
+        px, py, _ = self.player.lerp_state(alpha)
+        with profiler.scope("render.starfield"):
+            self.starfield.render(self.time - lag, (px, py), (post_processor.scene_width, post_processor.scene_height))
         
         # Render Entities
-        self.particle_system.render(scale)
-        self.wave_manager.render()
-        self.player_renderer.render(self.player)
-        self.bullet_renderer.render(self.bullet_manager)
+        with profiler.scope("render.particles"):
+            self.particle_renderer.render(self.particle_system, scale)
+        with profiler.scope("render.enemies"):
+            self.entity_renderer.render_enemies(self.wave_manager.enemies, alpha)
+            self.entity_renderer.render_boss(self.wave_manager.boss, alpha)
+        with profiler.scope("render.player"):
+            self.entity_renderer.render_player(self.player, alpha)
+        with profiler.scope("render.bullets"):
+            self.bullet_renderer.render(self.bullet_manager, lag, scale)
         
         glPopMatrix()
         
-        self.game.post_processor.end_capture()
+        with profiler.scope("render.post"):
+            post_processor.end_capture()
         # --- POST PROCESSING END ---
         
-        glDisable(GL_SCISSOR_TEST)
-        
-        # Render Post-Processed Scene to Screen
-        # We might want to apply scissor here too if we want black bars?
-        # PostProcessor renders full screen quad.
-        # If we want letterboxing, we should render quad inside the viewport?
-        # Or just render full screen and let the black bars be black (cleared screen).
-        # But PostProcessor texture contains the whole window content (including black bars area if we cleared it black).
-        # Wait, we rendered to FBO with scissor test. So FBO has content only in viewport area.
-        # So rendering full screen quad of FBO texture will show the content correctly.
-        
-        self.game.post_processor.render()
-        
-        self.game.post_processor.render()
+        # Render Post-Processed Scene into the window's letterbox rect
+        with profiler.scope("render.post"):
+            post_processor.render()
         
         # Render UI (Health Bar) - In Virtual Space (Scaled)
-        renderer = self.game.renderer
-        renderer.begin_frame(self.game.virtual_width, self.game.virtual_height, self.game.window.width, self.game.window.height)
-        
-        self.hud.render(renderer)
-                
-        renderer.end_frame()
+        with profiler.scope("render.hud"):
+            renderer = self.game.renderer
+            renderer.begin_frame(self.game.virtual_width, self.game.virtual_height, self.game.window.width, self.game.window.height)
+            
+            self.hud.render(renderer)
+                    
+            renderer.end_frame()
@@ -1,6 +1,5 @@
 import pygame
 from src.scenes.scene_manager import Scene
-from src.graphics.text_renderer import TextRenderer
 from OpenGL.GL import *
 
 from src.ui.button import Button
@@ -14,8 +13,8 @@ class MenuScene(Scene):
         self.game.audio_manager.play_music("menu")
         self.options = ['play', 'options', 'exit']
         # Use 'pixel' font hint (mapped to consolas in TextRenderer)
-        self.text_renderer = TextRenderer(font_name="pixel", size=48, antialias=False) 
-        self.title_renderer = TextRenderer(font_name="pixel", size=96, antialias=False)
+        self.text_renderer = self.acquire_text_renderer(font_name="pixel", size=48, antialias=False) 
+        self.title_renderer = self.acquire_text_renderer(font_name="pixel", size=96, antialias=False)
         
         self.particle_system = ParticleSystem()
         
@@ -118,31 +117,14 @@ class MenuScene(Scene):
         elif option == 'exit':
             self.game.running = False
 
-    def render(self):
+    def render(self, alpha=1.0):
         # --- POST PROCESSING START ---
         self.game.post_processor.begin_capture()
         
         # Render Background (Warp Nebula)
-        # Setup Legacy Projection
-        glMatrixMode(GL_PROJECTION)
-        glLoadIdentity()
-        glOrtho(0, self.game.window.width, self.game.window.height, 0, -1, 1)
-        glMatrixMode(GL_MODELVIEW)
-        glLoadIdentity()
-        
-        # Calculate Scissor Rect
-        vw, vh = self.game.virtual_width, self.game.virtual_height
-        ww, wh = self.game.window.width, self.game.window.height
-        scale = min(ww / vw, wh / vh)
-        tx = (ww - vw * scale) / 2
-        ty = (wh - vh * scale) / 2
-        
-        glEnable(GL_SCISSOR_TEST)
-        glScissor(int(tx), int(ty), int(vw * scale), int(vh * scale))
-        
-        self.game.warp_bg.render(self.game.global_time)
-        
-        glDisable(GL_SCISSOR_TEST)
+        # begin_capture sets up the projection; the target is already the virtual screen
+        pp = self.game.post_processor
+        self.game.warp_bg.render(self.game.global_time, (pp.scene_width, pp.scene_height))
         
         self.game.post_processor.end_capture()
         # --- POST PROCESSING END ---
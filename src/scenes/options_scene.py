@@ -1,5 +1,4 @@
 from src.scenes.scene_manager import Scene
-from src.graphics.text_renderer import TextRenderer
 from src.utils.localization import Localization
 from OpenGL.GL import *
 from src.ui.button import Button
@@ -12,8 +11,8 @@ import pygame
 class OptionsScene(Scene):
     def __init__(self, game):
         super().__init__(game)
-        self.text_renderer = TextRenderer(font_name="pixel", size=24, antialias=False)
-        self.title_renderer = TextRenderer(font_name="pixel", size=48, antialias=False)
+        self.text_renderer = self.acquire_text_renderer(font_name="pixel", size=24, antialias=False)
+        self.title_renderer = self.acquire_text_renderer(font_name="pixel", size=48, antialias=False)
         
         # Use game's localization instance
         self.localization = game.localization
@@ -38,13 +37,11 @@ class OptionsScene(Scene):
         self.staged_show_fps = game.show_fps
         
         # Graphics Settings
-        self.staged_msaa = 1 # Default 1 (Off) or 4? Need to read from pygame display?
-        # Actually we can't easily read current MSAA. Let's assume default or read from settings if we saved it.
         self.staged_fxaa = getattr(game.post_processor, 'use_fxaa', False)
+        self.staged_fxaa_quality = getattr(game.post_processor, 'fxaa_quality', 'medium')
         self.staged_bloom = getattr(game.post_processor, 'use_bloom', True)
         self.staged_vignette = getattr(game.post_processor, 'use_vignette', True)
         self.staged_chromatic = getattr(game.post_processor, 'use_chromatic', False)
-        self.staged_msaa = getattr(game, 'msaa_enabled', True) # Default True
         
         self.current_tab = 0 # 0: General, 1: Graphics, 2: Audio
         self.tabs = ["General", "Graphics", "Audio"]
@@ -137,11 +134,10 @@ class OptionsScene(Scene):
             # Chromatic Aberration
             add_row("Chromatic", Checkbox(col_right_x, current_y, 30, self.staged_chromatic, self.set_chromatic, self.text_renderer, "Enable Chromatic"), height=30)
             
-            # FXAA
-            add_row("FXAA", Checkbox(col_right_x, current_y, 30, self.staged_fxaa, self.set_fxaa, self.text_renderer, "Enable FXAA"), height=30)
-            
-            # MSAA (Requires Restart)
-            add_row("MSAA", Checkbox(col_right_x, current_y, 30, self.staged_msaa, self.set_msaa, self.text_renderer, "MSAA (Restart Required)"), height=30)
+            # Anti-aliasing (FXAA post pass): Off or a quality preset
+            self.aa_opts = [None, "low", "medium", "high"]
+            cur_aa_idx = self.aa_opts.index(self.staged_fxaa_quality) if self.staged_fxaa else 0
+            add_row("Anti-aliasing", Dropdown(col_right_x, current_y, 250, 40, ["Off", "FXAA Low", "FXAA Medium", "FXAA High"], cur_aa_idx, self.set_fxaa, self.text_renderer))
             
         elif self.current_tab == 2: # AUDIO
             # Music
@@ -179,8 +175,10 @@ class OptionsScene(Scene):
     def set_bloom(self, val): self.staged_bloom = val
     def set_vignette(self, val): self.staged_vignette = val
     def set_chromatic(self, val): self.staged_chromatic = val
-    def set_fxaa(self, val): self.staged_fxaa = val
-    def set_msaa(self, val): self.staged_msaa = val
+    def set_fxaa(self, idx):
+        quality = self.aa_opts[idx]
+        self.staged_fxaa = quality is not None
+        if quality: self.staged_fxaa_quality = quality
     
     def set_music_vol(self, val): self.game.audio_manager.set_music_volume(val)
     def set_sfx_vol(self, val): self.game.audio_manager.set_sfx_volume(val)
@@ -241,11 +239,7 @@ class OptionsScene(Scene):
         self.game.post_processor.use_vignette = self.staged_vignette
         self.game.post_processor.use_chromatic = self.staged_chromatic
         self.game.post_processor.use_fxaa = self.staged_fxaa
-        
-        # MSAA
-        if self.staged_msaa != self.game.msaa_enabled:
-            self.game.msaa_enabled = self.staged_msaa
-            self.restart_required = True
+        self.game.post_processor.fxaa_quality = self.staged_fxaa_quality
         
         # Save settings to file
         # We need to update save_settings to include graphics options
@@ -284,30 +278,14 @@ class OptionsScene(Scene):
                 self.execute_action(self.pending_action)
                 self.pending_action = None
 
-    def render(self):
+    def render(self, alpha=1.0):
         # --- POST PROCESSING START ---
         self.game.post_processor.begin_capture()
         
         # Render Background (Warp Nebula)
-        glMatrixMode(GL_PROJECTION)
-        glLoadIdentity()
-        glOrtho(0, self.game.window.width, self.game.window.height, 0, -1, 1)
-        glMatrixMode(GL_MODELVIEW)
-        glLoadIdentity()
-        
-        # Calculate Scissor Rect
-        vw, vh = self.game.virtual_width, self.game.virtual_height
-        ww, wh = self.game.window.width, self.game.window.height
-        scale = min(ww / vw, wh / vh)
-        tx = (ww - vw * scale) / 2
-        ty = (wh - vh * scale) / 2
-        
-        glEnable(GL_SCISSOR_TEST)
-        glScissor(int(tx), int(ty), int(vw * scale), int(vh * scale))
-        
-        self.game.warp_bg.render(self.game.global_time)
-        
-        glDisable(GL_SCISSOR_TEST)
+        # begin_capture sets up the projection; the target is already the virtual screen
+        pp = self.game.post_processor
+        self.game.warp_bg.render(self.game.global_time, (pp.scene_width, pp.scene_height))
         
         self.game.post_processor.end_capture()
         # --- POST PROCESSING END ---
@@ -337,7 +315,7 @@ class OptionsScene(Scene):
         
         # Render labels from the list we built in recalculate_layout
         for key, y in self.labels:
-            if key in ["fullscreen", "show_fps", "Bloom", "Vignette", "Chromatic", "FXAA", "MSAA"]:
+            if key in ["fullscreen", "show_fps", "Bloom", "Vignette", "Chromatic"]:
                 continue # Let checkbox render it
                 
             text = self.localization.get(key)
@@ -1,6 +1,19 @@
 class Scene:
     def __init__(self, game):
         self.game = game
+        self.text_renderers = []
+
+    def acquire_text_renderer(self, font_name=None, size=24, antialias=False):
+        # Shared through the game's font registry; released again in on_exit
+        renderer = self.game.fonts.acquire(font_name, size, antialias)
+        self.text_renderers.append(renderer)
+        return renderer
+
+    def on_exit(self):
+        # Called by the SceneManager when this scene is replaced
+        for renderer in self.text_renderers:
+            self.game.fonts.release(renderer)
+        self.text_renderers = []
 
     def handle_events(self, events):
         pass
@@ -8,7 +21,8 @@ class Scene:
     def update(self, dt):
         pass
 
-    def render(self):
+    def render(self, alpha=1.0):
+        # alpha: blend factor between the previous and current simulation step
         pass
 
 class SceneManager:
@@ -17,15 +31,18 @@ class SceneManager:
         self.current_scene = None
         
     def set_scene(self, scene):
+        # The new scene is built before the old one exits, so fonts both use stay loaded
+        if self.current_scene and self.current_scene is not scene:
+            self.current_scene.on_exit()
         self.current_scene = scene
         
     def update(self, dt):
         if self.current_scene:
             self.current_scene.update(dt)
             
-    def render(self):
+    def render(self, alpha=1.0):
         if self.current_scene:
-            self.current_scene.render()
+            self.current_scene.render(alpha)
             
     def handle_events(self, events):
         if self.current_scene:
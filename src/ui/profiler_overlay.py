@@ -0,0 +1,61 @@
+class ProfilerOverlay:
+    """
+    Per-stage p50/p95 bars drawn under the FPS counter, scaled to the 60 FPS frame budget.
+    """
+    def __init__(self, profiler, text_renderer, stream=None):
+        self.profiler = profiler
+        self.text_renderer = text_renderer
+        self.stream = stream
+        self.post_processor = None # Set once created; adds a scene resolution row
+        self.budget_ms = 1000.0 / 60.0
+        self.bar_w = 120
+        self.row_h = 18
+        
+        # Percentiles are recomputed a few times a second, not every frame
+        self.refresh_interval = 15
+        self.frames_since_refresh = self.refresh_interval
+        self.rows = []
+        
+    def refresh(self):
+        p50, p95 = self.profiler.percentiles((50, 95))
+        self.rows = [(name, p50[i], p95[i]) for i, name in enumerate(self.profiler.columns)]
+        
+    def render(self, renderer, x, y):
+        self.frames_since_refresh += 1
+        if self.frames_since_refresh >= self.refresh_interval:
+            self.frames_since_refresh = 0
+            self.refresh()
+            
+        label_w = 150
+        panel_w = label_w + self.bar_w + 20
+        footer_rows = 1 + bool(self.stream) + bool(self.post_processor)
+        renderer.draw_rect(x - 10, y - 5, panel_w, (len(self.rows) + footer_rows) * self.row_h + 10, (0.0, 0.0, 0.0, 0.6))
+        
+        for i, (name, p50, p95) in enumerate(self.rows):
+            ry = y + i * self.row_h
+            self.text_renderer.render_text(renderer, f"{name} {p95:.1f}", x, ry, (200, 255, 200))
+            
+            bx = x + label_w
+            # Budget track, p95 bar, p50 bar on top
+            renderer.draw_rect(bx, ry + 4, self.bar_w, self.row_h - 8, (0.2, 0.2, 0.2, 0.8))
+            w95 = min(self.bar_w, self.bar_w * p95 / self.budget_ms)
+            w50 = min(self.bar_w, self.bar_w * p50 / self.budget_ms)
+            over_budget = p95 > self.budget_ms
+            renderer.draw_rect(bx, ry + 4, w95, self.row_h - 8, (1.0, 0.3, 0.2, 0.9) if over_budget else (1.0, 0.8, 0.2, 0.9))
+            renderer.draw_rect(bx, ry + 4, w50, self.row_h - 8, (0.2, 1.0, 0.4, 1.0))
+            
+        # Batched UI draw calls in the previous frame
+        ry = y + len(self.rows) * self.row_h
+        self.text_renderer.render_text(renderer, f"2D draws {renderer.last_draw_calls} ({renderer.last_vertices_drawn} verts)", x, ry, (200, 200, 255))
+        
+        # Vertex bytes streamed to the GPU in the previous frame
+        if self.stream:
+            ry += self.row_h
+            self.text_renderer.render_text(renderer, f"Upload {self.stream.last_frame_bytes / 1024:.1f} KB/frame", x, ry, (200, 200, 255))
+            
+        # Scene target size and the GPU time the render scale is chosen from
+        if self.post_processor:
+            pp = self.post_processor
+            ry += self.row_h
+            gpu = f", GPU {pp.dynamic.last_gpu_ms:.1f} ms" if pp.dynamic else ""
+            self.text_renderer.render_text(renderer, f"Scene {pp.scene_width}x{pp.scene_height} @{pp.render_scale:.2f}{gpu}", x, ry, (200, 200, 255))
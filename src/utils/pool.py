@@ -0,0 +1,116 @@
+import numpy as np
+
+class PoolStats:
+    """
+    Usage counters for one growable pool, for sizing pools from real sessions.
+    """
+    def __init__(self, capacity, max_capacity):
+        self.capacity = capacity
+        self.max_capacity = max_capacity
+        self.peak = 0 # Highest live count seen
+        self.grows = 0 # Times the storage was reallocated
+        self.dropped = 0 # Spawns refused at the hard cap
+
+    def as_dict(self):
+        return {
+            "capacity": self.capacity,
+            "max_capacity": self.max_capacity,
+            "peak": self.peak,
+            "grows": self.grows,
+            "dropped": self.dropped,
+        }
+
+def reserve(data, count, n, stats):
+    """
+    Makes room for n more rows after count in a pool array, doubling the storage
+    up to stats.max_capacity. Returns (data, n_fit): data may be a new, larger array
+    (live rows copied), and n_fit is how many of the n rows fit.
+    """
+    needed = count + n
+    capacity = len(data)
+    if needed > capacity and capacity < stats.max_capacity:
+        capacity = max(capacity, 1)
+        while capacity < needed:
+            capacity *= 2
+        capacity = min(capacity, stats.max_capacity)
+
+        grown = np.zeros((capacity,) + data.shape[1:], dtype=data.dtype)
+        grown[:count] = data[:count]
+        data = grown
+        stats.capacity = capacity
+        stats.grows += 1
+
+    n_fit = min(n, len(data) - count)
+    if n_fit < n:
+        stats.dropped += n - max(n_fit, 0)
+    stats.peak = max(stats.peak, count + max(n_fit, 0))
+    return data, max(n_fit, 0)
+
+def resize(column, capacity, count):
+    """
+    Matches a side column (e.g. per-row styles) to its pool's capacity after reserve(),
+    keeping the first count rows.
+    """
+    if len(column) == capacity:
+        return column
+    grown = np.zeros((capacity,) + column.shape[1:], dtype=column.dtype)
+    grown[:count] = column[:count]
+    return grown
+
+class Scratch:
+    """
+    Named work buffers for allocation-free per-frame updates. A buffer is only
+    reallocated when its pool grows, so steady-state frames reuse the same memory.
+    """
+    def __init__(self):
+        self.buffers = {}
+
+    def get(self, name, rows, shape=(), dtype=np.float32):
+        buf = self.buffers.get(name)
+        if buf is None or len(buf) < rows or buf.dtype != dtype:
+            buf = self.buffers[name] = np.empty((rows,) + shape, dtype=dtype)
+        return buf
+
+def row_view(a):
+    # Each row of a C-contiguous 2D array as one opaque element, so put() moves whole rows
+    if a.ndim == 1: return a
+    return a.view(np.dtype((np.void, a.dtype.itemsize * a.shape[1]))).reshape(len(a))
+
+def in_bounds(xs, ys, x0, x1, y0, y1, scratch, capacity):
+    """
+    Boolean mask of x0 <= xs <= x1 and y0 <= ys <= y1, computed into scratch buffers
+    sized by the pool's capacity rather than the live count.
+    """
+    n = len(xs)
+    keep = scratch.get("keep", capacity, dtype=bool)[:n]
+    test = scratch.get("test", capacity, dtype=bool)[:n]
+    np.greater_equal(xs, x0, out=keep)
+    np.logical_and(keep, np.less_equal(xs, x1, out=test), out=keep)
+    np.logical_and(keep, np.greater_equal(ys, y0, out=test), out=keep)
+    np.logical_and(keep, np.less_equal(ys, y1, out=test), out=keep)
+    return keep
+
+def compact(arrays, count, keep, scratch):
+    """
+    Stable in-place partition of rows [0, count) of each array: rows where keep is set
+    move to the front in order. Returns the new count. Each row's destination is a
+    running count of keep, and rows are scattered with np.put through scratch copies,
+    so nothing is allocated once the scratch buffers exist.
+    """
+    kept = int(np.count_nonzero(keep))
+    if kept == count: return count
+
+    capacity = len(arrays[0])
+    dest = scratch.get("dest", capacity, dtype=np.intp)[:count]
+    drop = scratch.get("drop", capacity, dtype=bool)[:count]
+    np.copyto(dest, keep)
+    np.cumsum(dest, out=dest)
+    np.subtract(dest, 1, out=dest)
+    # Dropped rows all land in a spare row past the end of the scratch copy
+    np.copyto(dest, count, where=np.logical_not(keep, out=drop))
+
+    for i, a in enumerate(arrays):
+        tmp = scratch.get(f"rows{i}", len(a) + 1, a.shape[1:], a.dtype)
+        np.put(row_view(tmp), dest, row_view(a[:count]))
+        a[:kept] = tmp[:kept]
+    return kept
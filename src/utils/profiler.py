@@ -0,0 +1,142 @@
+import csv
+import json
+import os
+import time
+import numpy as np
+
+# Hot stages of a frame, in display order
+GAME_STAGES = [
+    "update.player",
+    "update.waves",
+    "update.bullets",
+    "update.particles",
+    "update.grid",
+    "update.collision",
+    "render.starfield",
+    "render.particles",
+    "render.enemies",
+    "render.player",
+    "render.bullets",
+    "render.post",
+    "render.hud",
+]
+
+class _Scope:
+    """
+    Reusable timing scope for one stage. Cached per stage so timing a block allocates nothing.
+    """
+    __slots__ = ("current", "column", "start")
+    
+    def __init__(self, current, column):
+        self.current = current
+        self.column = column
+        self.start = 0.0
+        
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+        
+    def __exit__(self, exc_type, exc, tb):
+        self.current[self.column] += time.perf_counter() - self.start
+        return False
+
+class FrameProfiler:
+    """
+    Per-stage frame timings kept in a preallocated ring buffer of the last `history` frames.
+    Stage times accumulate within a frame, so fixed-step catch-up updates add up.
+    Render stages measure CPU submission time, not GPU execution time.
+    """
+    def __init__(self, stages=GAME_STAGES, history=600):
+        self.stages = list(stages)
+        self.columns = self.stages + ["frame"]
+        self.history = history
+        self.enabled = True
+        
+        # Seconds; last column is the whole frame
+        self.samples = np.zeros((history, len(self.columns)), dtype=np.float64)
+        self.cursor = 0
+        self.filled = 0
+        
+        self.current = [0.0] * len(self.columns)
+        self.frame_start = 0.0
+        self._scopes = {name: _Scope(self.current, i) for i, name in enumerate(self.stages)}
+        self._null_scope = _Scope([0.0], 0)
+        
+    def scope(self, name):
+        if not self.enabled:
+            return self._null_scope
+        return self._scopes[name]
+        
+    def begin_frame(self):
+        self.frame_start = time.perf_counter()
+        
+    def end_frame(self):
+        if not self.enabled:
+            return
+        current = self.current
+        current[-1] = time.perf_counter() - self.frame_start
+        
+        self.samples[self.cursor] = current
+        self.cursor = (self.cursor + 1) % self.history
+        self.filled = min(self.filled + 1, self.history)
+        
+        for i in range(len(current)):
+            current[i] = 0.0
+            
+    def ordered_samples(self):
+        """
+        Recorded frames oldest first, in milliseconds.
+        """
+        if self.filled < self.history:
+            rows = self.samples[:self.filled]
+        else:
+            rows = np.roll(self.samples, -self.cursor, axis=0)
+        return rows * 1000.0
+        
+    def percentiles(self, q=(50, 95, 99)):
+        """
+        Returns a (len(q), len(columns)) array of per-stage percentiles in milliseconds.
+        """
+        if self.filled == 0:
+            return np.zeros((len(q), len(self.columns)))
+        return np.percentile(self.samples[:self.filled], q, axis=0) * 1000.0
+        
+    def summary(self):
+        p50, p95, p99 = self.percentiles()
+        return {
+            name: {"p50": round(float(p50[i]), 4), "p95": round(float(p95[i]), 4), "p99": round(float(p99[i]), 4)}
+            for i, name in enumerate(self.columns)
+        }
+        
+    def export_csv(self, path):
+        self._ensure_dir(path)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame"] + [f"{name}_ms" for name in self.columns])
+            for i, row in enumerate(self.ordered_samples()):
+                writer.writerow([i] + [f"{v:.4f}" for v in row])
+        return path
+        
+    def export_json(self, path):
+        self._ensure_dir(path)
+        data = {
+            "unit": "ms",
+            "columns": self.columns,
+            "percentiles": self.summary(),
+            "frames": np.round(self.ordered_samples(), 4).tolist()
+        }
+        with open(path, "w") as f:
+            json.dump(data, f)
+        return path
+        
+    def export(self, directory="profiles"):
+        """
+        Writes the buffer as both CSV and JSON with a timestamped name. Returns the paths.
+        """
+        stem = os.path.join(directory, time.strftime("profile_%Y%m%d_%H%M%S"))
+        return self.export_csv(stem + ".csv"), self.export_json(stem + ".json")
+        
+    def _ensure_dir(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
@@ -1,82 +1,100 @@
+import numpy as np
+
 class SpatialGrid:
-    def __init__(self, width, height, cell_size=100):
+    """
+    Uniform grid rebuilt every frame from a positions array with a counting sort.
+    Entities are points identified by their index in the arrays passed to build();
+    queries return index arrays, so callers widen the rect by the entity radius.
+    """
+    def __init__(self, width, height, cell_size=100, margin=1):
         self.cell_size = cell_size
-        self.cols = int(width / cell_size) + 1
-        self.rows = int(height / cell_size) + 1
-        self.cells = {} # Dict of (col, row) -> [entities]
-        
+        # A ring of margin cells around the screen; anything further out is clamped
+        # into the border cells, so off-screen and negative coordinates stay valid
+        self.origin_x = -margin * cell_size
+        self.origin_y = -margin * cell_size
+        self.cols = int(np.ceil(width / cell_size)) + 2 * margin
+        self.rows = int(np.ceil(height / cell_size)) + 2 * margin
+        self.num_cells = self.cols * self.rows
+        # uint16 keys let the stable argsort run as a radix sort
+        self.key_dtype = np.uint16 if self.num_cells < 65536 else np.intp
+        self.clear()
+
     def clear(self):
-        self.cells = {}
-        
-    def insert(self, entity):
-        # Determine which cells the entity overlaps
-        # Assume entity has x, y, width, height or radius
-        # For now, just use center point or simple bounding box
-        
-        # If entity is a dict (bullet), use keys
-        if isinstance(entity, dict):
-            x, y = entity['x'], entity['y']
-            w, h = 10, 10 # Approx size
-        else:
-            x, y = entity.x, entity.y
-            w = getattr(entity, 'width', 32)
-            h = getattr(entity, 'height', 32)
-            
-        start_col = int((x - w/2) / self.cell_size)
-        end_col = int((x + w/2) / self.cell_size)
-        start_row = int((y - h/2) / self.cell_size)
-        end_row = int((y + h/2) / self.cell_size)
-        
-        for c in range(start_col, end_col + 1):
-            for r in range(start_row, end_row + 1):
-                if (c, r) not in self.cells:
-                    self.cells[(c, r)] = []
-                self.cells[(c, r)].append(entity)
-                
+        self.xs = np.zeros(0)
+        self.ys = np.zeros(0)
+        self.cell_of = np.zeros(0, dtype=np.intp)   # Cell index per entity
+        self.cell_start = np.zeros(self.num_cells + 1, dtype=np.intp)   # Offsets into order
+        self.order = np.zeros(0, dtype=np.intp)   # Entity indices sorted by cell
+
+    def __len__(self):
+        return len(self.order)
+
+    def cols_of(self, x):
+        col = np.floor((np.asarray(x) - self.origin_x) / self.cell_size).astype(np.intp)
+        return np.clip(col, 0, self.cols - 1)
+
+    def rows_of(self, y):
+        row = np.floor((np.asarray(y) - self.origin_y) / self.cell_size).astype(np.intp)
+        return np.clip(row, 0, self.rows - 1)
+
+    def build(self, xs, ys):
+        self.xs = np.asarray(xs, dtype=np.float64)
+        self.ys = np.asarray(ys, dtype=np.float64)
+
+        cell = self.rows_of(self.ys) * self.cols + self.cols_of(self.xs)
+        counts = np.bincount(cell, minlength=self.num_cells)
+
+        self.cell_of = cell
+        self.cell_start[0] = 0
+        np.cumsum(counts, out=self.cell_start[1:])
+        self.order = np.argsort(cell.astype(self.key_dtype), kind='stable')
+
     def query(self, x, y, w, h):
-        # Return all entities in cells overlapping this rect
-        found = set()
-        
-        start_col = int((x - w/2) / self.cell_size)
-        end_col = int((x + w/2) / self.cell_size)
-        start_row = int((y - h/2) / self.cell_size)
-        end_row = int((y + h/2) / self.cell_size)
-        
-        for c in range(start_col, end_col + 1):
-            for r in range(start_row, end_row + 1):
-                if (c, r) in self.cells:
-                    for e in self.cells[(c, r)]:
-                        # Check ID to avoid duplicates if entity is object
-                        # If dict, we can't hash it easily.
-                        # So we might return duplicates if we just append.
-                        # Using set requires hashable. Dicts aren't.
-                        # Objects are.
-                        
-                        # For bullets (dicts), we might need a wrapper or ID.
-                        # Or just return list and let caller handle duplicates?
-                        # Or use 'id' field if we add one.
-                        
-                        # For now, let's just return list and filter unique by object identity if possible
-                        # But dicts...
-                        
-                        # Optimization: Just return the list of lists and flatten?
-                        pass
-                        
-                    found.update(self.cells[(c, r)]) # This fails for dicts
-                    
-        # Workaround for dicts:
-        # If we use this for collision, we usually query "What hits THIS entity?"
-        # So we iterate cells.
-        
-        results = []
-        seen_ids = set()
-        
-        for c in range(start_col, end_col + 1):
-            for r in range(start_row, end_row + 1):
-                if (c, r) in self.cells:
-                    for e in self.cells[(c, r)]:
-                        eid = id(e)
-                        if eid not in seen_ids:
-                            results.append(e)
-                            seen_ids.add(eid)
-        return results
+        # Indices of entities in cells overlapping the rect centered on (x, y)
+        c0, c1 = self.cols_of(x - w / 2), self.cols_of(x + w / 2)
+        r0, r1 = self.rows_of(y - h / 2), self.rows_of(y + h / 2)
+
+        parts = []
+        for r in range(r0, r1 + 1):
+            # Cells in one row are contiguous in the sorted order
+            start = self.cell_start[r * self.cols + c0]
+            end = self.cell_start[r * self.cols + c1 + 1]
+            if end > start:
+                parts.append(self.order[start:end])
+
+        if not parts:
+            return np.zeros(0, dtype=np.intp)
+        return np.concatenate(parts) if len(parts) > 1 else parts[0]
+
+    def query_many(self, xs, ys, ws, hs):
+        """
+        Batch form of query for many rects at once.
+        Returns (query_idx, entity_idx) pairs, grouped by query in input order.
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        ws = np.broadcast_to(np.asarray(ws, dtype=np.float64), xs.shape)
+        hs = np.broadcast_to(np.asarray(hs, dtype=np.float64), xs.shape)
+
+        empty = np.zeros(0, dtype=np.intp)
+        if len(xs) == 0 or len(self.order) == 0:
+            return empty, empty
+
+        c0, c1 = self.cols_of(xs - ws / 2), self.cols_of(xs + ws / 2)
+        r0, r1 = self.rows_of(ys - hs / 2), self.rows_of(ys + hs / 2)
+
+        # Expand each rect into its grid rows; a row span is one contiguous run
+        row_counts = r1 - r0 + 1
+        query_of_row = np.repeat(np.arange(len(xs)), row_counts)
+        row = r0[query_of_row] + (np.arange(len(query_of_row)) - np.repeat(np.cumsum(row_counts) - row_counts, row_counts))
+
+        base = row * self.cols
+        starts = self.cell_start[base + c0[query_of_row]]
+        ends = self.cell_start[base + c1[query_of_row] + 1]
+        counts = ends - starts
+
+        # Expand each run into its entities
+        query_idx = np.repeat(query_of_row, counts)
+        offsets = np.arange(len(query_idx)) - np.repeat(np.cumsum(counts) - counts, counts)
+        entity_idx = self.order[np.repeat(starts, counts) + offsets]
+        return query_idx, entity_idx
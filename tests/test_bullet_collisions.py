@@ -0,0 +1,116 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.core import collision_manager
+from src.core.collision_manager import CollisionManager, segments_hit_circles
+from src.entities.bullet_manager import BulletManager
+from src.utils.spatial_grid import SpatialGrid
+
+DT = 1.0 / 60
+ENEMY_RADIUS = 20
+
+# Force one broadphase or the other regardless of the pair count
+PATHS = {"dense": 10**9, "grid": -1}
+
+def line_intersects_circle(p1, p2, center, radius):
+    # The per-pair reference; it does not use the manager's state
+    return CollisionManager.line_intersects_circle(None, p1, p2, center, radius)
+
+def make_scene(bx, by, bdx, bdy, ex, ey):
+    bullets = BulletManager()
+    bullets.spawn_bullets(bx, by, bdx, bdy, "player")
+    grid = SpatialGrid(1280, 720, 100)
+    grid.build(ex, ey)
+    scene = SimpleNamespace(
+        game=SimpleNamespace(score=0),
+        grid=grid,
+        bullet_manager=bullets,
+        wave_manager=SimpleNamespace(enemies=SimpleNamespace(active=np.ones(len(ex), dtype=bool))),
+        score_scale=1.0,
+        trigger_shake=lambda magnitude, duration: None,
+    )
+    return scene, CollisionManager(scene)
+
+def reference_hits(scene):
+    """
+    The per-object loop: bullets in spawn order, each removing the first live enemy
+    its swept segment touches. Returns (bullet, enemy) pairs.
+    """
+    data = scene.bullet_manager.p_data[:scene.bullet_manager.p_count]
+    prev_x = data[:, 0] - data[:, 2] * DT
+    prev_y = data[:, 1] - data[:, 3] * DT
+    alive = np.ones(len(scene.grid.xs), dtype=bool)
+    hits = []
+    for i in range(len(data)):
+        for j in range(len(alive)):
+            if alive[j] and line_intersects_circle((prev_x[i], prev_y[i]), (data[i, 0], data[i, 1]),
+                                                   (scene.grid.xs[j], scene.grid.ys[j]), ENEMY_RADIUS):
+                alive[j] = False
+                hits.append((i, j))
+                break
+    return hits
+
+def random_wave(seed, bullets=80, enemies=40):
+    rng = np.random.default_rng(seed)
+    # Enemies range past every screen edge, including negative coordinates
+    ex = rng.uniform(-150, 1430, enemies)
+    ey = rng.uniform(-150, 870, enemies)
+    # Bullets start near random enemies so hits are common, with some zero-length sweeps
+    near = rng.integers(0, enemies, bullets)
+    bx = ex[near] + rng.normal(0, 40, bullets)
+    by = ey[near] + rng.normal(0, 40, bullets)
+    speed = rng.uniform(0, 3000, bullets) * (rng.random(bullets) > 0.1)
+    angle = rng.uniform(0, 2 * np.pi, bullets)
+    return bx, by, np.cos(angle) * speed, np.sin(angle) * speed, ex, ey
+
+def test_kernel_matches_line_intersects_circle():
+    rng = np.random.default_rng(5)
+    x1, y1, x2, y2, cx, cy = rng.uniform(-200, 200, (6, 2000))
+    # Zero-length segments take the point test
+    x2[:200] = x1[:200]
+    y2[:200] = y1[:200]
+    radius = rng.uniform(1, 80, 2000)
+
+    hits = segments_hit_circles(x1, y1, x2, y2, cx, cy, radius)
+    expected = [line_intersects_circle((x1[k], y1[k]), (x2[k], y2[k]), (cx[k], cy[k]), radius[k]) for k in range(2000)]
+    assert hits.tolist() == expected
+    assert 0 < hits.sum() < 2000
+
+@pytest.mark.parametrize("path", PATHS)
+@pytest.mark.parametrize("seed", range(40))
+def test_player_bullets_match_per_pair_loop(monkeypatch, path, seed):
+    monkeypatch.setattr(collision_manager, "DENSE_PAIR_LIMIT", PATHS[path])
+    scene, collisions = make_scene(*random_wave(seed))
+    expected = reference_hits(scene)
+
+    collisions.check_player_bullets(DT)
+
+    bullets = scene.bullet_manager.p_data[:scene.bullet_manager.p_count]
+    removed = np.flatnonzero(bullets[:, 1] == -1000).tolist()
+    killed = np.flatnonzero(~scene.wave_manager.enemies.active).tolist()
+    assert removed == [i for i, _ in expected]
+    assert killed == sorted(j for _, j in expected)
+    assert scene.game.score == 100 * len(expected)
+    assert expected, "seed produced no hits"
+
+@pytest.mark.parametrize("path", PATHS)
+def test_first_hit_wins(monkeypatch, path):
+    monkeypatch.setattr(collision_manager, "DENSE_PAIR_LIMIT", PATHS[path])
+    # Enemies 0 and 1 sit on the paths of bullets 0 and 1; bullet 2 only crosses enemy 0
+    ex = np.array([500.0, 500.0])
+    ey = np.array([300.0, 330.0])
+    bx = np.array([400.0, 400.0, 400.0])
+    by = np.array([315.0, 315.0, 295.0])
+    bdx = np.full(3, -200 / DT)
+    bdy = np.zeros(3)
+    scene, collisions = make_scene(bx, by, bdx, bdy, ex, ey)
+
+    collisions.check_player_bullets(DT)
+
+    # One enemy per bullet, lowest index first; bullet 2 finds nothing left to hit
+    assert reference_hits(make_scene(bx, by, bdx, bdy, ex, ey)[0]) == [(0, 0), (1, 1)]
+    assert not scene.wave_manager.enemies.active.any()
+    assert scene.bullet_manager.p_data[:3, 1].tolist() == [-1000, -1000, 295]
+    assert scene.game.score == 200
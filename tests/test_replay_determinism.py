@@ -0,0 +1,33 @@
+from src.core.headless import HeadlessGame, autopilot
+from src.core.replay import Replay
+
+def summary(game, result):
+    bullets = game.game_scene.bullet_manager
+    return {
+        "ticks": result["ticks"],
+        "score": result["score"],
+        "wave": result["wave"],
+        "hp": result["hp"],
+        "game_over": result["game_over"],
+        "player_bullets": bullets.p_count,
+        "enemy_bullets": bullets.e_count,
+    }
+
+def test_replay_reproduces_recorded_run(tmp_path):
+    recorded = HeadlessGame(difficulty='hard', seed=7, record=True)
+    expected = summary(recorded, recorded.run(3000, autopilot))
+    path = tmp_path / "replay.json"
+    recorded.game_scene.recorder.save(str(path))
+
+    replay = Replay.load(str(path))
+    assert len(replay) == expected["ticks"]
+    replayed = HeadlessGame(replay=replay)
+    assert summary(replayed, replayed.run(10 * len(replay))) == expected
+
+def test_same_seed_same_run():
+    # Without a recording, the seed and the scripted input alone fix the outcome
+    runs = []
+    for _ in range(2):
+        game = HeadlessGame(difficulty='extreme', seed=11)
+        runs.append(summary(game, game.run(2000, autopilot)))
+    assert runs[0] == runs[1]
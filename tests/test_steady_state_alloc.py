@@ -0,0 +1,80 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from src.core.rng import RNGService
+from src.entities.bullet_manager import BulletManager
+from src.graphics.particle_system import ParticleSystem
+
+CAPACITY = 16384
+# update() still creates a few small Python objects (array views, floats); any per-row
+# NumPy temporary is far larger once thousands of rows are live
+OVERHEAD_BYTES = 4096
+NUMPY_DOMAIN = tracemalloc.DomainFilter(True, np.lib.tracemalloc_domain)
+
+def numpy_bytes():
+    snapshot = tracemalloc.take_snapshot().filter_traces([NUMPY_DOMAIN])
+    return sum(stat.size for stat in snapshot.statistics("filename"))
+
+def spawn_bullets(bullets, rng, n):
+    # Half leave the screen within a few frames, half drift slowly and pile up
+    speed = np.where(np.arange(n) % 2 == 0, 4000.0, 10.0)
+    angle = rng.uniform(0, 2 * np.pi, n)
+    bullets.spawn_bullets(640.0, 360.0, np.cos(angle) * speed, np.sin(angle) * speed, "player")
+    bullets.spawn_bullets(640.0, 360.0, np.cos(angle) * speed, np.sin(angle) * speed, "enemy")
+
+def live_count(system):
+    if isinstance(system, BulletManager):
+        return system.p_count + system.e_count
+    return system.count
+
+def measure_update(system, dt):
+    """
+    Runs one update() and returns (retained, transient) bytes: NumPy-domain memory
+    still held afterwards, and the traced peak above the starting usage.
+    """
+    before = numpy_bytes()
+    tracemalloc.reset_peak()
+    start = tracemalloc.get_traced_memory()[0]
+    system.update(dt)
+    peak = tracemalloc.get_traced_memory()[1]
+    return numpy_bytes() - before, peak - start
+
+@pytest.fixture
+def traced():
+    tracemalloc.start()
+    yield
+    tracemalloc.stop()
+
+@pytest.mark.parametrize("kind", ["bullets", "particles"])
+def test_update_does_not_allocate(traced, kind):
+    rng = np.random.default_rng(1234)
+    if kind == "bullets":
+        system = BulletManager(capacity=CAPACITY, max_capacity=CAPACITY)
+        spawn = lambda n: spawn_bullets(system, rng, n)
+    else:
+        system = ParticleSystem(RNGService(1234), capacity=CAPACITY, max_capacity=CAPACITY)
+        spawn = lambda n: system.emit(640.0, 360.0, n)
+
+    # Warm up at a low live count, long enough for rows to die and be compacted,
+    # so the work buffers exist before measuring
+    for _ in range(20):
+        spawn(64)
+        system.update(0.05)
+
+    counts = []
+    for frame in range(30):
+        # Spawning may allocate; only update() is measured. The spawn rate ramps up
+        # and then stops, so the live count both rises past its previous high and falls.
+        if frame < 20:
+            spawn(64 * (frame + 1))
+        before = live_count(system)
+        retained, transient = measure_update(system, 0.05)
+        counts.append((before, live_count(system)))
+
+        assert retained == 0, f"frame {frame}: update() kept {retained} NumPy bytes"
+        assert transient < OVERHEAD_BYTES, f"frame {frame}: update() peaked {transient} bytes above start"
+
+    assert any(after < before for before, after in counts), "no rows died"
+    assert max(before for before, _ in counts) > 2 * OVERHEAD_BYTES, "live count never rose"
@@ -0,0 +1,48 @@
+import os
+
+# Headless GL: an offscreen SDL window with an EGL context
+os.environ.setdefault("SDL_VIDEODRIVER", "offscreen")
+os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+
+import numpy as np
+import pygame
+import pytest
+
+SIZE = 64
+
+@pytest.fixture(scope="module")
+def renderer():
+    pygame.init()
+    try:
+        pygame.display.set_mode((SIZE, SIZE), pygame.OPENGL | pygame.DOUBLEBUF)
+        from src.graphics.stream_buffer import StreamBuffer
+        from src.graphics.renderer_2d import Renderer2D
+        renderer = Renderer2D(StreamBuffer())
+    except Exception as e:
+        pygame.quit()
+        pytest.skip(f"no OpenGL context: {e}")
+    yield renderer
+    pygame.quit()
+
+def test_text_longer_than_one_batch(renderer):
+    from OpenGL.GL import glClear, glClearColor, glReadPixels, GL_COLOR_BUFFER_BIT, GL_RGBA, GL_UNSIGNED_BYTE
+    from src.graphics.text_renderer import TextRenderer
+
+    text_renderer = TextRenderer(size=12)
+    text = "x" * 1700 # 10200 vertices, more than the 10000-vertex staging array
+    # Start far to the left so only the last few glyphs, from the last chunk, land on screen
+    x0 = text_renderer._layout(text)[0]
+    x = -float(x0[-4])
+
+    glClearColor(0, 0, 0, 1)
+    glClear(GL_COLOR_BUFFER_BIT)
+    renderer.new_frame()
+    renderer.begin_frame(SIZE, SIZE, SIZE, SIZE)
+    text_renderer.render_text(renderer, text, x, 0)
+    renderer.end_frame()
+    renderer.new_frame()
+
+    assert renderer.last_vertices_drawn == len(text) * 6
+    assert renderer.last_draw_calls == 2
+    pixels = np.frombuffer(glReadPixels(0, 0, SIZE, SIZE, GL_RGBA, GL_UNSIGNED_BYTE), dtype=np.uint8)
+    assert pixels.reshape(-1, 4)[:, 0].max() > 0